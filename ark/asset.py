@@ -30,19 +30,19 @@ def find_dcsc(asset: UAsset) -> Optional[ExportTableItem]:
 
 def findComponentExports(asset: UAsset) -> Iterator[ExportTableItem]:
     '''Find the main export components from the given asset.'''
-    for export in asset.exports.values:
-        if str(export.name).startswith('Default__'):
-            yield export
+    yield from asset.default_exports
 
 
 def findSubComponentExports(asset: UAsset, expectedklassname='BlueprintGeneratedClass') -> Iterator[ExportTableItem]:
     '''Find sub-components that are used within this asset.'''
+    matches = set(asset.exports_by_namespace.get(asset.default_export, ()))
+    matches.update(asset.exports_by_metaclass.get(expectedklassname, ()))
+    if not matches:
+        return
+
+    # Yield in export order
     for export in asset.exports.values:
-        kls = export.klass and export.klass.value
-        klskls = kls and kls.klass.value
-        if export.namespace.value == asset.default_export:
-            yield export
-        elif klskls and str(klskls) == expectedklassname:
+        if export in matches:
             yield export
 
 
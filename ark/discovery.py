@@ -1,4 +1,6 @@
+import os
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import ue.hierarchy
 from ark.mod import get_managed_mods, get_official_mods
@@ -14,48 +16,112 @@ __all__ = [
 
 logger = get_logger(__name__)
 
+FORMAT_VERSION = 7
+
 
 def initialise_hierarchy(arkman: ArkSteamManager, config: ConfigFile = get_global_config()):
-    version_key = _gather_version_data(arkman, config)
+    '''
+    Build the class hierarchy of the game and all configured mods.
+
+    Each segment (the core game, each official mod and each managed mod) is cached separately, keyed by its own
+    version, so only segments that have changed are re-explored. The rest are replayed from their cache files.
+    '''
+    build_id = _get_build_id(arkman)
     loader = arkman.getLoader()
 
+    output_path = Path(config.settings.DataDir) / 'asset_hierarchy'
+    output_path.mkdir(parents=True, exist_ok=True)
+    force = config.dev.ClearHierarchyCache
+
+    def explore_fn(path: str, excludes: Set[str]) -> Callable[[], None]:
+        return lambda: _explore_segment(path, excludes, loader, config)
+
+    segments: List[Tuple[str, Dict[str, Any], Callable[[], None]]] = []
+    for modid, managed, path, excludes in _get_segment_paths(config):
+        key: Dict[str, Any] = dict(format=FORMAT_VERSION, core=dict(buildid=build_id))
+        if modid is None:
+            segments.append(('core', key, explore_fn(path, excludes)))
+            continue
+
+        key['mod'] = modid
+        if managed:
+            key['version'] = arkman.getModData(modid)['version']  # type: ignore
+        segments.append((f'mod_{modid}', key, explore_fn(path, excludes)))
+
     def gen_fn(_):
-        return _generate_hierarchy(loader)
+        _reset_tree()
+        for name, key, explore in segments:
+            _apply_segment(name, key, output_path, explore, force)
 
-    output_path = f'{config.settings.DataDir}/asset_hierarchy'
-    data = cache_data(version_key, output_path, gen_fn, force_regenerate=config.dev.ClearHierarchyCache)
-    ue.hierarchy.tree = data
+        return ue.hierarchy.tree
 
+    # The complete tree is also cached, in the compact tree's binary form, so unchanged runs need no replaying
+    full_key = dict(format=FORMAT_VERSION, segments=[key for _, key, _ in segments])
+    ue.hierarchy.tree = cache_data(full_key, str(output_path / 'tree'), gen_fn, force_regenerate=force)
 
-def _gather_version_data(arkman: ArkSteamManager, config: ConfigFile):
-    # Gather identities and versions of all involved components
-    if not arkman.mod_data_cache or not arkman.getGameBuildId():
-        raise AssertionError("ArkManager must be fully initialised")
-    key = dict(format=5,
-               core=dict(buildid=arkman.getGameBuildId()),
-               mods=dict((modid, arkman.getModData(modid)['version']) for modid in config.mods))  # type: ignore
-    return key
 
+def _generate_hierarchy(loader: AssetLoader, config: ConfigFile = get_global_config()):
+    '''Explore the complete hierarchy from scratch, without reading or writing any caches. Used to time discovery.'''
+    _reset_tree()
+    for _, _, path, excludes in _get_segment_paths(config):
+        _explore_segment(path, excludes, loader, config)
+
+    return ue.hierarchy.tree
 
-def _generate_hierarchy(loader: AssetLoader):
-    config = get_global_config()
 
+def _get_segment_paths(config: ConfigFile) -> List[Tuple[Optional[str], bool, str, Set[str]]]:
+    '''List the segments of the hierarchy in exploration order, as (modid or None for the core, managed, path, excludes).'''
     core_excludes = set(['/Game/Mods/.*', *config.optimisation.SearchIgnore])
     mod_excludes = set(config.optimisation.SearchIgnore)
 
-    # Always load the internal hierarchy
-    ue.hierarchy.tree.clear()
-    ue.hierarchy.load_internal_hierarchy(Path('config') / 'hierarchy.yaml')
-
     # Scan /Game, excluding /Game/Mods and any excludes from config
-    ue.hierarchy.explore_path('/Game', loader, core_excludes, disable_debug=True)
+    segments: List[Tuple[Optional[str], bool, str, Set[str]]] = [(None, False, '/Game', core_excludes)]
 
     # Scan /Game/Mods/<modid> for each of the 'core' (build-in) mods
     for modid in get_official_mods():
-        ue.hierarchy.explore_path(f'/Game/Mods/{modid}/', loader, mod_excludes, disable_debug=True)
+        segments.append((modid, False, f'/Game/Mods/{modid}/', mod_excludes))
 
     # Scan /Game/Mods/<modid> for each installed mod
     for modid in get_managed_mods():
-        ue.hierarchy.explore_path(f'/Game/Mods/{modid}/', loader, mod_excludes, disable_debug=True)
+        segments.append((modid, True, f'/Game/Mods/{modid}/', mod_excludes))
 
-    return ue.hierarchy.tree
+    return segments
+
+
+def _reset_tree():
+    # Always load the internal hierarchy
+    ue.hierarchy.tree.clear()
+    ue.hierarchy.load_internal_hierarchy(Path('config') / 'hierarchy.yaml')
+
+
+def _explore_segment(path: str, excludes: Set[str], loader: AssetLoader, config: ConfigFile):
+    workers = config.optimisation.DiscoveryWorkers or os.cpu_count() or 1
+    ue.hierarchy.explore_path(path, loader, excludes, disable_debug=True, fast=True, workers=workers)
+
+
+def _get_build_id(arkman: ArkSteamManager) -> str:
+    if not arkman.mod_data_cache or not arkman.getGameBuildId():
+        raise AssertionError("ArkManager must be fully initialised")
+    return arkman.getGameBuildId()  # type: ignore
+
+
+def _apply_segment(name: str, key: Dict[str, Any], output_path: Path, explore: Callable[[], None], force: bool):
+    '''Add a segment of the hierarchy to the tree, using its cached edges if they are up to date.'''
+    start = len(ue.hierarchy.tree)
+    generated = False
+
+    def gen_fn(_):
+        nonlocal generated
+        generated = True
+        logger.info('Exploring hierarchy segment: %s', name)
+        explore()
+        return ue.hierarchy.get_edges(start)
+
+    filename = str(output_path / name)
+    edges = cache_data(key, filename, gen_fn, force_regenerate=force)
+    if generated or ue.hierarchy.add_edges(edges):
+        return
+
+    # A parent from an earlier segment has gone, so this one must be explored again
+    logger.info('Cached hierarchy segment %s is missing a parent and must be regenerated', name)
+    cache_data(key, filename, gen_fn, force_regenerate=True)
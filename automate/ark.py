@@ -10,7 +10,8 @@ from typing import Any, Dict, Optional, Sequence, Set, Union
 import requests
 
 from config import ConfigFile, get_global_config
-from ue.loader import AssetLoader, ModNotFound, ModResolver
+from ue.diskcache import DiskAssetCache
+from ue.loader import AssetLoader, ContextAwareCacheWrapper, ModNotFound, ModResolver, UsageBasedCacheManager
 from utils.log import get_logger
 from utils.name_convert import uelike_prettify
 
@@ -62,9 +63,22 @@ class ArkSteamManager:
     def createLoader(self) -> AssetLoader:
         '''Create an asset loader pointing at the managed game install.'''
         modresolver = ManagedModResolver(self)
-        loader = AssetLoader(modresolver, self.asset_path)
+        budget = self.config.optimisation.AssetCacheBudgetMB
+        cache_manager = ContextAwareCacheWrapper(UsageBasedCacheManager(max_bytes=budget * 1024 * 1024 if budget else None))
+        disk_cache = DiskAssetCache(self.basepath / 'asset_cache') if self.config.optimisation.AssetDiskCache else None
+        loader = AssetLoader(modresolver,
+                             self.asset_path,
+                             cache_manager=cache_manager,
+                             use_mmap=self.config.optimisation.MemoryMapAssets,
+                             disk_cache=disk_cache,
+                             prefetch_workers=self.config.optimisation.PrefetchWorkers)
         return loader
 
+    def closeLoader(self):
+        '''Stop any background work of the asset loader, if one was created.'''
+        if self.loader:
+            self.loader.close()
+
     def getInstalledMods(self) -> Optional[Dict[str, Dict]]:
         '''
         Scan installed modules and return their information in a Dict[id->data].
@@ -126,6 +140,10 @@ class ArkSteamManager:
         self.game_version = fetchGameVersion(self.gamedata_path)
         self.game_buildid = getGameBuildId(self.gamedata_path)
 
+        # Files anywhere in the game may have changed
+        if self.loader:
+            self.loader.invalidate_asset_index()
+
     def ensureModsUpdated(self, modids: Union[Sequence[str], Sequence[int]]):
         '''
         Ensure the listed mods are installed and updated to their latest versions.
@@ -208,6 +226,10 @@ class ArkSteamManager:
         if len(set(tag_list)) != len(tag_list):
             raise ValueError('There are mods with duplicate tag names present. Aborting.')
 
+        # An existing loader must learn about the new set of mods
+        if self.loader:
+            self.loader.initialise_mod_resolver()
+
     def _installMods(self, modids):
         # TODO: Consider doing the extractions in parallel with the installations (offset) to speed this up
 
@@ -239,6 +261,9 @@ class ArkSteamManager:
             # Save the data so we can refer to it later
             self.mod_data_cache[modid] = moddata
 
+            if self.loader:
+                self.loader.invalidate_asset_index(modid)
+
     def _fetch_mod_title_from_pgd(self, moddata):
         resolver = FixedModResolver({moddata['name']: moddata['id']})
         loader = AssetLoader(resolver, self.asset_path)
@@ -273,6 +298,9 @@ class ArkSteamManager:
             if modpath.is_dir():
                 shutil.rmtree(modpath, ignore_errors=True)
 
+            if self.loader:
+                self.loader.invalidate_asset_index(str(modid))
+
     def _cleanSteamModCache(self):
         workshop_path: Path = self.gamedata_path / 'steamapps' / 'workshop'
         if workshop_path.is_dir():
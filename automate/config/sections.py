@@ -93,6 +93,11 @@ class ProcessingSection(BaseModel):
 
 class OptimisationSection(BaseModel):
     SearchIgnore: IniStringList = IniStringList()
+    MemoryMapAssets: bool = False
+    AssetCacheBudgetMB: int = 0
+    AssetDiskCache: bool = False
+    PrefetchWorkers: int = 0
+    DiscoveryWorkers: int = 1
 
     class Config:
         extra = Extra.forbid
@@ -2,13 +2,14 @@ from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
 from pathlib import Path, PurePosixPath
-from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from ark.mod import get_core_mods, get_separate_mods
 from automate.ark import ArkSteamManager
 from config import ConfigFile, get_global_config
+from ue.context import ue_parsing_context
 from ue.gathering import gather_properties
-from ue.hierarchy import find_sub_classes
+from ue.hierarchy import find_sub_classes_by_package
 from ue.loader import AssetLoader, AssetLoadException
 from ue.proxy import UEProxyStructure
 from utils.log import get_logger
@@ -82,7 +83,7 @@ class ExportStage(metaclass=ABCMeta):
 
 
 class ExportManager:
-    official_mod_prefixes: Tuple[str, ...]
+    core_package_roots: Tuple[str, ...]
 
     def __init__(self, arkman: ArkSteamManager, git: GitManager, config=get_global_config()):
         self.config: ConfigFile = config
@@ -100,7 +101,12 @@ class ExportManager:
 
     def perform(self):
         '''Run the defined root/stages structure.'''
-        self._perform_export()
+        # Memory usage is also sampled periodically, so peaks between loads are seen
+        self.loader.stats.start_sampling(self.loader)
+        try:
+            self._perform_export()
+        finally:
+            self.loader.stats.stop_sampling()
 
     def _get_name_for_stage(self, root: ExportRoot, stage: Optional[ExportStage]) -> str:
         root_name = root.__class__.__name__.replace('Root', '')
@@ -144,7 +150,7 @@ class ExportManager:
                 stage.section_name = f'{root.get_name()}.{stage.get_name()}'
 
         # Extract : Core : Run each stage of each root
-        self.official_mod_prefixes = tuple(f'/Game/Mods/{modid}/' for modid in get_core_mods())
+        self.core_package_roots = ('/Game', ) + tuple(f'/Game/Mods/{modid}' for modid in get_core_mods())
         for root in self.roots:
             root_path = Path(base_path / root.get_relative_path())
             for stage in root.stages:
@@ -249,61 +255,77 @@ class ExportManager:
         modname = self.loader.get_mod_name('/Game/Mods/' + modid)
         assert modname
         prefix = '/Game/Mods/' + modname
-        self.loader.wipe_cache_with_prefix(prefix)
+        freed = self.loader.wipe_cache_with_prefix(prefix)
+        logger.debug('Cleared %s from the cache, freeing ~%.2f Mb', prefix, freed / 1024.0 / 1024.0)
 
     def _log_stats(self):
-        max_mem = self.loader.max_memory / 1024.0 / 1024.0
-        logger.debug("Stats: max mem = %6.2f Mb, max cache entries = %d", max_mem, self.loader.max_cache)
-
-    def iterate_core_exports_of_type(self, type_name: str, sort=True, filter=None) -> Iterator[UEProxyStructure]:
+        stats = self.loader.stats
+        stats.sample(self.loader)
+        max_mem = stats.max_memory / 1024.0 / 1024.0
+        logger.debug("Stats: max mem = %6.2f Mb, max cache entries = %d", max_mem, stats.max_cache)
+        logger.debug("Loads: %s", stats.describe_times())
+        stats = self.loader.cache.get_stats()
+        if 'hits' in stats:
+            logger.debug("Cache: %d entries (~%.2f Mb), %d hits, %d misses, %d evictions", stats['count'],
+                         stats['size'] / 1024.0 / 1024.0, stats['hits'], stats['misses'], stats['evictions'])
+            logger.debug("Evicted cache: %d entries still alive, %d hits", stats['weak_count'], stats['weak_hits'])
+        if self.loader.prefetcher:
+            stats = self.loader.prefetcher.get_stats()
+            logger.debug("Prefetch: %d used, %d wasted", stats['hits'], stats['wasted'])
+
+    def iterate_core_exports_of_type(self,
+                                     type_name: str,
+                                     sort=True,
+                                     filter=None,
+                                     property_filter: Optional[Iterable[str]] = None) -> Iterator[UEProxyStructure]:
         '''
         Yields a ready-to-use proxy for each class that inherits from `type_name` and exists in the core+DLC of the game.
         Classes that have a 'Default__' counterpart are excluded from the output.
         By default the results are sorted by class fullname.
+        If `property_filter` is given only properties with those names are decoded while gathering.
         '''
         # Gather classes of this type in the core
-        # (core path prefixes were pre-calculated earlier)
+        # (core mod roots were pre-calculated earlier)
+        sub_classes = find_sub_classes_by_package(type_name)
         classes: Set[str] = set()
-        for cls_name in find_sub_classes(type_name):
-            if filter and not filter(cls_name):
-                continue
-
-            if not cls_name.startswith('/Game'):
-                continue
-
-            if cls_name.startswith('/Game/Mods'):
-                if not any(cls_name.startswith(prefix) for prefix in self.official_mod_prefixes):
+        for root in self.core_package_roots:
+            for cls_name in sub_classes.get(root, ()):
+                if filter and not filter(cls_name):
                     continue
 
-            classes.add(cls_name)
+                classes.add(cls_name)
 
         # The rest of the work is shared
-        yield from self._iterate_exports(classes, sort)
-
-    def iterate_mod_exports_of_type(self, type_name: str, modid: str, sort=True, filter=None) -> Iterator[UEProxyStructure]:
+        yield from self._iterate_exports(classes, sort, property_filter)
+
+    def iterate_mod_exports_of_type(self,
+                                    type_name: str,
+                                    modid: str,
+                                    sort=True,
+                                    filter=None,
+                                    property_filter: Optional[Iterable[str]] = None) -> Iterator[UEProxyStructure]:
         '''
         Yields a ready-to-use proxy for each class that inherits from `type_name` and exists in the specified mod.
         Classes that have a 'Default__' counterpart are excluded from the output.
         By default the results are sorted by class fullname.
+        If `property_filter` is given only properties with those names are decoded while gathering.
         '''
         # Work out the base path for this mod
-        mod_path = self.loader.clean_asset_name(f'/Game/Mods/{modid}') + '/'
+        mod_path = self.loader.clean_asset_name(f'/Game/Mods/{modid}')
 
         # Gather classes of this type in the mod
         classes: Set[str] = set()
-        for cls_name in find_sub_classes(type_name):
+        for cls_name in find_sub_classes_by_package(type_name).get(mod_path, ()):
             if filter and not filter(cls_name):
                 continue
 
-            if not cls_name.startswith(mod_path):
-                continue
-
             classes.add(cls_name)
 
         # The rest of the work is shared
-        yield from self._iterate_exports(classes, sort)
+        yield from self._iterate_exports(classes, sort, property_filter)
 
-    def _iterate_exports(self, classes: Set[str], sort: bool) -> Iterator[UEProxyStructure]:
+    def _iterate_exports(self, classes: Set[str], sort: bool,
+                         property_filter: Optional[Iterable[str]]) -> Iterator[UEProxyStructure]:
         # Exclude classes that have a Default__ counterpart
         to_remove = []
         for cls_name in classes:
@@ -315,21 +337,28 @@ class ExportManager:
         # Sort them to help with consistent outputs, if requested
         output_order = sorted(classes) if sort else classes
 
+        # Read upcoming assets in the background while earlier ones are parsed
+        self.loader.prefetch(output_order)
+
         # Load and output each one
-        for cls_name in output_order:
-            try:
-                export = self.loader.load_class(cls_name)
-            except AssetLoadException:
-                logger.warning('Failed to load asset during export: %s', cls_name)
-                continue
+        try:
+            for cls_name in output_order:
+                try:
+                    export = self.loader.load_class(cls_name)
+                except AssetLoadException:
+                    logger.warning('Failed to load asset during export: %s', cls_name)
+                    continue
 
-            try:
-                proxy: UEProxyStructure = gather_properties(export)
-            except Exception:  # pylint: disable=broad-except
-                logger.warning('Failed to gather properties from asset: %s', cls_name)
-                continue
+                try:
+                    with ue_parsing_context(property_filter=property_filter):
+                        proxy: UEProxyStructure = gather_properties(export)
+                except Exception:  # pylint: disable=broad-except
+                    logger.warning('Failed to gather properties from asset: %s', cls_name)
+                    continue
 
-            yield proxy
+                yield proxy
+        finally:
+            self.loader.cancel_prefetch()
 
     def get_mod_version(self, modid: str) -> str:
         return self.arkman.getModData(modid)['version']  # type: ignore
@@ -1,6 +1,6 @@
 from abc import ABCMeta, abstractmethod
 from pathlib import Path, PurePosixPath
-from typing import Any, Dict, Iterator, List, Optional, Type
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type
 
 from pydantic import BaseModel, Field
 
@@ -119,6 +119,15 @@ class JsonHierarchyExportStage(ExportStage, metaclass=ABCMeta):
         '''
         return True
 
+    def get_property_filter(self) -> Optional[Iterable[str]]:
+        '''
+        Return the names of the properties this stage reads, to skip decoding all others while gathering.
+        Must include everything the stage reads from the proxy, e.g. `get_proxy_field_names` of its proxy plus any
+        other properties it uses.
+        Default behaviour is to decode all properties.
+        '''
+        return None
+
     @abstractmethod
     def extract(self, proxy: UEProxyStructure) -> Any:
         '''Perform extraction on the given proxy and return any JSON-able object.'''
@@ -159,7 +168,9 @@ class JsonHierarchyExportStage(ExportStage, metaclass=ABCMeta):
         version = createExportVersion(self.manager.arkman.getGameVersion(), self.manager.arkman.getGameBuildId())  # type: ignore
 
         filename = self.get_core_file_path()
-        proxy_iter = self.manager.iterate_core_exports_of_type(self.get_ue_type(), filter=self.pre_load_filter)
+        proxy_iter = self.manager.iterate_core_exports_of_type(self.get_ue_type(),
+                                                               filter=self.pre_load_filter,
+                                                               property_filter=self.get_property_filter())
         self._extract_and_save(version, None, path, filename, proxy_iter, schema_file=schema_file)
 
     def extract_mod(self, path: Path, modid: str):
@@ -173,7 +184,10 @@ class JsonHierarchyExportStage(ExportStage, metaclass=ABCMeta):
         version = createExportVersion(self.manager.arkman.getGameVersion(), self.manager.get_mod_version(modid))  # type: ignore
 
         filename = self.get_mod_file_path(modid)
-        proxy_iter = self.manager.iterate_mod_exports_of_type(self.get_ue_type(), modid, filter=self.pre_load_filter)
+        proxy_iter = self.manager.iterate_mod_exports_of_type(self.get_ue_type(),
+                                                              modid,
+                                                              filter=self.pre_load_filter,
+                                                              property_filter=self.get_property_filter())
         self._extract_and_save(version, modid, path, filename, proxy_iter, schema_file=schema_file)
 
     def _extract_and_save(self,
@@ -3,6 +3,7 @@ import logging.config
 import os
 import sys
 from pathlib import Path
+from typing import Optional
 
 import yaml
 
@@ -68,6 +69,7 @@ def log_versions():
 
 def run(config: ConfigFile):
     # Run update then export
+    arkman: Optional[ArkSteamManager] = None
     try:
         log_versions()
 
@@ -108,3 +110,6 @@ def run(config: ConfigFile):
         handle_exception(logfile='logs/errors.log', config=config)
         logger.exception('Caught exception during automation run. Aborting.')
         sys.exit(1)
+    finally:
+        if arkman:
+            arkman.closeLoader()
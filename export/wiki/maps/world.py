@@ -1,11 +1,13 @@
 from collections import defaultdict
 from types import GeneratorType
-from typing import Any, Dict, List, Optional, Type, cast
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, cast
 
+import ue.hierarchy
 from ue.asset import ExportTableItem, UAsset
 from ue.gathering import gather_properties
 from ue.hierarchy import MissingParent, find_parent_classes
 from ue.loader import AssetLoader, AssetLoadException
+from ue.tree import get_parent_fullname
 from ue.utils import sanitise_output
 from utils.log import get_logger
 
@@ -20,6 +22,7 @@ logger = get_logger(__name__)
 __all__ = [
     'ALL_GATHERERS',
     'EXPORTS',
+    'GathererResolver',
     'World',
 ]
 
@@ -29,9 +32,10 @@ ALL_GATHERERS = COMPLEX_GATHERERS + BASIC_GATHERERS
 class World(PersistentLevel):
     data: Dict[Type[MapGathererBase], List[Dict[str, Any]]]
 
-    def __init__(self, main_assetname: Optional[str]):
+    def __init__(self, main_assetname: Optional[str], resolver: Optional['GathererResolver'] = None):
         self.persistent_level = main_assetname
         self.data = defaultdict(list)
+        self.resolver = resolver or GathererResolver()
 
     def ingest_level(self, level: UAsset):
         assert level.assetname
@@ -48,7 +52,7 @@ class World(PersistentLevel):
 
         # Go through each export and, if valuable, gather data from it.
         for export in level.exports:
-            gatherer = find_gatherer_for_export(export)
+            gatherer = self.resolver.find_gatherer(export)
             if not gatherer:
                 continue
 
@@ -126,15 +130,63 @@ class World(PersistentLevel):
                 yield (name, None)
 
 
-def find_gatherer_for_export(export: ExportTableItem) -> Optional[Type[MapGathererBase]]:
-    try:
-        parents = set(find_parent_classes(export, include_self=True))
-    except (AssetLoadException, MissingParent):
-        return None
+class GathererResolver:
+    '''
+    Finds the gatherer responsible for each export.
+
+    The gatherers that could apply to an export depend only on its class, so they are remembered per class and
+    only each gatherer's `do_early_checks` is run per export. A resolver should be shared for a whole run.
+    '''
+    def __init__(self, gatherers: Sequence[Type[MapGathererBase]] = ALL_GATHERERS):
+        self.gatherers = tuple(gatherers)
+        self.candidates_by_class: Dict[str, Tuple[Type[MapGathererBase], ...]] = dict()
+
+        # Reverse index from UE type to the positions of the gatherers that handle it
+        self.positions_by_type: Dict[str, List[int]] = defaultdict(list)
+        for position, gatherer in enumerate(self.gatherers):
+            for ue_type in gatherer.get_ue_types():
+                self.positions_by_type[ue_type].append(position)
 
-    for helper in ALL_GATHERERS:
-        if parents & helper.get_ue_types():
+    def find_gatherer(self, export: ExportTableItem) -> Optional[Type[MapGathererBase]]:
+        for helper in self._get_candidates(export):
             if helper.do_early_checks(export):
                 return helper
 
-    return None
+        return None
+
+    def _get_candidates(self, export: ExportTableItem) -> Tuple[Type[MapGathererBase], ...]:
+        # Level actors are not usually in the hierarchy themselves, so their parent chain is that of their class
+        fullname = export.fullname
+        in_tree = fullname in ue.hierarchy.tree
+        try:
+            key = fullname if in_tree else get_parent_fullname(export)
+        except (AssetLoadException, MissingParent):
+            return ()
+        if key is None:
+            return ()
+
+        candidates = self.candidates_by_class.get(key, None)
+        if candidates is None:
+            try:
+                parents = set(find_parent_classes(export, include_self=True))
+            except (AssetLoadException, MissingParent):
+                parents = set()
+            if not in_tree:
+                parents.discard(fullname)
+
+            candidates = self._get_gatherers_for_types(parents)
+            self.candidates_by_class[key] = candidates
+
+        # The export's own name is part of the original check too, although it rarely matches a type
+        if not in_tree and fullname in self.positions_by_type:
+            candidates = self._get_gatherers_for_types({fullname}, extra=candidates)
+
+        return candidates
+
+    def _get_gatherers_for_types(self, ue_types, extra=()) -> Tuple[Type[MapGathererBase], ...]:
+        positions = set(self.gatherers.index(gatherer) for gatherer in extra)
+        for ue_type in ue_types:
+            positions.update(self.positions_by_type.get(ue_type, ()))
+
+        # Keep the priority order of the gatherer list
+        return tuple(self.gatherers[position] for position in sorted(positions))
@@ -1,9 +1,9 @@
-from typing import Any, Dict, Optional, cast
+from typing import Any, Dict, FrozenSet, Optional, cast
 
 from ark.types import PrimalItem
 from automate.hierarchy_exporter import JsonHierarchyExportStage
 from ue.asset import UAsset
-from ue.proxy import UEProxyStructure
+from ue.proxy import UEProxyStructure, get_proxy_field_names
 from utils.log import get_logger
 
 from .items.cooking import convert_cooking_values
@@ -18,6 +18,20 @@ __all__ = [
 
 logger = get_logger(__name__)
 
+# Properties read during extraction that are not part of the PrimalItem proxy
+EXTRA_PROPERTIES = (
+    'BaseCraftingResourceRequirements',
+    'DefaultFolderPaths',
+    'EggDinoClassToSpawn',
+    'ItemIcon',
+    'ItemIconMaterialParent',
+    'OverrideRepairingRequirements',
+    'SpoilingItem',
+    'StructureToBuild',
+    'UseItemAddCharacterStatusValues',
+    'WeaponTemplate',
+)
+
 
 class ItemsStage(JsonHierarchyExportStage):
     def get_format_version(self) -> str:
@@ -32,6 +46,9 @@ class ItemsStage(JsonHierarchyExportStage):
     def get_ue_type(self) -> str:
         return PrimalItem.get_ue_type()
 
+    def get_property_filter(self) -> FrozenSet[str]:
+        return get_proxy_field_names(PrimalItem) | frozenset(EXTRA_PROPERTIES)
+
     def extract(self, proxy: UEProxyStructure) -> Any:
         item: PrimalItem = cast(PrimalItem, proxy)
 
@@ -11,7 +11,7 @@ from utils.log import get_logger
 from utils.strings import get_valid_filename
 
 from .maps.discovery import LevelDiscoverer, group_levels_by_directory
-from .maps.world import EXPORTS, World
+from .maps.world import EXPORTS, GathererResolver, World
 
 logger = get_logger(__name__)
 
@@ -22,10 +22,12 @@ __all__ = [
 
 class MapStage(ExportStage):
     discoverer: LevelDiscoverer
+    resolver: GathererResolver
 
     def initialise(self, manager: ExportManager, root: ExportRoot):
         super().initialise(manager, root)
         self.discoverer = LevelDiscoverer(self.manager.loader)
+        self.resolver = GathererResolver()
 
     def get_name(self) -> str:
         return 'maps'
@@ -92,7 +94,7 @@ class MapStage(ExportStage):
                           modid: Optional[str] = None,
                           known_persistent: Optional[str] = None):
         # Do the actual extraction
-        world = World(known_persistent)
+        world = World(known_persistent, self.resolver)
         for assetname in levels:
             asset = self.manager.loader[assetname]
             world.ingest_level(asset)
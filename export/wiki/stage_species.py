@@ -1,4 +1,4 @@
-from typing import Any, List, Optional, Set, Tuple, cast
+from typing import Any, FrozenSet, List, Optional, Set, Tuple, cast
 
 from ark.gathering import gather_dcsc_properties
 from ark.overrides import OverrideSettings, get_overrides_for_species
@@ -8,7 +8,7 @@ from automate.hierarchy_exporter import ExportFileModel, ExportModel, Field, Jso
 from ue.asset import UAsset
 from ue.loader import AssetLoadException
 from ue.properties import FloatProperty, StringLikeProperty
-from ue.proxy import UEProxyStructure
+from ue.proxy import UEProxyStructure, get_proxy_field_names
 from utils.log import get_logger
 
 from .flags import gather_flags
@@ -55,6 +55,9 @@ OUTPUT_FLAGS = (
     # bCanHaveBaby/bUseBabyGestation - add breeding section
 )
 
+# Properties read during extraction that are not part of the PrimalDinoCharacter proxy (as well as the flags)
+EXTRA_PROPERTIES = ('AttackInfos', )
+
 
 class FallingData(ExportModel):
     dmgMult: FloatProperty = Field(..., title="Damage multiplier")
@@ -145,6 +148,9 @@ class SpeciesStage(JsonHierarchyExportStage):
     def get_ue_type(self):
         return PrimalDinoCharacter.get_ue_type()
 
+    def get_property_filter(self) -> FrozenSet[str]:
+        return get_proxy_field_names(PrimalDinoCharacter) | frozenset(OUTPUT_FLAGS) | frozenset(EXTRA_PROPERTIES)
+
     def get_schema_model(self):
         return SpeciesExportModel
 
@@ -0,0 +1,173 @@
+from typing import Optional, Sequence, Set, Type
+
+import pytest
+from pytest import fixture  # type: ignore
+
+import ue.hierarchy
+from export.wiki.maps.gathering_base import MapGathererBase
+from export.wiki.maps.world import ALL_GATHERERS, GathererResolver
+from ue.asset import ExportTableItem
+from ue.hierarchy import MissingParent, find_parent_classes
+from ue.loader import AssetLoader, AssetLoadException
+from ue.testutils import DummyLoader, build_asset_data, write_asset
+from utils.compacttree import CompactTree
+
+from .common import *  # noqa: F401,F403  # needed to pick up all fixtures
+
+LEVEL = '/Game/Test/Level'
+
+
+class TestGatherer(MapGathererBase):
+    __test__ = False
+    ue_types: Set[str] = set()
+
+    @classmethod
+    def get_ue_types(cls) -> Set[str]:
+        return cls.ue_types
+
+    @classmethod
+    def get_model_type(cls):
+        return None
+
+    @classmethod
+    def extract(cls, proxy):
+        return None
+
+
+class NamedGatherer(TestGatherer):
+    ue_types = {f'{LEVEL}.Named'}
+
+
+class SheepGatherer(TestGatherer):
+    ue_types = {'/Script/Test.Sheep'}
+
+    @classmethod
+    def do_early_checks(cls, export: ExportTableItem) -> bool:
+        return str(export.name) != 'OtherSheep'
+
+
+class UnresolvableGatherer(TestGatherer):
+    ue_types = {'/Script/Test.Unknown', '/Game/Test/Missing.Missing_C'}
+
+
+class ActorGatherer(TestGatherer):
+    ue_types = {'/Script/Engine.Actor'}
+
+
+GATHERERS = (NamedGatherer, SheepGatherer, UnresolvableGatherer, ActorGatherer)
+
+
+def find_gatherer_by_intersection(export: ExportTableItem,
+                                  gatherers: Sequence[Type[MapGathererBase]]) -> Optional[Type[MapGathererBase]]:
+    '''The original per-export search that GathererResolver replaced, kept as a reference.'''
+    try:
+        parents = set(find_parent_classes(export, include_self=True))
+    except (AssetLoadException, MissingParent):
+        return None
+
+    for helper in gatherers:
+        if parents & helper.get_ue_types():
+            if helper.do_early_checks(export):
+                return helper
+
+    return None
+
+
+@fixture
+def asset_path(tmp_path):
+    # Sheep_C is a blueprint inheriting from Actor
+    names = ['None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'BlueprintGeneratedClass', 'Actor']
+    imports = [(1, 2, 0, 4), (1, 3, -1, 5), (1, 3, -1, 6)]
+    names += ['Sheep_C', 'Default__Sheep_C']
+    write_asset(tmp_path, '/Game/Test/Sheep', build_asset_data(names, imports, [(-2, -3, 0, 7), (1, 0, 0, 8)]))
+
+    # A level with actors of various classes, including some whose parents cannot be resolved
+    names = ['None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'Actor', '/Script/Test', 'Sheep']
+    names += ['Unknown', '/Game/Test/Sheep', 'Sheep_C', '/Game/Test/Missing', 'Missing_C']
+    imports = [
+        (1, 2, 0, 4),  # -1: /Script/Engine
+        (1, 3, -1, 5),  # -2: /Script/Engine.Actor
+        (1, 2, 0, 6),  # -3: /Script/Test
+        (1, 3, -3, 7),  # -4: /Script/Test.Sheep
+        (1, 3, -3, 8),  # -5: /Script/Test.Unknown
+        (1, 2, 0, 9),  # -6: /Game/Test/Sheep
+        (1, 3, -6, 10),  # -7: /Game/Test/Sheep.Sheep_C
+        (1, 2, 0, 11),  # -8: /Game/Test/Missing
+        (1, 3, -8, 12),  # -9: /Game/Test/Missing.Missing_C
+    ]
+    actors = [
+        ('SheepActor', -4),
+        ('OtherSheep', -4),
+        ('PlainActor', -2),
+        ('UnknownActor', -5),
+        ('MissingActor', -9),
+        ('BlueprintSheep', -7),
+        ('TreeActor', -2),
+        ('Named', -2),
+    ]
+    exports = [(klass, 0, 0, len(names) + i) for i, (_, klass) in enumerate(actors)]
+    names += [name for name, _ in actors]
+    write_asset(tmp_path, LEVEL, build_asset_data(names, imports, exports))
+
+    return tmp_path
+
+
+@fixture
+def level(asset_path, monkeypatch):
+    monkeypatch.setattr(ue.hierarchy, 'tree', CompactTree(ue.hierarchy.ROOT_NAME))
+    ue.hierarchy.tree.add(ue.hierarchy.ROOT_NAME, '/Script/Engine.Actor')
+    ue.hierarchy.tree.add('/Script/Engine.Actor', '/Script/Test.Sheep')
+
+    # Placed in the hierarchy beneath a different parent to that of its class
+    ue.hierarchy.tree.add('/Script/Test.Sheep', f'{LEVEL}.TreeActor')
+
+    loader = AssetLoader(DummyLoader(), assetpath=asset_path)
+    return loader[LEVEL]
+
+
+def test_resolver_finds_gatherers(level):
+    resolver = GathererResolver(GATHERERS)
+
+    # Resolve twice, so the second pass uses only remembered candidates
+    for _ in range(2):
+        found = {str(export.name): resolver.find_gatherer(export) for export in level.exports}
+        assert found == {
+            'SheepActor': SheepGatherer,
+            'OtherSheep': ActorGatherer,
+            'PlainActor': ActorGatherer,
+            'UnknownActor': None,
+            'MissingActor': None,
+            'BlueprintSheep': ActorGatherer,
+            'TreeActor': SheepGatherer,
+            'Named': NamedGatherer,
+        }
+
+
+def test_resolver_matches_intersection(level):
+    resolver = GathererResolver(GATHERERS)
+    for export in level.exports:
+        assert resolver.find_gatherer(export) is find_gatherer_by_intersection(export, GATHERERS)
+
+
+def test_resolver_remembers_classes(level):
+    resolver = GathererResolver(GATHERERS)
+    for export in level.exports:
+        resolver.find_gatherer(export)
+
+    # Actors share the entry of their class, unless they are in the hierarchy themselves
+    # A class that cannot be loaded gives no key, so only classes with unresolvable parents are remembered as empty
+    assert resolver.candidates_by_class == {
+        '/Script/Test.Sheep': (SheepGatherer, ActorGatherer),
+        '/Script/Engine.Actor': (ActorGatherer, ),
+        '/Script/Test.Unknown': (),
+        '/Game/Test/Sheep.Sheep_C': (ActorGatherer, ),
+        f'{LEVEL}.TreeActor': (SheepGatherer, ActorGatherer),
+    }
+
+
+@pytest.mark.requires_game
+def test_resolver_matches_intersection_on_map(loader: AssetLoader, hierarchy):  # pylint: disable=unused-argument
+    level = loader['/Game/Maps/TheIslandSubmaps/TheIsland']
+    resolver = GathererResolver(ALL_GATHERERS)
+    for export in level.exports:
+        assert resolver.find_gatherer(export) is find_gatherer_by_intersection(export, ALL_GATHERERS)
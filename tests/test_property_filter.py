@@ -0,0 +1,110 @@
+import struct
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from ark.types import ShooterCharacterMovement
+from automate.ark import ArkSteamManager
+from automate.hierarchy_exporter import JsonHierarchyExportStage
+from config import ConfigFile
+from export.wiki.stage_items import ItemsStage
+from export.wiki.stage_species import SpeciesStage
+from ue.context import ue_parsing_context
+from ue.gathering import gather_properties
+from ue.asset import UAsset
+from ue.loader import AssetLoader
+from ue.proxy import ProxyComponentWrapper
+from ue.stream import MemoryStream
+from ue.testutils import build_asset_data
+from ue.utils import sanitise_output
+
+from .common import *  # noqa: F401,F403  # needed to pick up all fixtures
+from .common import DEINO_CHR, DODO_AB_CHR, DODO_CHR, DRAGON_BOSS_CHR, TROODON_CHR, X_DRAGON_CHR, ScanLoadFn
+
+CONSUMABLES = '/Game/PrimalEarth/CoreBlueprints/Items/Consumables'
+ITEMS = (
+    f'{CONSUMABLES}/PrimalItemConsumable_Berry_Mejoberry.PrimalItemConsumable_Berry_Mejoberry_C',
+    f'{CONSUMABLES}/PrimalItemConsumable_RawMeat.PrimalItemConsumable_RawMeat_C',
+    '/Game/PrimalEarth/CoreBlueprints/Items/Structures/Thatch/PrimalItemStructure_ThatchFloor.PrimalItemStructure_ThatchFloor_C',
+    '/Game/PrimalEarth/CoreBlueprints/Weapons/PrimalItem_WeaponPike.PrimalItem_WeaponPike_C',
+    '/Game/PrimalEarth/Test/PrimalItemConsumable_Egg_Dodo.PrimalItemConsumable_Egg_Dodo_C',
+)
+
+SPECIES = (DODO_CHR, DODO_AB_CHR, DEINO_CHR, TROODON_CHR, X_DRAGON_CHR, DRAGON_BOSS_CHR)
+
+
+def _extract(stage: JsonHierarchyExportStage, loader: AssetLoader, scan_and_load: ScanLoadFn, cls_name: str,
+             filtered: bool) -> Any:
+    loader.wipe_cache()
+    export = scan_and_load(cls_name)
+    with ue_parsing_context(property_filter=stage.get_property_filter() if filtered else None):
+        proxy = gather_properties(export)
+    return sanitise_output(stage.extract(proxy))
+
+
+def _make_stage(stage_type, arkman: ArkSteamManager, loader: AssetLoader, config: ConfigFile) -> JsonHierarchyExportStage:
+    stage = stage_type()
+    stage.manager = SimpleNamespace(arkman=arkman, loader=loader, config=config)
+    return stage
+
+
+@pytest.mark.requires_game
+@pytest.mark.parametrize('cls_name', ITEMS)
+def test_filtered_items_match(cls_name, arkman, loader, config, scan_and_load):
+    stage = _make_stage(ItemsStage, arkman, loader, config)
+    expected = _extract(stage, loader, scan_and_load, cls_name, filtered=False)
+    assert expected
+    assert _extract(stage, loader, scan_and_load, cls_name, filtered=True) == expected
+
+
+@pytest.mark.requires_game
+@pytest.mark.parametrize('cls_name', SPECIES)
+def test_filtered_species_match(cls_name, arkman, loader, config, scan_and_load):
+    stage = _make_stage(SpeciesStage, arkman, loader, config)
+    expected = _extract(stage, loader, scan_and_load, cls_name, filtered=False)
+    assert expected
+    assert _extract(stage, loader, scan_and_load, cls_name, filtered=True) == expected
+
+
+def _build_character_asset() -> bytes:
+    names = [
+        'None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'Actor', 'Character', 'Movement', 'ObjectProperty',
+        'FloatProperty', 'StructProperty', 'BoolProperty', 'CharacterMovement', 'Unrelated', 'NavAgentProps',
+        'NavAgentProperties', 'bCanSwim', 'MaxWalkSpeed'
+    ]
+    character = b''.join((
+        struct.pack('<IIIIiii', 12, 0, 8, 0, 4, 0, 2),  # CharacterMovement = export 2
+        struct.pack('<IIIIiif', 13, 0, 9, 0, 4, 0, 1.0),
+        struct.pack('<II', 0, 0),
+    ))
+    nav_props = struct.pack('<IIIIqB', 16, 0, 11, 0, 0, 1) + struct.pack('<II', 0, 0)
+    movement = b''.join((
+        struct.pack('<IIIIii', 14, 0, 10, 0, len(nav_props), 0) + struct.pack('<II', 15, 0) + nav_props,
+        struct.pack('<IIIIiif', 17, 0, 9, 0, 4, 0, 450.0),
+        struct.pack('<II', 0, 0),
+    ))
+    imports = [(1, 2, 0, 4), (1, 3, -1, 5)]
+    return build_asset_data(names, imports, [(-2, 0, 0, 6), (-2, 0, 1, 7)], [character, movement])
+
+
+def test_species_filter_keeps_component_properties():
+    asset = UAsset(MemoryStream(_build_character_asset()))
+    asset.assetname = '/Game/Test/Character'
+    asset.deserialise()
+    asset.link()
+    character, movement = asset.exports
+
+    with ue_parsing_context(property_filter=SpeciesStage().get_property_filter()):
+        # The character itself is filtered...
+        properties = character.properties
+        assert properties.skipped == [('Unrelated', 0)]
+
+        # ...but the components it refers to are not, as the species helpers read properties the filter cannot know
+        wrapper = ProxyComponentWrapper(ShooterCharacterMovement())
+        wrapper[0] = properties.get_property('CharacterMovement')
+
+    cm = wrapper[0]
+    assert movement.properties.skipped == []
+    assert cm.MaxWalkSpeed[0] == 450.0
+    assert cm.get('NavAgentProps', fallback=None).as_dict()['bCanSwim']
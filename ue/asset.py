@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import struct
+import sys
 import weakref
-from typing import TYPE_CHECKING, Optional, Set
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 
 from utils.log import get_logger
 
 from .base import UEBase
-from .context import INCLUDE_METADATA, get_ctx
+from .context import INCLUDE_METADATA, get_ctx, ue_parsing_context
 from .coretypes import ChunkPtr, CompressedChunk, GenerationInfo, NameIndex, ObjectIndex, Table
 from .properties import Box, CustomVersion, EngineVersion, Guid, PropertyTable, StringProperty
 from .stream import MemoryStream
@@ -34,6 +36,11 @@ __all__ = [
 
 logger = get_logger(__name__)
 
+HEADER_TOP = struct.Struct('<IiiII')
+HEADER_OFFSETS = struct.Struct('<IQQ')
+EXPORT_SERIAL_INFO = struct.Struct('<IIIIII')
+EXPORT_FLAGS = struct.Struct('<II')
+
 
 class UAsset(UEBase):
     display_fields = ('tag', 'legacy_ver', 'ue_ver', 'file_ver', 'licensee_ver', 'custom_versions', 'header_size',
@@ -53,17 +60,37 @@ class UAsset(UEBase):
         self.default_class: Optional['ExportTableItem'] = None
         self.has_properties = False
         self.has_bulk_data = False
+
+        # Exports whose properties have not been fully parsed, after which the asset's data is no longer needed
+        self.unparsed_exports = 0
+        # Set when the asset's data has been dropped, so it must be read again before parsing more properties
+        self.data_released = False
+        # Total serialised size of the exports whose properties have been parsed, for estimating memory use
+        self.parsed_property_size = 0
+
+        # Lookup tables, populated after linking
+        self.exports_by_name: Dict[str, ExportTableItem] = dict()
+        self.default_exports: List[ExportTableItem] = list()
+        self.class_defaults: Dict[UEBase, ExportTableItem] = dict()
+        self.exports_by_namespace: Dict[Any, List[ExportTableItem]] = dict()
+        self.exports_by_metaclass: Dict[str, List[ExportTableItem]] = dict()
+
+        # Name resolution caches, keyed on (name index, instance) and filled during property parsing
+        self.clean_name_cache: Dict[Tuple[int, int], str] = dict()
+        self.struct_type_cache: Dict[Tuple[int, int], Tuple[Optional[str], Optional[type], Optional[float]]] = dict()
+
         super().__init__(self, stream)
 
     def _deserialise(self):  # pylint: disable=arguments-differ
         # ctx = get_ctx()  # not yet required
 
         # Header top
-        self._newField('tag', self.stream.readUInt32())
-        self._newField('legacy_ver', self.stream.readInt32())
-        self._newField('ue_ver', self.stream.readInt32())
-        self._newField('file_ver', self.stream.readUInt32())
-        self._newField('licensee_ver', self.stream.readUInt32())
+        tag, legacy_ver, ue_ver, file_ver, licensee_ver = self.stream.readStruct(HEADER_TOP)
+        self._newField('tag', tag)
+        self._newField('legacy_ver', legacy_ver)
+        self._newField('ue_ver', ue_ver)
+        self._newField('file_ver', file_ver)
+        self._newField('licensee_ver', licensee_ver)
         self._newField('custom_versions', Table(self).deserialise(CustomVersion, self.stream.readUInt32()))
         self._newField('header_size', self.stream.readUInt32())
         self._newField('package_group', StringProperty(self))
@@ -91,14 +118,15 @@ class UAsset(UEBase):
         if self.legacy_ver > -7:
             # Legacy field that is not used anymore
             self._newField('texture_allocations', self.stream.readInt32())
-        self._newField('asset_registry_data_offset', self.stream.readUInt32())
-        self._newField('bulk_data_start_offset', self.stream.readUInt64())
-        self._newField('world_tile_info_data_offset', self.stream.readUInt64())
+        asset_registry_data_offset, bulk_data_start_offset, world_tile_info_data_offset = self.stream.readStruct(HEADER_OFFSETS)
+        self._newField('asset_registry_data_offset', asset_registry_data_offset)
+        self._newField('bulk_data_start_offset', bulk_data_start_offset)
+        self._newField('world_tile_info_data_offset', world_tile_info_data_offset)
 
         # Read the various chunk table contents
         # These tables are not included in the field list so they're not included in pretty printing
         # TODO: Include chunk ends by using other chunk start locations
-        self._newField('names', self._parseTable(self.names_chunk, StringProperty))
+        self._newField('names', self._parseTable(self.names_chunk, StringProperty, intern_value=True))
         self._newField('imports', self._parseTable(self.imports_chunk, ImportTableItem))
         self._newField('exports', self._parseTable(self.exports_chunk, ExportTableItem))
 
@@ -113,6 +141,7 @@ class UAsset(UEBase):
         self._findNoneName()
         self.imports.link()
         self.exports.link()
+        self._index_exports()
 
         ctx = get_ctx()
 
@@ -122,9 +151,29 @@ class UAsset(UEBase):
             self.has_bulk_data = True
 
         if ctx.properties:
-            for export in self.exports:
-                export.deserialise_properties()
+            # Export properties are parsed on first access
             self.has_properties = True
+            self.unparsed_exports = len(self.exports.values)
+
+    def _index_exports(self):
+        '''Build the export lookup tables, preserving export order within each.'''
+        for export in self.exports.values:
+            name = str(export.name)
+            self.exports_by_name.setdefault(name, export)
+
+            cls = export.klass.value
+            if name.startswith('Default__'):
+                self.default_exports.append(export)
+                if cls is not None:
+                    self.class_defaults.setdefault(cls, export)
+
+            self.exports_by_namespace.setdefault(export.namespace.value, []).append(export)
+
+            # Index by the class of the export's class, e.g. BlueprintGeneratedClass for sub-components
+            if isinstance(cls, (ImportTableItem, ExportTableItem)) and cls.klass:
+                metaclass = cls.klass.value
+                if metaclass:
+                    self.exports_by_metaclass.setdefault(str(metaclass), []).append(export)
 
     def is_context_satisfied(self, ctx):
         # Check that each of the context parameters is satisfied
@@ -137,6 +186,81 @@ class UAsset(UEBase):
 
         return True
 
+    def upgrade(self, ctx) -> bool:
+        '''
+        Bring a linked asset up to the requirements of the given parsing context in place, avoiding a full re-parse.
+        Only the missing phases are run, reusing the existing tables.
+
+        Returns False if the asset cannot be upgraded and must be re-parsed instead.
+        '''
+        if self.is_context_satisfied(ctx):
+            return True
+
+        if not self.is_linked or not self.loader or not self.assetname:
+            return False
+
+        if ctx.properties and not self.has_properties:
+            # Properties are parsed on demand from the asset's data, which is only retained when they are requested
+            data = self.loader.reload_asset_data(self.assetname)
+            if len(data) != self.stream.size:
+                return False
+            self.stream.mem = data
+            self.data_released = False
+            self.has_properties = True
+            self.unparsed_exports = len(self.exports.values)
+
+        if ctx.bulk_data:
+            self.has_bulk_data = True
+
+        return True
+
+    def release_data(self):
+        '''
+        Drop the asset's data, closing its memory-mapping if it has one.
+        If more properties are needed later the data is read again using the asset's loader.
+        '''
+        # Lazy import to avoid a cyclic dependency
+        from .loader import release_memory  # pylint: disable=import-outside-toplevel
+
+        mem = self.stream.mem
+        self.stream.mem = b''
+        self.data_released = True
+        if isinstance(mem, memoryview):
+            release_memory(mem)
+
+    def reload_data(self):
+        '''Read the asset's data again after it was released, so more properties can be parsed.'''
+        if not self.loader or not self.assetname:
+            raise RuntimeError('Asset data has been released and there is no loader to read it again')
+
+        data = self.loader.reload_asset_data(self.assetname)
+        if len(data) != self.stream.size:
+            raise RuntimeError(f'Asset {self.assetname} has changed since it was parsed')
+
+        self.stream.mem = data
+        self.data_released = False
+
+    def _export_properties_parsed(self, export: 'ExportTableItem', first: bool, complete: bool):
+        if first:
+            self.parsed_property_size += export.serial_size
+        if complete:
+            self.unparsed_exports -= 1
+            if self.unparsed_exports == 0:
+                self.release_data()
+
+        # Let the cache know the asset has grown
+        if self.loader and self.assetname:
+            self.loader.cache.update_size(self.assetname, self)
+
+    def __getstate__(self):
+        values, slot_values = super().__getstate__()
+
+        # The loader is not stored. The asset's data is kept while it has properties left to parse, otherwise only
+        # its size is, and data that was already released is read again by the next loader if it is needed.
+        values = dict(values, loader=None)
+        slot_values['stream'] = MemoryStream(bytes(self.stream.mem), 0, self.stream.size)
+        return values, slot_values
+
     def getName(self, index):
         '''Get a name for the given index.'''
         names = self.names
@@ -171,9 +295,9 @@ class UAsset(UEBase):
 
         return None
 
-    def _parseTable(self, chunk, itemType):
+    def _parseTable(self, chunk, itemType, **item_kwargs):
         stream = MemoryStream(self.stream, chunk.offset)
-        table = Table(self, stream).deserialise(itemType, chunk.count)
+        table = Table(self, stream).deserialise(itemType, chunk.count, **item_kwargs)
         return table
 
     def _findNoneName(self):
@@ -215,6 +339,8 @@ class UAsset(UEBase):
 
 
 class ImportTableItem(UEBase):
+    _fullname: Optional[str] = None
+
     package: NameIndex
     klass: NameIndex
     namespace: ObjectIndex
@@ -250,9 +376,20 @@ class ImportTableItem(UEBase):
 
     @property
     def fullname(self) -> str:
+        if self._fullname is not None:
+            return self._fullname
+
         if self.namespace:
-            return str(self.namespace.value.name) + '.' + str(self.name)
-        return str(self.name)
+            fullname = str(self.namespace.value.name) + '.' + str(self.name)
+        else:
+            fullname = str(self.name)
+
+        # Only remember the result once linked, as the names are unavailable until then
+        if self.is_linked:
+            fullname = sys.intern(fullname)
+            self._fullname = fullname
+
+        return fullname
 
     def format_for_json(self):
         return self.fullname
@@ -275,7 +412,6 @@ class ExportTableItem(UEBase):
     super: ObjectIndex
     namespace: ObjectIndex
     name: NameIndex
-    properties: PropertyTable
     users: Set[UEBase]
 
     def _deserialise(self):  # pylint: disable=arguments-differ
@@ -283,15 +419,18 @@ class ExportTableItem(UEBase):
         self._newField('super', ObjectIndex(self))  # item type/class namespace
         self._newField('namespace', ObjectIndex(self))  # item namespace
         self._newField('name', NameIndex(self))  # item name
-        self._newField('object_flags', self.stream.readUInt32())
-        self._newField('serial_size', self.stream.readUInt32())
-        self._newField('serial_offset', self.stream.readUInt32())
-        self._newField('force_export', self.stream.readBool32())
-        self._newField('not_for_client', self.stream.readBool32())
-        self._newField('not_for_server', self.stream.readBool32())
+        object_flags, serial_size, serial_offset, force_export, not_for_client, not_for_server = \
+            self.stream.readStruct(EXPORT_SERIAL_INFO)
+        self._newField('object_flags', object_flags)
+        self._newField('serial_size', serial_size)
+        self._newField('serial_offset', serial_offset)
+        self._newField('force_export', bool(force_export))
+        self._newField('not_for_client', bool(not_for_client))
+        self._newField('not_for_server', bool(not_for_server))
         self._newField('guid', Guid(self))
-        self._newField('package_flags', self.stream.readUInt32())
-        self._newField('not_for_editor_game', self.stream.readBool32())
+        package_flags, not_for_editor_game = self.stream.readStruct(EXPORT_FLAGS)
+        self._newField('package_flags', package_flags)
+        self._newField('not_for_editor_game', bool(not_for_editor_game))
 
         if INCLUDE_METADATA:
             # References to this item
@@ -300,20 +439,43 @@ class ExportTableItem(UEBase):
     def _link(self):
         super()._link()
         if hasattr(self, 'asset') and hasattr(self.asset, 'assetname'):
-            self.fullname = self.asset.assetname + '.' + str(self.name)
+            self.fullname = sys.intern(self.asset.assetname + '.' + str(self.name))
 
     def register_user(self, user):
         if INCLUDE_METADATA:
             self.users.add(user)
 
+    @property
+    def properties(self) -> PropertyTable:
+        '''The export's properties, which are parsed on first access if the asset was loaded with properties.'''
+        properties = self.field_values.get('properties', None)
+        if properties is None or not properties.covers(get_ctx().property_filter):
+            if not self.asset.has_properties:
+                raise AttributeError('No field named "properties"')
+            self.deserialise_properties()
+            properties = self.field_values['properties']
+        return properties
+
     def deserialise_properties(self):
-        if 'properties' in self.field_values:
+        '''Parse this export's properties, replacing any previously parsed with a property filter.'''
+        existing = self.field_values.get('properties', None)
+        if existing is not None and existing.property_filter is None:
             raise RuntimeError('Attempt to deserialise properties more than once')
 
-        # We deferred deserialising the properties until all imports/exports were defined
-        stream = MemoryStream(self.stream, self.serial_offset, self.serial_size)
-        self._newField('properties', PropertyTable(self, weakref.proxy(stream)))
-        self.properties.link()
+        # Read from the asset's own stream, which retains the data until all properties have been parsed
+        if self.asset.data_released:
+            self.asset.reload_data()
+        stream = MemoryStream(self.asset.stream, self.serial_offset, self.serial_size)
+        with ue_parsing_context(link=True):
+            properties = PropertyTable(self, weakref.proxy(stream)).deserialise()
+            properties.link()
+
+        if existing is None:
+            self._newField('properties', properties)
+        else:
+            self.field_values['properties'] = properties
+
+        self.asset._export_properties_parsed(self, existing is None, properties.property_filter is None)
 
     def format_for_json(self):
         return dict(
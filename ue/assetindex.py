@@ -0,0 +1,111 @@
+'''
+In-memory index of the asset files available to a loader.
+
+This avoids walking the filesystem for every search and probing for each possible extension on every load.
+'''
+import os
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from utils.log import get_logger
+
+__all__ = [
+    'INDEXED_EXTENSIONS',
+    'AssetFileInfo',
+    'AssetIndex',
+]
+
+logger = get_logger(__name__)
+
+INDEXED_EXTENSIONS = ('.uasset', '.umap')
+
+
+class AssetFileInfo(NamedTuple):
+    filename: str
+    ext: str
+    size: int
+
+
+class AssetIndex:
+    '''
+    Index of the asset files within an asset path's Content directory, keyed by full filename.
+
+    Filenames are compared as the platform's filesystem would, so lookups ignore case on Windows.
+    Each mod directory is a separate segment, with everything else in the core segment (`None`).
+    Segments are scanned on first use and can be invalidated individually when their files change.
+    '''
+    def __init__(self, asset_path: Union[str, os.PathLike]):
+        self.asset_path = str(asset_path)
+        self.content_path = os.path.join(self.asset_path, 'Content')
+        self.mods_path = os.path.join(self.content_path, 'Mods')
+        self.segments: Dict[Optional[str], Dict[str, AssetFileInfo]] = dict()
+
+    def get(self, filename: str) -> Optional[AssetFileInfo]:
+        '''Get information about the given file, or None if it does not exist.'''
+        key = os.path.normcase(filename)
+        return self._get_segment(self._segment_of(key)).get(key, None)
+
+    def iterate(self, dirpath: str) -> Iterator[Tuple[str, AssetFileInfo]]:
+        '''Iterate over all indexed files within the given directory, as (filename, info), with on-disk filenames.'''
+        prefix = os.path.normcase(dirpath.rstrip(os.sep) + os.sep)
+        for segment in self._segments_within(dirpath):
+            for key, info in self._get_segment(segment).items():
+                if key.startswith(prefix):
+                    yield (info.filename, info)
+
+    def invalidate(self, modid: Optional[str] = None):
+        '''Forget the index of the given mod directory, or of everything if no mod is given.'''
+        if modid is None:
+            logger.debug('Invalidating the whole asset index')
+            self.segments = dict()
+        else:
+            logger.debug('Invalidating asset index for mod %s', modid)
+            self.segments.pop(os.path.normcase(str(modid)), None)
+
+    def _segment_of(self, path: str) -> Optional[str]:
+        # Segments are named by their case-normalised directory
+        prefix = os.path.normcase(self.mods_path + os.sep)
+        path = os.path.normcase(path)
+        if path.startswith(prefix):
+            return path[len(prefix):].split(os.sep, 1)[0]
+        return None
+
+    def _segments_within(self, dirpath: str) -> List[Optional[str]]:
+        segment = self._segment_of(dirpath)
+        if segment:
+            return [segment]
+
+        # Searches that cover the mods directory must include every mod
+        segments: List[Optional[str]] = [None]
+        if os.path.normcase(self.mods_path + os.sep).startswith(os.path.normcase(dirpath.rstrip(os.sep) + os.sep)):
+            if os.path.isdir(self.mods_path):
+                segments.extend(sorted(os.path.normcase(entry.name) for entry in os.scandir(self.mods_path) if entry.is_dir()))
+
+        return segments
+
+    def _get_segment(self, segment: Optional[str]) -> Dict[str, AssetFileInfo]:
+        files = self.segments.get(segment, None)
+        if files is None:
+            if segment is None:
+                files = _scan_files(self.content_path, skip=self.mods_path)
+            else:
+                files = _scan_files(os.path.join(self.mods_path, segment))
+            self.segments[segment] = files
+
+        return files
+
+
+def _scan_files(top: str, skip: Optional[str] = None) -> Dict[str, AssetFileInfo]:
+    files: Dict[str, AssetFileInfo] = dict()
+    for path, dirnames, filenames in os.walk(top):
+        if skip and path == os.path.dirname(skip):
+            dirnames[:] = [name for name in dirnames if os.path.join(path, name) != skip]
+
+        for filename in filenames:
+            ext = os.path.splitext(filename)[1]
+            if ext.lower() not in INDEXED_EXTENSIONS:
+                continue
+
+            fullpath = os.path.join(path, filename)
+            files[os.path.normcase(fullpath)] = AssetFileInfo(fullpath, ext, os.path.getsize(fullpath))
+
+    return files
@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional, Sequence
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Type
 
 from .context import INCLUDE_METADATA, get_ctx
 from .stream import MemoryStream
@@ -12,18 +13,27 @@ if INCLUDE_METADATA:
 else:
     support_pretty = False
 
+__all__ = (
+    'UEBase',
+    'CompactUEBase',
+)
+
 
 class UEBase(object):
+    __slots__ = ('stream', 'asset', 'field_values', 'start_offset', 'is_serialised', 'is_linked', 'is_inside_array', 'parent',
+                 'field_order', 'end_offset', '__weakref__')
+
     main_field: Optional[str] = None
     string_format: Optional[str] = None
     display_fields: Optional[Sequence[str]] = None
     skip_level_field: Optional[str] = None
+    transient_fields: Tuple[str, ...] = ()  # instance attributes that are not pickled
 
     def __init__(self, owner: "UEBase", stream=None):
         assert owner is not None, "Owner must be specified"
         self.stream: MemoryStream = stream or owner.stream
         self.asset = owner.asset  # type: ignore
-        self.field_values: Dict[str, Any] = {}
+        self._init_fields()
         self.start_offset: Optional[int] = None
         self.is_serialised = False
         self.is_linked = False
@@ -64,6 +74,9 @@ class UEBase(object):
 
         return self
 
+    def _init_fields(self):
+        self.field_values: Dict[str, Any] = {}
+
     def _deserialise(self, *args, **kwargs):
         raise NotImplementedError(f'Type "{self.__class__.__name__}" must implement a parse operation')
 
@@ -96,6 +109,33 @@ class UEBase(object):
         if isinstance(value, UEBase) and not value.is_serialised:
             value.deserialise(*extraArgs)
 
+    def __getstate__(self):
+        '''Gather state for pickling. Streams are left out as they are only required during parsing.'''
+        slot_values = dict()
+        for name, slot in _get_slot_descriptors(type(self)):
+            if name == 'stream':
+                continue
+            try:
+                slot_values[name] = slot.__get__(self)
+            except AttributeError:
+                pass
+
+        values = getattr(self, '__dict__', None)
+        if values and self.transient_fields:
+            values = {name: value for name, value in values.items() if name not in self.transient_fields}
+
+        return (values or None, slot_values)
+
+    def __setstate__(self, state):
+        '''Restore pickled state. This must be defined to stop unpickling falling back to `__getattr__`.'''
+        values, slot_values = state
+        if values:
+            self.__dict__.update(values)
+
+        for name, slot in _get_slot_descriptors(type(self)):
+            if name in slot_values:
+                slot.__set__(self, slot_values[name])
+
     def __eq__(self, other):
         return self is other  # only the same object is considered the equal
 
@@ -152,3 +192,79 @@ class UEBase(object):
                         p.pretty(self.field_values[name])
                 else:
                     p.pretty(self.field_values[fields[0]])
+
+
+class CompactUEBase(UEBase):
+    '''
+    Base for small, very numerous types that store their fields in slots rather than a per-instance dict.
+
+    Subclasses must list every field they define in `__slots__`. Fields are still defined using `_newField`
+    and `field_values` is available, although it is rebuilt on each access.
+    '''
+    __slots__ = ()
+
+    _field_slots: Tuple[Tuple[str, Any], ...] = ()
+    _field_slot_map: Dict[str, Any] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if '__slots__' not in vars(cls):
+            raise TypeError(f'Compact type "{cls.__name__}" must declare __slots__')
+
+        # Keep the slot descriptors so unset fields can be detected without falling back to __getattr__
+        own_slots = tuple((name, vars(cls)[name]) for name in vars(cls)['__slots__'])
+        cls._field_slots = cls._field_slots + own_slots
+        cls._field_slot_map = dict(cls._field_slots)
+
+    def _init_fields(self):
+        pass
+
+    @property  # type: ignore
+    def field_values(self) -> Dict[str, Any]:  # type: ignore
+        return dict(self._iter_fields())
+
+    def _iter_fields(self) -> Iterator[Tuple[str, Any]]:
+        for name, slot in self._field_slots:
+            try:
+                yield name, slot.__get__(self)
+            except AttributeError:
+                pass
+
+    def _link(self):
+        self._linkValues(value for _, value in self._iter_fields())
+
+    def _newField(self, name: str, value, *extraArgs):
+        slot = self._field_slot_map.get(name, None)
+        if slot is None:
+            raise NameError(f'Field "{name}" is not declared in the slots of "{self.__class__.__name__}"')
+
+        try:
+            slot.__get__(self)
+        except AttributeError:
+            pass
+        else:
+            raise NameError(f'Field "{name}" is already defined')
+
+        slot.__set__(self, value)
+
+        if INCLUDE_METADATA:
+            self.field_order.append(name)
+
+        if isinstance(value, UEBase) and not value.is_serialised:
+            value.deserialise(*extraArgs)
+
+    def __getattr__(self, name: str):
+        # Only called when a slot is unset or the name is unknown
+        raise AttributeError(f'No field named "{name}"')
+
+
+@lru_cache(maxsize=None)
+def _get_slot_descriptors(cls: Type[UEBase]) -> Tuple[Tuple[str, Any], ...]:
+    '''Collect the slot descriptors of a class and its bases. Using these directly avoids properties that shadow slots.'''
+    result: List[Tuple[str, Any]] = []
+    for base in cls.__mro__:
+        for name in vars(base).get('__slots__', ()):
+            if name not in ('__weakref__', '__dict__'):
+                result.append((name, vars(base)[name]))
+
+    return tuple(result)
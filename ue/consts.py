@@ -1,2 +1,5 @@
-SCRIPT_ENGINE_PKG = '/Script/Engine'
-BLUEPRINT_GENERATED_CLASS_CLS = SCRIPT_ENGINE_PKG + '.BlueprintGeneratedClass'
+import sys
+
+# Interned so comparisons against interned asset names can short-circuit on identity
+SCRIPT_ENGINE_PKG = sys.intern('/Script/Engine')
+BLUEPRINT_GENERATED_CLASS_CLS = sys.intern(SCRIPT_ENGINE_PKG + '.BlueprintGeneratedClass')
@@ -11,7 +11,7 @@ with ue_parsing_context(metadata=False, link=True, properties=False):
 '''
 
 from dataclasses import dataclass
-from typing import Optional, cast
+from typing import FrozenSet, Iterable, Optional, cast
 
 from utils.log import get_logger
 from utils.xlocal import xlocal
@@ -39,6 +39,7 @@ class ParsingContext:
     properties: bool
     bulk_data: bool
     context_level: int
+    property_filter: FrozenSet[str] = frozenset()  # empty for no filtering
 
 
 DEFAULT_CONTEXT = ParsingContext(
@@ -47,6 +48,7 @@ DEFAULT_CONTEXT = ParsingContext(
     properties=True,
     bulk_data=False,
     context_level=1,
+    property_filter=frozenset(),
 )
 
 __current_ctx = xlocal(**vars(DEFAULT_CONTEXT))
@@ -61,11 +63,17 @@ def ue_parsing_context(
         #    metadata: Optional[bool] = None,
         link: Optional[bool] = None,
         properties: Optional[bool] = None,
-        bulk_data: Optional[bool] = None):
+        bulk_data: Optional[bool] = None,
+        property_filter: Optional[Iterable[str]] = None):
     '''
     Change the current UE parsing context.
     This is a context manager for use in a `with` statement.
 
+    `property_filter` limits property decoding to the given property names. Other properties are skipped,
+    although their names are still recorded. Exports whose properties were parsed with a filter are
+    re-parsed if later accessed without one (or with one that asks for more). Pass an empty iterable
+    to remove a filter set by an outer context.
+
     Usage:
         with ue_parsing_context(metadata=False, properties=False):
             asset = loader[assetname]
@@ -79,6 +87,8 @@ def ue_parsing_context(
         fields['properties'] = properties
     if bulk_data is not None:
         fields['bulk_data'] = bulk_data
+    if property_filter is not None:
+        fields['property_filter'] = frozenset(property_filter)
 
     ctx = __current_ctx(**fields)
     return ctx
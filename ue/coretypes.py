@@ -1,6 +1,8 @@
+import struct
+import sys
 from typing import List, Type, Union
 
-from .base import UEBase
+from .base import CompactUEBase, UEBase
 from .context import INCLUDE_METADATA
 
 try:
@@ -18,6 +20,9 @@ __all__ = (
     'CompressedChunk',
 )
 
+UINT32_PAIR = struct.Struct('<II')
+UINT32_QUAD = struct.Struct('<IIII')
+
 
 class Table(UEBase):
     string_format = '{count} x {itemType.__name__}'
@@ -28,13 +33,13 @@ class Table(UEBase):
     values: List[UEBase]
     itemType: Type[UEBase]
 
-    def _deserialise(self, itemType: Type[UEBase], count: int):  # type: ignore # pylint: disable=arguments-differ
+    def _deserialise(self, itemType: Type[UEBase], count: int, **item_kwargs):  # type: ignore # pylint: disable=arguments-differ
         assert count is not None
         assert issubclass(itemType, UEBase), 'Table item type must be UEBase'
 
         values = []
         for _ in range(count):
-            value = itemType(self).deserialise()
+            value = itemType(self).deserialise(**item_kwargs)
             values.append(value)
 
         self._newField('itemType', itemType)
@@ -84,8 +89,9 @@ class ChunkPtr(UEBase):
     offset: int
 
     def _deserialise(self):
-        self._newField('count', self.stream.readUInt32())
-        self._newField('offset', self.stream.readUInt32())
+        count, offset = self.stream.readStruct(UINT32_PAIR)
+        self._newField('count', count)
+        self._newField('offset', offset)
 
 
 class GenerationInfo(UEBase):
@@ -93,8 +99,9 @@ class GenerationInfo(UEBase):
     name_count: int
 
     def _deserialise(self):
-        self._newField('export_count', self.stream.readUInt32())
-        self._newField('name_count', self.stream.readUInt32())
+        export_count, name_count = self.stream.readStruct(UINT32_PAIR)
+        self._newField('export_count', export_count)
+        self._newField('name_count', name_count)
 
 
 class CompressedChunk(UEBase):
@@ -104,13 +111,15 @@ class CompressedChunk(UEBase):
     compressed_size: int
 
     def _deserialise(self):
-        self._newField('uncompressed_offset', self.stream.readUInt32())
-        self._newField('uncompressed_size', self.stream.readUInt32())
-        self._newField('compressed_offset', self.stream.readUInt32())
-        self._newField('compressed_size', self.stream.readUInt32())
+        uncompressed_offset, uncompressed_size, compressed_offset, compressed_size = self.stream.readStruct(UINT32_QUAD)
+        self._newField('uncompressed_offset', uncompressed_offset)
+        self._newField('uncompressed_size', uncompressed_size)
+        self._newField('compressed_offset', compressed_offset)
+        self._newField('compressed_size', compressed_size)
 
 
-class NameIndex(UEBase):
+class NameIndex(CompactUEBase):
+    __slots__ = ('index', 'instance', 'value')
     main_field = 'value'
 
     index: int
@@ -119,15 +128,17 @@ class NameIndex(UEBase):
 
     def _deserialise(self):
         # Get the index but don't look up the actual value until the link phase
-        self._newField('index', self.stream.readUInt32())
-        self._newField('instance', self.stream.readUInt32())
+        index, instance = self.stream.readStruct(UINT32_PAIR)
+        self._newField('index', index)
+        self._newField('instance', instance)
 
     def _link(self):
-        self._newField('value', self.asset.getName(self.index))
+        name = self.asset.getName(self.index)
         if INCLUDE_METADATA:
-            self.value.register_user(self.parent or self)
+            name.register_user(self.parent or self)
         if self.instance:
-            self.field_values['value'] = f'{self.value}_{self.instance - 1}'
+            name = sys.intern(f'{name}_{self.instance - 1}')
+        self._newField('value', name)
 
     def format_for_json(self):
         return str(self)
@@ -140,35 +151,39 @@ class NameIndex(UEBase):
                 p.text(f'{cls}(<cyclic>)')
                 return
 
-            if 'value' in self.field_values:
+            if hasattr(self, 'value'):
                 p.pretty(self.value)
             else:
                 p.text(f'{cls}(index={self.index})')
 
 
-class ObjectIndex(UEBase):
+class ObjectIndex(CompactUEBase):
+    __slots__ = ('index', 'used_index', 'value')
     main_field = 'value'
     display_fields = ['index', 'value']
     skip_level_field = 'value'
 
     index: int
     used_index: int
-    kind: str
 
     def _deserialise(self):
         # Calculate the indexes but don't look up the actual import/export until the link phase
-        self._newField('index', self.stream.readInt32())  # object indexes are 32-bit and signed
-        if self.index < 0:
-            self.used_index = -self.index - 1
-            self.kind = 'import'
-        elif self.index > 0:
-            self.used_index = self.index - 1
-            self.kind = 'export'
+        index = self.stream.readInt32()  # object indexes are 32-bit and signed
+        self._newField('index', index)
+        if index < 0:
+            self._newField('used_index', -index - 1)
+        elif index > 0:
+            self._newField('used_index', index - 1)
         else:
-            self.used_index = 0
-            self.kind = 'none'
+            self._newField('used_index', 0)
 
-        self._newField('used_index', self.used_index)
+    @property
+    def kind(self) -> str:
+        if self.index < 0:
+            return 'import'
+        if self.index > 0:
+            return 'export'
+        return 'none'
 
     def _link(self):
         # Look up the import/export in the asset tables now they're completed
@@ -0,0 +1,113 @@
+'''
+Persistent on-disk cache of parsed assets.
+
+Assets are pickled with whatever properties have been parsed so far, along with the data needed to parse the rest
+on demand. This allows later runs to skip parsing the tables of files that have not changed since.
+'''
+import gc
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+from utils.log import get_logger
+
+from .asset import UAsset
+from .context import INCLUDE_METADATA, get_ctx
+
+__all__ = [
+    'PARSER_VERSION',
+    'DiskAssetCache',
+]
+
+logger = get_logger(__name__)
+
+# Increase this whenever a change to parsing would alter the structure of parsed assets
+PARSER_VERSION = 2
+
+
+class DiskAssetCache:
+    '''
+    Stores parsed assets on disk, keyed by the size and modification time of their source file.
+    Only assets loaded with properties are stored and maps are skipped as they are very large.
+    '''
+    def __init__(self, path: Path, recursion_limit=10000):
+        self.path = Path(path)
+        self.recursion_limit = recursion_limit
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def load(self, assetname: str, filename: str) -> Optional[UAsset]:
+        '''Load a previously stored asset, if its source file is unchanged and it satisfies the current context.'''
+        key = _make_key(filename)
+        if not key:
+            return None
+
+        # The garbage collector is paused while loading as it would otherwise repeatedly scan the new objects
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(self._get_cache_filename(assetname), 'rb') as f:
+                if pickle.load(f) != key:
+                    self.misses += 1
+                    return None
+                asset: UAsset = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:  # pylint: disable=broad-except
+            logger.warning('Cached asset %s could not be loaded and must be re-parsed', assetname, exc_info=True)
+            self.misses += 1
+            return None
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        if not asset.is_context_satisfied(get_ctx()):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return asset
+
+    def save(self, assetname: str, filename: str, asset: UAsset) -> bool:
+        '''Store a parsed asset, without parsing any more of its properties. Returns False if it was not stored.'''
+        key = _make_key(filename)
+        if not key or not asset.has_properties or asset.file_ext != '.uasset':
+            return False
+
+        cache_filename = self._get_cache_filename(assetname)
+        temp_filename = cache_filename.with_suffix('.tmp')
+        old_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(old_limit, self.recursion_limit))
+        try:
+            cache_filename.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_filename, 'wb') as f:
+                pickle.dump(key, f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(asset, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_filename, cache_filename)
+        except (IOError, RecursionError, pickle.PicklingError):
+            logger.warning('Unable to store cached asset %s', assetname, exc_info=True)
+            if temp_filename.is_file():
+                temp_filename.unlink()
+            return False
+        finally:
+            sys.setrecursionlimit(old_limit)
+
+        self.writes += 1
+        return True
+
+    def _get_cache_filename(self, assetname: str) -> Path:
+        return self.path / (assetname.strip('/') + '.pickle')
+
+
+def _make_key(filename: str) -> Optional[Tuple]:
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+
+    return (PARSER_VERSION, INCLUDE_METADATA, stat.st_size, stat.st_mtime_ns)
@@ -70,9 +70,9 @@ def find_default_for_class(fullname: str, loader: AssetLoader) -> ExportTableIte
             return cls.asset.default_export
 
         # Find the Default__ export for this class and return its properties
-        for export in cls.asset.exports:
-            if str(export.name).startswith('Default__') and export.klass and export.klass.value is cls:
-                return export
+        export = cls.asset.class_defaults.get(cls, None)
+        if export is not None:
+            return export
 
         raise RuntimeError("Unable to find Default__ property export for: " + str(cls))
 
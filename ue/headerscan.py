@@ -0,0 +1,169 @@
+'''
+Fast, header-only scanning of assets for hierarchy discovery.
+
+This reads just the package summary and the name, import and export tables using flat struct decoding,
+without creating any UEBase objects. The result is the minimal information needed to place an asset's
+classes into the hierarchy.
+'''
+import struct
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .consts import BLUEPRINT_GENERATED_CLASS_CLS
+
+__all__ = [
+    'ExportHeader',
+    'scan_asset_exports',
+    'scan_asset_imports',
+    'find_exports_to_store',
+    'get_header_parent',
+]
+
+MAP_CLASSES_TO_STORE = ('/Script/Engine.World', '/Script/Engine.LevelScriptActor')
+
+SUMMARY_TOP = struct.Struct('<IiiIII')  # tag, legacy/ue/file/licensee versions, custom version count
+CUSTOM_VERSION_TOP = struct.Struct('<16sI')  # guid, version
+CHUNK_PTRS = struct.Struct('<IIIIII')  # names, exports, imports
+INT32 = struct.Struct('<i')
+UINT32 = struct.Struct('<I')
+IMPORT_ITEM = struct.Struct('<IIIIiII')  # package, klass, namespace, name
+EXPORT_ITEM = struct.Struct('<iiiII48x')  # klass, super, namespace, name, (remaining fields skipped)
+
+NAME_INDEX_MASK = 0xFFFFF
+
+
+class ExportHeader(NamedTuple):
+    name: str
+    fullname: str
+    klass: Optional[str]
+    super: Optional[str]
+
+
+def scan_asset_exports(mem: Sequence, assetname: str) -> List[ExportHeader]:
+    '''
+    Read the export table of an asset, resolving each export's class and super to full names.
+    `mem` is the raw asset data and `assetname` the clean name of the asset.
+    '''
+    names, imports, exports = _read_tables(mem)
+
+    def get_name(index: int, instance: int) -> str:
+        name = names[index & NAME_INDEX_MASK]
+        if instance:
+            return f'{name}_{instance - 1}'
+        return name
+
+    def get_object_name(index: int) -> Optional[str]:
+        if index < 0 and -index <= len(imports):
+            _, _, _, _, _, name_idx, name_inst = imports[-index - 1]
+            return get_name(name_idx, name_inst)
+        if index > 0 and index <= len(exports):
+            _, _, _, name_idx, name_inst = exports[index - 1]
+            return get_name(name_idx, name_inst)
+        return None
+
+    def get_fullname(index: int) -> Optional[str]:
+        if index < 0 and -index <= len(imports):
+            _, _, _, _, namespace, name_idx, name_inst = imports[-index - 1]
+            name = get_name(name_idx, name_inst)
+            namespace_name = get_object_name(namespace)
+            return f'{namespace_name}.{name}' if namespace_name is not None else name
+        if index > 0 and index <= len(exports):
+            return f'{assetname}.{get_object_name(index)}'
+        return None
+
+    result: List[ExportHeader] = []
+    for (klass, super_, _, name_idx, name_inst) in exports:
+        name = get_name(name_idx, name_inst)
+        result.append(ExportHeader(name, f'{assetname}.{name}', get_fullname(klass), get_fullname(super_)))
+
+    return result
+
+
+def scan_asset_imports(mem: Sequence) -> List[str]:
+    '''Read the names of the packages imported by an asset, such as '/Script/Engine' or '/Game/Path/To/Asset'.'''
+    names, imports, _ = _read_tables(mem, exports=False)
+    result: List[str] = []
+    for (_, _, klass_idx, _, namespace, name_idx, _) in imports:
+        if not namespace and names[klass_idx & NAME_INDEX_MASK] == 'Package':
+            result.append(names[name_idx & NAME_INDEX_MASK])
+
+    return result
+
+
+def find_exports_to_store(exports: List[ExportHeader], assetname: str, ext: str) -> Iterator[ExportHeader]:
+    '''
+    Select the exports that hierarchy discovery records for an asset.
+    This mirrors the default export/class selection performed by `AssetLoader._load_asset`.
+    '''
+    default_exports = [export for export in exports if export.name.startswith('Default__')]
+    default_cls: Optional[ExportHeader] = None
+    if default_exports:
+        # The default class is the class of the Default__ export, which should be local to this asset
+        default_cls = next((export for export in exports if export.fullname == default_exports[0].klass), None)
+    else:
+        # Fall back to an export named the same as the asset
+        leafname = assetname.split('/')[-1].lower()
+        named_exports = [export for export in exports if export.name.lower() == leafname]
+        if len(named_exports) == 1:
+            default_cls = named_exports[0]
+
+    if default_cls:
+        yield default_cls
+
+    if ext == '.umap':
+        for export in exports:
+            if export.klass in MAP_CLASSES_TO_STORE:
+                yield export
+
+
+def get_header_parent(export: ExportHeader) -> Optional[str]:
+    '''Calculate the hierarchy parent of an export, in the same way as `ue.hierarchy._get_parent_cls`.'''
+    if export.klass == BLUEPRINT_GENERATED_CLASS_CLS:
+        return export.super
+    return export.klass
+
+
+def _read_tables(mem: Sequence, exports=True) -> Tuple[List[str], List[Tuple], List[Tuple]]:
+    offset = 0
+    _, _, _, _, _, custom_version_count = SUMMARY_TOP.unpack_from(mem, offset)
+    offset += SUMMARY_TOP.size
+
+    for _ in range(custom_version_count):
+        offset += CUSTOM_VERSION_TOP.size
+        _, offset = _read_string(mem, offset)
+
+    offset += UINT32.size  # header_size
+    _, offset = _read_string(mem, offset)  # package_group
+    offset += UINT32.size  # package_flags
+
+    (name_count, name_offset, export_count, export_offset, import_count, import_offset) = CHUNK_PTRS.unpack_from(mem, offset)
+
+    names = _read_names(mem, name_offset, name_count)
+    import_items = list(_iter_table(mem, IMPORT_ITEM, import_offset, import_count))
+    export_items = list(_iter_table(mem, EXPORT_ITEM, export_offset, export_count)) if exports else []
+    return names, import_items, export_items
+
+
+def _read_string(mem: Sequence, offset: int) -> Tuple[str, int]:
+    size, = INT32.unpack_from(mem, offset)
+    offset += INT32.size
+    if size >= 0:
+        value = bytes(mem[offset:offset + size - 1]).decode('utf8') if size else ''
+        return value, offset + size
+
+    size = -size * 2
+    value = bytes(mem[offset:offset + size - 2]).decode('utf-16-le')
+    return value, offset + size
+
+
+def _read_names(mem: Sequence, offset: int, count: int) -> List[str]:
+    names: List[str] = []
+    for _ in range(count):
+        name, offset = _read_string(mem, offset)
+        names.append(name)
+    return names
+
+
+def _iter_table(mem: Sequence, item: struct.Struct, offset: int, count: int) -> Iterator[Tuple]:
+    if not count:
+        return iter(())
+    return item.iter_unpack(mem[offset:offset + item.size * count])
@@ -1,15 +1,19 @@
+from concurrent.futures import ProcessPoolExecutor
 from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, Iterator, Optional, Union
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar, Union
 
 import yaml
 
 from ue.asset import ExportTableItem, UAsset
 from ue.context import ue_parsing_context
-from ue.loader import AssetLoader, AssetLoadException
+from ue.headerscan import ExportHeader, find_exports_to_store, get_header_parent, scan_asset_exports
+from ue.loader import AssetLoader, AssetLoadException, AssetParseError, ExportNotFound, load_file_into_memory, release_memory
 from ue.tree import get_parent_fullname
 from utils.log import get_logger
-from utils.tree import IndexedTree, Node
+from utils.compacttree import CompactNode, CompactTree
+from utils.tree import Node
 
 from .consts import BLUEPRINT_GENERATED_CLASS_CLS
 
@@ -20,18 +24,24 @@ __all__ = [
     'MissingParent',
     'inherits_from',
     'find_sub_classes',
+    'find_sub_classes_by_package',
+    'get_package_root',
     'find_parent_classes',
     'get_parent_class',
     'load_internal_hierarchy',
     'explore_asset',
     'explore_path',
     'iterate_all',
+    'get_edges',
+    'add_edges',
 ]
 
 logger = get_logger(__name__)
 
 ROOT_NAME = '/Script/CoreUObject.Object'
 
+DISCOVERY_CHUNK_SIZE = 64  # assets sent to a worker process at a time
+
 
 @lru_cache(maxsize=1024)
 def _get_parent_cls(export: ExportTableItem) -> Optional[str]:
@@ -53,9 +63,18 @@ class MissingParent(HierarchyError):
     pass
 
 
-tree: IndexedTree[str] = IndexedTree[str](ROOT_NAME)
+class ClassEdge(NamedTuple):
+    fullname: str
+    parent: Optional[str]
+
+
+tree: CompactTree = CompactTree(ROOT_NAME)
 asset_extensions = ('.uasset', '.umap')
 
+# Sub-classes grouped by package root, valid for a single generation of the tree
+_sub_class_index: Dict[str, Dict[str, Tuple[str, ...]]] = dict()
+_sub_class_index_source: Tuple[Optional[CompactTree], int] = (None, 0)
+
 
 def inherits_from(klass: Union[str, ExportTableItem], target: str, safe=False, include_self=False) -> bool:
     '''
@@ -64,7 +83,16 @@ def inherits_from(klass: Union[str, ExportTableItem], target: str, safe=False, i
     `target` should be a full classname.
     `safe` as True will return False when encountering a HierarchyError.
     `include_self` to allow the case where the two inputs are equivalent.
+
+    Classes already in the hierarchy are checked in constant time using the tree's pre/post-order numbering.
     '''
+    name = klass if isinstance(klass, str) else klass.fullname if isinstance(klass, ExportTableItem) else None
+    if name is not None and name in tree:
+        if name == target:
+            return include_self
+        return target in tree and tree.is_descendant(name, target)
+
+    # Fall back to walking up through exports that are not yet in the tree
     if safe:
         try:
             return target in find_parent_classes(klass, include_self=include_self)
@@ -81,13 +109,7 @@ def find_sub_classes(klass: Union[str, ExportTableItem]) -> Iterator[str]:
     Iterate over all sub-classes of the given class.
     `klass` should be a full classname or an exported class.
     '''
-    if isinstance(klass, str):
-        name = klass
-    elif isinstance(klass, ExportTableItem):
-        assert klass.fullname
-        name = klass.fullname
-    else:
-        raise TypeError('Invalid argument')
+    name = _name_from_argument(klass)
 
     node = tree.get(name, None)
     if not node:
@@ -96,6 +118,45 @@ def find_sub_classes(klass: Union[str, ExportTableItem]) -> Iterator[str]:
     yield from (node.data for node in node.walk_iterator(skip_self=True))
 
 
+def find_sub_classes_by_package(klass: Union[str, ExportTableItem]) -> Dict[str, Tuple[str, ...]]:
+    '''
+    Get all sub-classes of the given class, grouped by the package root they live in (see `get_package_root`).
+    `klass` should be a full classname or an exported class.
+
+    The result is built once per class and kept until the hierarchy changes, so repeated lookups for
+    each mod are cheap. It must not be modified.
+    '''
+    name = _name_from_argument(klass)
+
+    global _sub_class_index, _sub_class_index_source  # pylint: disable=global-statement
+    if _sub_class_index_source != (tree, tree.generation):
+        _sub_class_index = dict()
+        _sub_class_index_source = (tree, tree.generation)
+
+    index = _sub_class_index.get(name, None)
+    if index is None:
+        grouped: Dict[str, List[str]] = dict()
+        for sub_name in find_sub_classes(name):
+            grouped.setdefault(get_package_root(sub_name), []).append(sub_name)
+        index = {root: tuple(names) for root, names in grouped.items()}
+        _sub_class_index[name] = index
+
+    return index
+
+
+def get_package_root(fullname: str) -> str:
+    '''
+    Get the root a class is grouped under by `find_sub_classes_by_package`.
+    This is '/Game/Mods/<mod>' for classes within a mod, otherwise the top-level package such as '/Game' or '/Script'.
+    '''
+    parts = fullname.split('/', 4)
+    if len(parts) < 3:
+        return fullname
+    if parts[1] == 'Game' and parts[2] == 'Mods':
+        return '/'.join(parts[:4]) if len(parts) > 4 else '/Game/Mods'
+    return '/' + parts[1]
+
+
 def find_parent_classes(klass: Union[str, ExportTableItem], *, include_self=False) -> Iterator[str]:
     '''
     Iterate over an export's parent classes.
@@ -151,10 +212,48 @@ def iterate_all() -> Iterator[str]:
     yield from tree.keys()
 
 
+def get_edges(start: int = 0) -> List[Tuple[str, str]]:
+    '''
+    Get (class, parent) pairs for the classes in the hierarchy, in the order they were added.
+    `start` skips that many classes, allowing the classes added by a single discovery step to be captured.
+    '''
+    edges: List[Tuple[str, str]] = []
+    for name in islice(tree.keys(), start, None):
+        parent = tree[name].parent_data
+        if parent is not None:
+            edges.append((name, parent))
+
+    return edges
+
+
+def add_edges(edges: Iterable[Tuple[str, str]]) -> bool:
+    '''
+    Add (class, parent) pairs from `get_edges` to the hierarchy. Classes that are already present are skipped.
+    Returns False if a parent could not be found, in which case the remaining edges are not added.
+    '''
+    for name, parent in edges:
+        if name in tree:
+            continue
+        if parent not in tree:
+            return False
+        tree.add(parent, name)
+
+    return True
+
+
 NO_DEFAULT = object()
 
 
-def _node_from_argument(klass: Union[str, ExportTableItem], default=NO_DEFAULT) -> Node[str]:
+def _name_from_argument(klass: Union[str, ExportTableItem]) -> str:
+    if isinstance(klass, str):
+        return klass
+    if isinstance(klass, ExportTableItem):
+        assert klass.fullname
+        return klass.fullname
+    raise TypeError('Invalid argument')
+
+
+def _node_from_argument(klass: Union[str, ExportTableItem], default=NO_DEFAULT) -> CompactNode:
     if isinstance(klass, str):
         name = klass
     elif isinstance(klass, ExportTableItem):
@@ -201,8 +300,18 @@ def explore_asset(assetname: str, loader: AssetLoader):
     _ingest_asset(asset, loader, asset.file_ext)
 
 
-def explore_path(path: str, loader: AssetLoader, excludes: Iterable[str], verbose=False, disable_debug=False):
-    '''Run hierarchy discovery over every matching asset within the given path.'''
+def explore_path(path: str,
+                 loader: AssetLoader,
+                 excludes: Iterable[str],
+                 verbose=False,
+                 disable_debug=False,
+                 fast=False,
+                 workers=1):
+    '''
+    Run hierarchy discovery over every matching asset within the given path.
+    `fast` as True reads only the header tables of each asset, without fully parsing them.
+    `workers` above 1 scans asset headers using that many worker processes, which implies `fast`.
+    '''
     excludes = set(excludes)
 
     logger.info('Discovering hierarchy in path: %s', path)
@@ -211,11 +320,19 @@ def explore_path(path: str, loader: AssetLoader, excludes: Iterable[str], verbos
 
     with ue_parsing_context(properties=False):
         asset_iterator = loader.find_assetnames('.*', path, exclude=excludes, extension=asset_extensions, return_extension=True)
+        if workers > 1:
+            _explore_assets_in_parallel(asset_iterator, loader, workers, verbose)
+            return
+
         for (assetname, ext) in asset_iterator:
             n += 1
             if verbose and n % 200 == 0:
                 logger.info(assetname)
 
+            if fast:
+                _explore_asset_headers(assetname, loader, ext)
+                continue
+
             try:
                 asset = loader.load_asset(assetname, quiet=disable_debug)
             except AssetLoadException:
@@ -251,8 +368,122 @@ def _ingest_asset(asset: UAsset, loader: AssetLoader, ext: str):
         _ingest_export(export, loader)
 
 
+def _explore_asset_headers(assetname: str, loader: AssetLoader, ext: str):
+    assetname = loader.clean_asset_name(assetname)
+    try:
+        exports, _ = _scan_asset(assetname, loader)
+    except AssetLoadException:
+        logger.warning("Failed to load asset: %s", assetname)
+        return
+
+    try:
+        for export in find_exports_to_store(exports, assetname, ext):
+            _ingest_export_header(export, loader)
+    except AssetLoadException:
+        logger.warning("Failed to check parentage of %s", assetname)
+    except MissingParent as ex:
+        logger.exception("Missing parent for %s", assetname)
+        raise MissingParent from ex
+
+
+def _explore_assets_in_parallel(assets: Iterable[Tuple[str, str]], loader: AssetLoader, workers: int, verbose: bool):
+    jobs: List[Tuple[str, str, str, bool]] = []
+    for (assetname, ext) in assets:
+        assetname = loader.clean_asset_name(assetname)
+        jobs.append((assetname, loader.convert_asset_name_to_path(assetname, ext=ext), ext, loader.use_mmap))
+
+    if not jobs:
+        return
+
+    # Scanning is independent per asset, so it is done up-front in the workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_scan_file_edges, jobs, chunksize=DISCOVERY_CHUNK_SIZE))
+
+    # Parents scanned in this batch can then be found without reading them again
+    edges: Dict[str, ClassEdge] = dict()
+    for result in results:
+        for edge in result or ():
+            edges[edge.fullname] = edge
+
+    def load_parent(fullname: str) -> ClassEdge:
+        edge = edges.get(fullname, None)
+        if edge:
+            return edge
+        export = _scan_class(fullname, loader)
+        return ClassEdge(export.fullname, get_header_parent(export))
+
+    # Merge in the original order so the resulting tree is identical to that of a serial scan
+    for n, ((assetname, _, _, _), result) in enumerate(zip(jobs, results), 1):
+        if verbose and n % 200 == 0:
+            logger.info(assetname)
+
+        if result is None:
+            logger.warning("Failed to load asset: %s", assetname)
+            continue
+
+        try:
+            for edge in result:
+                _ingest_class(edge, _get_edge_parent, load_parent)
+        except AssetLoadException:
+            logger.warning("Failed to check parentage of %s", assetname)
+        except MissingParent as ex:
+            logger.exception("Missing parent for %s", assetname)
+            raise MissingParent from ex
+
+
+def _scan_file_edges(job: Tuple[str, str, str, bool]) -> Optional[List[ClassEdge]]:
+    '''Worker process entry point, returning the edges of the classes to be stored for an asset.'''
+    assetname, filename, ext, use_mmap = job
+    try:
+        mem = load_file_into_memory(filename, use_mmap=use_mmap)
+        try:
+            exports = scan_asset_exports(mem, assetname)
+        finally:
+            release_memory(mem)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    return [ClassEdge(export.fullname, get_header_parent(export)) for export in find_exports_to_store(exports, assetname, ext)]
+
+
+def _get_edge_parent(edge: ClassEdge) -> Optional[str]:
+    return edge.parent
+
+
+def _scan_asset(assetname: str, loader: AssetLoader) -> Tuple[List[ExportHeader], str]:
+    mem, ext = loader.load_raw_asset(assetname)
+    try:
+        return scan_asset_exports(mem, assetname), ext
+    except Exception as ex:
+        raise AssetParseError(assetname) from ex
+    finally:
+        release_memory(mem)
+
+
+def _scan_class(fullname: str, loader: AssetLoader) -> ExportHeader:
+    (assetname, cls_name) = fullname.split('.')
+    assetname = loader.clean_asset_name(assetname)
+    exports, _ = _scan_asset(assetname, loader)
+    for export in exports:
+        if export.name == cls_name:
+            return export
+
+    raise ExportNotFound(assetname, cls_name)
+
+
 def _ingest_export(export: ExportTableItem, loader: AssetLoader):
-    current_cls: ExportTableItem = export
+    _ingest_class(export, _get_parent_cls, lambda name: loader.load_class(name, quiet=True))
+
+
+def _ingest_export_header(export: ExportHeader, loader: AssetLoader):
+    _ingest_class(export, get_header_parent, lambda name: _scan_class(name, loader))
+
+
+T = TypeVar('T', ExportTableItem, ExportHeader, ClassEdge)
+
+
+def _ingest_class(export: T, get_parent: Callable[[T], Optional[str]], load_parent: Callable[[str], T]):
+    current_cls: T = export
 
     segment: Optional[Node[str]] = None
     fullname = current_cls.fullname
@@ -270,7 +501,7 @@ def _ingest_export(export: ExportTableItem, loader: AssetLoader):
             segment.add(old_segment)
 
         # Get name of parent class
-        parent_name = _get_parent_cls(current_cls)
+        parent_name = get_parent(current_cls)
         if not parent_name:
             raise MissingParent(f'Unable to find parent of {fullname}')
 
@@ -289,7 +520,6 @@ def _ingest_export(export: ExportTableItem, loader: AssetLoader):
             return
 
         # Load parent class and replace current
-        parent_cls = loader.load_class(parent_name, quiet=True)
-        current_cls = parent_cls
+        current_cls = load_parent(parent_name)
         fullname = current_cls.fullname
         assert fullname
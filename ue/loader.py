@@ -1,18 +1,24 @@
+import mmap
 import os.path
 import re
+import time
+import weakref
 from abc import ABC, abstractmethod
 from configparser import ConfigParser
+from functools import lru_cache
 from itertools import islice
 from pathlib import Path
-from typing import Dict, Iterable, Optional, Tuple, Union
-
-import psutil  # type: ignore
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from utils.log import get_logger
 
 from .asset import ExportTableItem, ImportTableItem, UAsset
+from .assetindex import INDEXED_EXTENSIONS, AssetIndex
 from .base import UEBase
 from .context import get_ctx
+from .diskcache import DiskAssetCache
+from .loadstats import LoadStats
+from .prefetch import AssetPrefetcher
 from .properties import ObjectProperty, Property
 from .stream import MemoryStream
 
@@ -24,13 +30,28 @@ __all__ = (
     'AssetNotFound',
     'AssetParseError',
     'AssetLoader',
+    'CacheManager',
+    'DictCacheManager',
+    'UsageBasedCacheManager',
+    'ContextAwareCacheWrapper',
     'load_file_into_memory',
+    'retain_memory',
+    'release_memory',
     'ModResolver',
     'IniModResolver',
 )
 
 NO_FALLBACK = object()
 
+# Number of asset names whose normalised forms are remembered by each loader
+NAME_CACHE_SIZE = 16384
+
+# Approximate memory used by each entry of a parsed asset's name, import and export tables, in bytes
+TABLE_ENTRY_SIZES = (840, 2600, 1650)
+
+# Approximate ratio of the memory used by parsed properties to their serialised size
+PROPERTY_EXPANSION_FACTOR = 58
+
 
 class AssetLoadException(Exception):
     pass
@@ -110,34 +131,116 @@ class CacheManager(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def wipe(self, prefix: str = ''):
+    def wipe(self, prefix: str = '') -> int:
+        '''Remove entries beginning with the given prefix (or all entries), returning the estimated bytes freed.'''
         raise NotImplementedError
 
+    def contains(self, name: str) -> bool:
+        '''Check whether an asset is cached, without counting as a use of it.'''
+        return self.lookup(name) is not None
+
+    def update_size(self, name: str, asset: UAsset):
+        '''Called when the memory retained by a cached asset changes, e.g. as its properties are parsed.'''
+
     @abstractmethod
     def get_count(self):
         raise NotImplementedError
 
+    def get_stats(self) -> Dict[str, int]:
+        return dict(count=self.get_count())
+
+
+def estimate_asset_size(asset: UAsset, property_factor: float = PROPERTY_EXPANSION_FACTOR) -> int:
+    '''
+    Estimate the memory retained by a loaded asset, in bytes.
+
+    This covers the parsed tables, the file's data while the asset retains it, and the properties parsed so far,
+    which use around `property_factor` times their serialised size.
+    '''
+    size = len(asset.stream.mem) + asset.parsed_property_size * property_factor
+    if asset.is_serialised:
+        name_size, import_size, export_size = TABLE_ENTRY_SIZES
+        size += len(asset.names.values) * name_size
+        size += len(asset.imports.values) * import_size
+        size += len(asset.exports.values) * export_size
+
+    return int(size)
+
+
+class CacheSegmentIndex:
+    '''
+    Groups cached asset names by their mod or top-level path segment.
+    This allows prefix searches to visit only the entries of the relevant segments.
+    '''
+    def __init__(self):
+        self.segments: Dict[str, Set[str]] = dict()
+
+    def add(self, name: str):
+        self.segments.setdefault(_get_cache_segment(name), set()).add(name)
+
+    def remove(self, name: str):
+        segment = _get_cache_segment(name)
+        names = self.segments.get(segment, None)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del self.segments[segment]
+
+    def clear(self):
+        self.segments = dict()
+
+    def find(self, prefix: str) -> List[str]:
+        '''Find all names that begin with the given prefix.'''
+        found: List[str] = []
+        for segment, names in self.segments.items():
+            if segment.startswith(prefix):
+                found.extend(names)
+            elif prefix.startswith(segment):
+                found.extend(name for name in names if name.startswith(prefix))
+
+        return found
+
+
+def _get_cache_segment(name: str) -> str:
+    # Mods are grouped by mod (/Game/Mods/<mod>) and everything else by its top-level directory (/Game/<dir>)
+    parts = name.split('/', 5)
+    if len(parts) > 4 and parts[2] == 'Mods':
+        return '/'.join(parts[:4])
+    return '/'.join(parts[:3])
+
 
 class DictCacheManager(CacheManager):
     '''A cache manager implementing the old unintelligent mechanism.'''
     def __init__(self):
         self.cache: Dict[str, UAsset] = dict()
+        self.index = CacheSegmentIndex()
 
     def lookup(self, name: str) -> Optional[UAsset]:
         return self.cache.get(name, None)
 
+    def contains(self, name: str) -> bool:
+        return name in self.cache
+
     def add(self, name: str, asset: UAsset):
         self.cache[name] = asset
+        self.index.add(name)
 
     def remove(self, name):
         del self.cache[name]
+        self.index.remove(name)
 
-    def wipe(self, prefix: str = ''):
+    def wipe(self, prefix: str = '') -> int:
         if not prefix:
+            freed = sum(estimate_asset_size(asset) for asset in self.cache.values())
             self.cache = dict()
-        else:
-            for name in list(key for key in self.cache if key.startswith(prefix)):
-                del self.cache[name]
+            self.index.clear()
+            return freed
+
+        freed = 0
+        for name in self.index.find(prefix):
+            freed += estimate_asset_size(self.cache.pop(name))
+            self.index.remove(name)
+        return freed
 
     def get_count(self):
         return len(self.cache)
@@ -148,14 +251,35 @@ class UsageBasedCacheManager(CacheManager):
     A cache manager that prioritises the most recently used entries.
 
     We use the guaranteed ordering of Python dicts to track the most recently used entries.
+    Entries are evicted when there are too many of them or, if `max_bytes` is given, when their estimated
+    total size exceeds it. Sizes are estimated by `estimate_asset_size` and updated as properties are parsed.
+
+    Evicted entries are kept in a weakly-referenced tier, so assets that are still in use elsewhere (e.g. by
+    proxies) are found again without re-parsing. Explicit removals and wipes also clear that tier. Evicted assets drop
+    their file data, so only entries in the main cache retain it.
     '''
-    def __init__(self, max_count=3000, max_memory=6 * 1024 * 1024 * 1024, keep_count=500):
+    def __init__(self,
+                 max_count=3000,
+                 max_bytes: Optional[int] = None,
+                 keep_count=500,
+                 property_factor: float = PROPERTY_EXPANSION_FACTOR):
         self.cache: Dict[str, UAsset] = dict()
+        self.sizes: Dict[str, int] = dict()
+        self.index = CacheSegmentIndex()
+        self.evicted: 'weakref.WeakValueDictionary[str, UAsset]' = weakref.WeakValueDictionary()
+        # Names in the weak tier, which may include some that have since been collected or revived
+        self.evicted_index = CacheSegmentIndex()
+        self.evicted_indexed = 0
         self.max_count = max_count
-        self.max_memory = max_memory
+        self.max_bytes = max_bytes
         self.keep_count = keep_count
+        self.property_factor = property_factor
 
-        self.highest_memory_seen = 0
+        self.total_size = 0
+        self.hits = 0
+        self.weak_hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def lookup(self, name: str):
         '''
@@ -168,9 +292,22 @@ class UsageBasedCacheManager(CacheManager):
         if result:
             # Re-insert at the end
             self.cache[name] = result
+            self.hits += 1
+            return result
+
+        # Evicted assets that are still alive go back into the main cache
+        result = self.evicted.pop(name, None)
+        if result:
+            self.weak_hits += 1
+            self.add(name, result)
+        else:
+            self.misses += 1
 
         return result
 
+    def contains(self, name: str) -> bool:
+        return name in self.cache or name in self.evicted
+
     def add(self, name: str, asset: UAsset):
         '''
         Add an asset to the cache, replacing any previous asset with the same name.
@@ -178,60 +315,124 @@ class UsageBasedCacheManager(CacheManager):
         Note that this marks it as recently used, and hence less likely to be purged.
         '''
         # Discard any previous version
-        self.cache.pop(name, None)
+        self._discard(name)
 
         # Add to the end of the cache
         self.cache[name] = asset
+        self.index.add(name)
+        size = self.estimate_size(asset)
+        self.sizes[name] = size
+        self.total_size += size
 
         # Check if we have too many assets
         self._maybe_purge()
 
+    def update_size(self, name: str, asset: UAsset):
+        '''Re-estimate the size of a cached asset that has changed, evicting other entries if over budget.'''
+        if self.cache.get(name, None) is not asset:
+            return
+
+        size = self.estimate_size(asset)
+        self.total_size += size - self.sizes[name]
+        self.sizes[name] = size
+        self._maybe_purge()
+
     def remove(self, name: str):
         '''
         Remove the named asset from the cache.
         '''
         logger.debug('Removing cache entry: %s', name)
-        found = self.cache.pop(name, None)
+        found = self._discard(name)
+        found = self.evicted.pop(name, None) or found
         if not found:
             logger.warning('Attempt to remove asset that was not found: %s', name)
 
-    def wipe(self, prefix: str = ''):
+    def wipe(self, prefix: str = '') -> int:
         '''
-        Remove cache entries that begin with the given prefix.
+        Remove cache entries that begin with the given prefix, returning the estimated bytes freed.
 
         An empty or None prefix wipes the entire cache.
         '''
+        old_size = self.total_size
         if not prefix:
             logger.debug('Wiping cache completely')
             # Full wipe
             self.cache = dict()
+            self.sizes = dict()
+            self.index.clear()
+            self.evicted = weakref.WeakValueDictionary()
+            self.evicted_index.clear()
+            self.evicted_indexed = 0
+            self.total_size = 0
         else:
             logger.debug('Wiping cache with prefix: %s', prefix)
-            to_cull = list(key for key in self.cache if key.startswith(prefix))
-            for name in to_cull:
-                del self.cache[name]
+            for name in self.index.find(prefix):
+                self._discard(name)
+            for name in self.evicted_index.find(prefix):
+                self.evicted.pop(name, None)
+                self.evicted_index.remove(name)
+                self.evicted_indexed -= 1
+
+        return old_size - self.total_size
 
     def get_count(self):
         return len(self.cache)
 
-    def _maybe_purge(self):
-        mem_used = psutil.Process().memory_info().rss
-        if mem_used > self.highest_memory_seen:
-            self.highest_memory_seen = mem_used
+    def get_stats(self) -> Dict[str, int]:
+        return dict(count=len(self.cache),
+                    size=self.total_size,
+                    hits=self.hits,
+                    weak_hits=self.weak_hits,
+                    misses=self.misses,
+                    evictions=self.evictions,
+                    weak_count=len(self.evicted))
+
+    def estimate_size(self, asset: UAsset) -> int:
+        '''Estimate the memory retained by a loaded asset, in bytes.'''
+        return estimate_asset_size(asset, self.property_factor)
+
+    def _discard(self, name: str) -> Optional[UAsset]:
+        found = self.cache.pop(name, None)
+        if found is not None:
+            self.index.remove(name)
+        self.total_size -= self.sizes.pop(name, 0)
+        return found
 
+    def _maybe_purge(self):
         cache_count = len(self.cache)
 
         if cache_count >= self.max_count:
             logger.debug("Asset cache purge due to too many items")
             self._purge(cache_count - self.keep_count)
-        # elif mem_used >= self.max_memory and cache_count > self.keep_count:
-        #     logger.info("Asset cache purge due to high memory usage (with %d items)", cache_count)
-        #     self._purge(cache_count - self.keep_count)
+
+        if self.max_bytes is not None and self.total_size > self.max_bytes:
+            logger.debug("Asset cache purge due to size budget (with %d items)", len(self.cache))
+            # Always keep the newest entry, even if it alone exceeds the budget
+            while self.total_size > self.max_bytes and len(self.cache) > 1:
+                self._purge(1)
 
     def _purge(self, amount: int):
         to_cull = list(islice(self.cache, amount))
         for name in to_cull:
-            del self.cache[name]
+            asset = self._discard(name)
+            if asset is not None:
+                # Evicted assets keep only what has been parsed, re-reading their data if more is needed
+                if asset.loader and asset.assetname:
+                    asset.release_data()
+                self.evicted[name] = asset
+                self._index_evicted(name)
+        self.evictions += len(to_cull)
+
+    def _index_evicted(self, name: str):
+        # Names are left in the index when their assets are collected, so it is rebuilt once mostly stale
+        if self.evicted_indexed > 2 * len(self.evicted) + self.keep_count:
+            self.evicted_index.clear()
+            for existing in self.evicted.keys():
+                self.evicted_index.add(existing)
+            self.evicted_indexed = len(self.evicted)
+
+        self.evicted_index.add(name)
+        self.evicted_indexed += 1
 
 
 class ContextAwareCacheWrapper(CacheManager):
@@ -246,36 +447,72 @@ class ContextAwareCacheWrapper(CacheManager):
 
         # Ensure the found asset satisfies the requirements of the current parsing context
         if not asset.is_context_satisfied(current_ctx):
+            try:
+                if asset.upgrade(current_ctx):
+                    logger.debug("Upgraded cached asset for more data: %s", name)
+                    return asset
+            except AssetLoadException:
+                pass
+
             logger.debug("Re-parsing asset for more data: %s", name)
             return None
 
         return asset
 
+    def contains(self, name: str) -> bool:
+        return self.manager.contains(name)
+
+    def update_size(self, name: str, asset: UAsset):
+        return self.manager.update_size(name, asset)
+
     def add(self, name: str, asset: UAsset):
         return self.manager.add(name, asset)
 
     def remove(self, name: str):
         return self.manager.remove(name)
 
-    def wipe(self, prefix: str = ''):
-        self.manager.wipe(prefix)
+    def wipe(self, prefix: str = '') -> int:
+        return self.manager.wipe(prefix)
 
     def get_count(self):
         return self.manager.get_count()
 
+    def get_stats(self) -> Dict[str, int]:
+        return self.manager.get_stats()
+
 
 class AssetLoader:
-    def __init__(self, modresolver: ModResolver, assetpath='.', cache_manager: CacheManager = None):
+    def __init__(self,
+                 modresolver: ModResolver,
+                 assetpath='.',
+                 cache_manager: CacheManager = None,
+                 use_mmap=False,
+                 disk_cache: Optional[DiskAssetCache] = None,
+                 stats: Optional[LoadStats] = None,
+                 prefetch_workers: int = 0):
         self.cache: CacheManager = cache_manager or ContextAwareCacheWrapper(UsageBasedCacheManager())
+        self.disk_cache = disk_cache
+        self.use_mmap = use_mmap
         self.asset_path = Path(assetpath)
         self.absolute_asset_path = self.asset_path.absolute().resolve()  # need both absolute and resolve here
         self.modresolver = modresolver
-        self.modresolver.initialise()
+        self.asset_index = AssetIndex(self.asset_path)
 
-        self.max_memory = 0
-        self.max_cache = 0
+        # Name conversions are memoised per loader as they are used heavily
+        self.clean_asset_name = lru_cache(maxsize=NAME_CACHE_SIZE)(self._clean_asset_name)  # type: ignore
+        self.convert_asset_name_to_path = lru_cache(maxsize=NAME_CACHE_SIZE)(self._convert_asset_name_to_path)  # type: ignore
+        self.initialise_mod_resolver()
+
+        self.stats = stats or LoadStats()
+        self.prefetcher = AssetPrefetcher(self, prefetch_workers) if prefetch_workers > 0 else None
+
+    def initialise_mod_resolver(self) -> None:
+        '''(Re-)initialise the mod resolver, forgetting any names converted using its previous state.'''
+        self.modresolver.initialise()
+        self.clean_asset_name.cache_clear()  # type: ignore
+        self.convert_asset_name_to_path.cache_clear()  # type: ignore
 
-    def clean_asset_name(self, name: str) -> str:
+    def _clean_asset_name(self, name: str) -> str:
         # Remove class name, if present
         if '.' in name:
             name = name[:name.index('.')]
@@ -301,13 +538,36 @@ class AssetLoader:
         # print(result)
         return result
 
-    def wipe_cache(self) -> None:
-        self.cache.wipe()
+    def wipe_cache(self) -> int:
+        return self.cache.wipe()
+
+    def wipe_cache_with_prefix(self, prefix: str) -> int:
+        return self.cache.wipe(prefix)
+
+    def prefetch(self, names: Iterable[str]) -> None:
+        '''
+        Hint that the given assets (or classes) will be loaded soon, in roughly this order.
+        Their files, and those of their known dependencies, are read in the background if prefetching is enabled.
+        '''
+        if self.prefetcher:
+            self.prefetcher.prefetch(names)
+
+    def cancel_prefetch(self) -> None:
+        '''Abandon any outstanding prefetching, releasing data that has already been read.'''
+        if self.prefetcher:
+            self.prefetcher.cancel()
+
+    def close(self) -> None:
+        '''Stop any background work. Prefetching is disabled from then on, but assets can still be loaded.'''
+        if self.prefetcher:
+            self.prefetcher.shutdown()
+            self.prefetcher = None
 
-    def wipe_cache_with_prefix(self, prefix: str) -> None:
-        self.cache.wipe(prefix)
+    def invalidate_asset_index(self, modid: Optional[str] = None) -> None:
+        '''Re-scan the files of the given mod, or of everything if no mod is given, when they are next needed.'''
+        self.asset_index.invalidate(modid)
 
-    def convert_asset_name_to_path(self, name: str, partial=False, ext='.uasset') -> str:
+    def _convert_asset_name_to_path(self, name: str, partial=False, ext='.uasset') -> str:
         '''Get the filename from which an asset can be loaded.'''
         name = self.clean_asset_name(name)
         parts = name.strip('/').split('/')
@@ -368,28 +628,31 @@ class AssetLoader:
         assert extensions
 
         toppath = self.convert_asset_name_to_path(toppath, partial=True)
-        for path, _, files in os.walk(toppath):
-            for filename in files:
-                fullpath = os.path.join(path, filename)
-                name, ext = os.path.splitext(fullpath)
+        if all(ext in INDEXED_EXTENSIONS for ext in extensions):
+            fullpaths: Iterable[str] = (fullpath for fullpath, _ in self.asset_index.iterate(toppath))
+        else:
+            fullpaths = (os.path.join(path, filename) for path, _, files in os.walk(toppath) for filename in files)
+
+        for fullpath in fullpaths:
+            name, ext = os.path.splitext(fullpath)
 
-                if ext.lower() not in extensions:
-                    continue
+            if ext.lower() not in extensions:
+                continue
 
-                match = re.match(regex, name)
-                if not match:
-                    continue
+            match = re.match(regex, name)
+            if not match:
+                continue
 
-                partialpath = str(Path(fullpath).relative_to(self.asset_path).with_suffix(''))
-                assetname = self.clean_asset_name(partialpath)
+            partialpath = str(Path(fullpath).relative_to(self.asset_path).with_suffix(''))
+            assetname = self.clean_asset_name(partialpath)
 
-                if any(re.match(exclude, assetname) for exclude in excludes):
-                    continue
+            if any(re.match(exclude, assetname) for exclude in excludes):
+                continue
 
-                if return_extension:
-                    yield (assetname, ext)
-                else:
-                    yield assetname
+            if return_extension:
+                yield (assetname, ext)
+            else:
+                yield assetname
 
     def load_related(self, obj: UEBase) -> UAsset:
         if isinstance(obj, Property):
@@ -408,9 +671,9 @@ class AssetLoader:
         (assetname, cls_name) = fullname.split('.')
         assetname = self.clean_asset_name(assetname)
         asset = self.load_asset(assetname, quiet=quiet)
-        for export in asset.exports:
-            if str(export.name) == cls_name:
-                return export
+        export = asset.exports_by_name.get(cls_name, None)
+        if export is not None:
+            return export
 
         if fallback is not NO_FALLBACK:
             return fallback
@@ -422,7 +685,7 @@ class AssetLoader:
         if not os.path.isabs(filename):
             filename = os.path.join(self.asset_path, filename)
         try:
-            mem = load_file_into_memory(filename)
+            mem = load_file_into_memory(filename, use_mmap=self.use_mmap)
         except FileNotFoundError:
             raise AssetNotFound(filename)
         return mem
@@ -433,29 +696,44 @@ class AssetLoader:
         Returns (memoryview, ext).
         '''
         name = self.clean_asset_name(name)
-        mem = None
+        prefetched = self.prefetcher and self.prefetcher.take(name)
+        if prefetched:
+            return prefetched
+
+        path = self.convert_asset_name_to_path(name, partial=True)
         for ext in ('.uasset', '.umap'):
-            filename = self.convert_asset_name_to_path(name, ext=ext)
-            if Path(filename).is_file():
-                mem = load_file_into_memory(filename)
+            filename = path + ext
+            if self.asset_index.get(filename):
+                try:
+                    mem = load_file_into_memory(filename, use_mmap=self.use_mmap)
+                except FileNotFoundError:
+                    raise AssetNotFound(name)
                 return (mem, ext)
 
         raise AssetNotFound(name)
 
+    def reload_asset_data(self, assetname: str) -> bytes:
+        '''Read the data of an asset again, in a form that can be kept by the asset for on-demand parsing.'''
+        mem, _ = self.load_raw_asset(assetname)
+        return retain_memory(mem)
+
     def load_asset(self, assetname: str, quiet=False, use_cache=True, cache_result=True) -> UAsset:
         '''Load and parse the given asset, or fetch it from the cache if already loaded.'''
+        start_time = time.perf_counter()
         assetname = self.clean_asset_name(assetname)
-        asset = (use_cache and self.cache.lookup(assetname)) or \
-            self._load_asset(assetname, quiet=quiet, cache_result=cache_result)
 
-        # Keep track of some stats
-        mem_used = psutil.Process().memory_info().rss
-        if mem_used > self.max_memory:
-            self.max_memory = mem_used
-        cache_used = self.cache.get_count()
-        if cache_used > self.max_cache:
-            self.max_cache = cache_used
+        source = 'cache'
+        asset = use_cache and self.cache.lookup(assetname)
+        if not asset:
+            source = 'disk'
+            asset = use_cache and self._load_asset_from_disk_cache(assetname, cache_result=cache_result)
+        if not asset:
+            source = 'parse'
+            asset = self._load_asset(assetname, quiet=quiet, cache_result=cache_result)
+        elif self.prefetcher:
+            self.prefetcher.discard(assetname)
 
+        self.stats.record_load(self, source, time.perf_counter() - start_time)
         return asset
 
     def __getitem__(self, assetname: str) -> UAsset:
@@ -467,6 +745,20 @@ class AssetLoader:
         assetname = self.clean_asset_name(assetname)
         self.cache.remove(assetname)
 
+    def _load_asset_from_disk_cache(self, assetname: str, cache_result=True) -> Optional[UAsset]:
+        if not self.disk_cache:
+            return None
+
+        asset = self.disk_cache.load(assetname, self.convert_asset_name_to_path(assetname))
+        if not asset:
+            return None
+
+        asset.loader = self
+        if cache_result:
+            self.cache.add(assetname, asset)
+
+        return asset
+
     def partially_load_asset(self, assetname: str, cache_result=True) -> UAsset:
         asset = self._load_asset(assetname, doNotLink=True, cache_result=cache_result)
         return asset
@@ -475,6 +767,7 @@ class AssetLoader:
         if not quiet:
             logger.debug("Loading asset: %s", assetname)
         mem, ext = self.load_raw_asset(assetname)
+        retained = False
         try:
             stream = MemoryStream(mem, 0, len(mem))
             asset = UAsset(stream)
@@ -485,18 +778,31 @@ class AssetLoader:
 
             try:
                 asset.deserialise()
-                if doNotLink:
-                    return asset
-                asset.link()
+                if not doNotLink:
+                    asset.link()
             except Exception as ex:
                 raise AssetParseError(assetname) from ex
+
+            # Properties are parsed on demand, so the asset must keep hold of its data
+            if doNotLink or asset.has_properties:
+                asset.stream.mem = retain_memory(mem)
+                retained = True
+            else:
+                asset.stream.mem = b''
         finally:
-            mem.release()
+            if not retained:
+                release_memory(mem)
+
+        if doNotLink:
+            return asset
+
+        if self.prefetcher and self.prefetcher.graph.get(assetname) is None:
+            self.prefetcher.record_dependencies(assetname, _get_package_imports(asset))
 
         leafname = assetname.split('/')[-1]
 
         # Look for a BP-style Default__<assetname> export
-        exports = [export for export in asset.exports.values if str(export.name).startswith('Default__')]
+        exports = asset.default_exports
         if len(exports) > 1:
             logger.warning(f'Found more than one Default__ entry in {assetname}!')
         asset.default_export = exports[0] if exports else None
@@ -511,14 +817,62 @@ class AssetLoader:
             else:
                 asset.default_export = exports[0] if exports else None
 
+        if self.disk_cache:
+            self.disk_cache.save(assetname, self.convert_asset_name_to_path(assetname, ext=ext), asset)
+
         if cache_result:
             self.cache.add(assetname, asset)
 
         return asset
 
 
-def load_file_into_memory(filename):
+def _get_package_imports(asset: UAsset) -> Iterator[str]:
+    for item in asset.imports.values:
+        if item.namespace.index == 0 and str(item.klass) == 'Package':
+            yield str(item.name)
+
+
+def load_file_into_memory(filename, use_mmap=False) -> memoryview:
+    '''
+    Load a file into memory, returning a view of its contents.
+
+    With `use_mmap` the file is memory-mapped instead of being read, so its contents are never copied onto the heap.
+    The result should be passed to `release_memory` once parsing is complete.
+    '''
     with open(filename, 'rb') as f:
+        if use_mmap:
+            try:
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            except ValueError:
+                pass  # empty files cannot be mapped, so just read them instead
+
         data = f.read()
         mem = memoryview(data)
     return mem
+
+
+def retain_memory(mem: memoryview) -> bytes:
+    '''
+    Take ownership of data from `load_file_into_memory` so it can be kept after parsing.
+    Read files give their underlying bytes without a copy. Memory-mapped files are copied and closed, so kept data
+    never holds a mapping or file handle open. `mem` must not be released by the caller afterwards.
+    '''
+    source = mem.obj
+    if isinstance(source, bytes) and len(source) == len(mem):
+        mem.release()
+        return source
+    data = bytes(mem)
+    release_memory(mem)
+    return data
+
+
+def release_memory(mem: memoryview):
+    '''Release a view returned by `load_file_into_memory`, closing the underlying mapping if there is one.'''
+    source = mem.obj
+    mem.release()
+    if isinstance(source, mmap.mmap):
+        try:
+            source.close()
+        except BufferError:
+            # Something still holds a view into the mapping - it will be closed when that is collected
+            logger.debug('Unable to close memory-mapped asset immediately')
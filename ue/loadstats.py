@@ -0,0 +1,94 @@
+'''
+Lightweight statistics collection for asset loading.
+
+Load times are recorded for every load as they are cheap to measure, while the more expensive memory usage
+and cache size are only sampled occasionally.
+'''
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import psutil  # type: ignore
+
+from utils.ticker import Ticker
+
+if TYPE_CHECKING:
+    from .loader import AssetLoader
+
+__all__ = [
+    'LOAD_SOURCES',
+    'LoadStats',
+]
+
+LOAD_SOURCES = ('cache', 'disk', 'parse')
+
+HISTOGRAM_BUCKETS = 24  # power-of-two buckets of microseconds, up to ~8 seconds
+
+
+class LoadStats:
+    '''
+    Collects statistics about the assets loaded by an `AssetLoader`.
+
+    Memory usage and cache size are sampled every `sample_every` loads, and periodically between
+    `start_sampling` and `stop_sampling` if desired. Load times are kept in histograms for each load source.
+    '''
+    def __init__(self, sample_every=200):
+        self.sample_every = sample_every
+        self.max_memory = 0
+        self.max_cache = 0
+        self.counts: Dict[str, int] = {source: 0 for source in LOAD_SOURCES}
+        self.total_times: Dict[str, float] = {source: 0.0 for source in LOAD_SOURCES}
+        self.histograms: Dict[str, List[int]] = {source: [0] * HISTOGRAM_BUCKETS for source in LOAD_SOURCES}
+
+        self._loads_until_sample = 0
+        self._ticker: Optional[Ticker] = None
+        self._process = psutil.Process()
+
+    def record_load(self, loader: 'AssetLoader', source: str, duration: float):
+        '''Record a single load of an asset, taking `duration` seconds, from the given source.'''
+        self.counts[source] += 1
+        self.total_times[source] += duration
+        bucket = int(duration * 1_000_000).bit_length()
+        self.histograms[source][min(bucket, HISTOGRAM_BUCKETS - 1)] += 1
+
+        self._loads_until_sample -= 1
+        if self._loads_until_sample <= 0:
+            self._loads_until_sample = self.sample_every
+            self.sample(loader)
+
+    def sample(self, loader: 'AssetLoader'):
+        '''Sample memory usage and cache size now.'''
+        mem_used = self._process.memory_info().rss
+        if mem_used > self.max_memory:
+            self.max_memory = mem_used
+        cache_used = loader.cache.get_count()
+        if cache_used > self.max_cache:
+            self.max_cache = cache_used
+
+    def start_sampling(self, loader: 'AssetLoader', interval=2.0):
+        '''Start sampling memory usage and cache size every `interval` seconds from a background thread.'''
+        if self._ticker:
+            return
+        self._ticker = Ticker(lambda: self.sample(loader), interval=interval)
+        self._ticker.start()
+
+    def stop_sampling(self):
+        if self._ticker:
+            self._ticker.end()
+            self._ticker = None
+
+    def describe_times(self) -> str:
+        '''Summarise load times, with a histogram of milliseconds for each source.'''
+        parts = []
+        for source in LOAD_SOURCES:
+            count = self.counts[source]
+            if not count:
+                continue
+
+            histogram = self.histograms[source]
+            buckets = ' '.join(f'<{_bucket_limit_ms(i):g}:{n}' for i, n in enumerate(histogram) if n)
+            parts.append(f'{source} {count} in {self.total_times[source]:.2f}s [{buckets}]')
+
+        return ', '.join(parts) or 'no loads'
+
+
+def _bucket_limit_ms(bucket: int) -> float:
+    return (1 << bucket) / 1000
@@ -0,0 +1,184 @@
+'''
+Background reading of assets that are expected to be loaded soon.
+
+Reading an asset's file is overlapped with the parsing of the asset before it. When a prefetched asset is taken its
+import table is scanned so the assets it depends on can be queued for prefetching too.
+'''
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from .headerscan import scan_asset_imports
+
+if TYPE_CHECKING:
+    from .loader import AssetLoader
+
+__all__ = [
+    'PREFETCH_WINDOW',
+    'AssetDependencyGraph',
+    'AssetPrefetcher',
+]
+
+PREFETCH_WINDOW = 16  # maximum number of assets held in memory ahead of being loaded
+
+
+class AssetDependencyGraph:
+    '''Records the assets imported by each asset that has been read, for use when predicting upcoming loads.'''
+    def __init__(self):
+        self.dependencies: Dict[str, Tuple[str, ...]] = dict()
+
+    def record(self, assetname: str, imports: Iterable[str]):
+        '''Record the packages imported by an asset. Only game assets are kept, as script packages cannot be loaded.'''
+        self.dependencies[assetname] = tuple(name for name in imports if name.startswith('/Game/'))
+
+    def get(self, assetname: str) -> Optional[Tuple[str, ...]]:
+        '''Get the known dependencies of an asset, or None if the asset has not been seen.'''
+        return self.dependencies.get(assetname, None)
+
+    def walk(self, assetnames: Iterable[str]) -> Iterator[str]:
+        '''Iterate the given assets, each immediately followed by its known dependencies, without repeats.'''
+        seen: Set[str] = set()
+        for assetname in assetnames:
+            stack = [assetname]
+            while stack:
+                name = stack.pop()
+                if name in seen:
+                    continue
+                seen.add(name)
+                yield name
+                stack.extend(reversed(self.dependencies.get(name, ())))
+
+
+class AssetPrefetcher:
+    '''
+    Reads upcoming assets into memory using a pool of background threads.
+
+    Names and filenames are resolved, and imports scanned, on the calling thread so the workers do nothing but read
+    files and never touch the loader's index and caches. At most `window` assets are read ahead, and prefetched data
+    that is left unused for a full window of loads is released.
+    '''
+    def __init__(self, loader: 'AssetLoader', workers: int, window: int = PREFETCH_WINDOW):
+        self.loader = loader
+        self.window = window
+        self.graph = AssetDependencyGraph()
+        self.pending: Deque[str] = deque()
+        self.inflight: 'OrderedDict[str, Tuple[int, Future]]' = OrderedDict()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+        self.sequence = 0
+        self.hits = 0
+        self.wasted = 0
+
+    def prefetch(self, assetnames: Iterable[str]):
+        '''Queue assets to be read in the background, along with any of their dependencies that are already known.'''
+        self.pending.extend(self.graph.walk(assetnames))
+        self._top_up()
+
+    def take(self, assetname: str) -> Optional[Tuple[memoryview, str]]:
+        '''Claim the prefetched data of an asset, as (memoryview, ext), or None if it was not prefetched.'''
+        entry = self.inflight.pop(assetname, None)
+        if entry is None:
+            return None
+
+        sequence, future = entry
+        self._release_stale(sequence)
+        try:
+            mem, ext = future.result()
+        except Exception:  # pylint: disable=broad-except
+            # Let the normal load path report the problem
+            self._top_up()
+            return None
+
+        # Dependencies of this asset are likely to be needed as soon as it is parsed
+        imports: Optional[Iterable[str]] = self.graph.get(assetname)
+        if imports is None:
+            try:
+                imports = scan_asset_imports(mem)
+            except Exception:  # pylint: disable=broad-except
+                imports = ()
+        self.record_dependencies(assetname, imports)
+        self.hits += 1
+        return (mem, ext)
+
+    def discard(self, assetname: str):
+        '''Release any prefetched data for an asset that was loaded by other means.'''
+        entry = self.inflight.pop(assetname, None)
+        if entry is not None:
+            self._release(entry[1])
+            self._top_up()
+
+    def record_dependencies(self, assetname: str, imports: Iterable[str]):
+        '''Record the imports of an asset and queue its dependencies ahead of anything else pending.'''
+        self.graph.record(assetname, imports)
+        dependencies = self.graph.get(assetname) or ()
+        self.pending.extendleft(reversed(dependencies))
+        self._top_up()
+
+    def cancel(self):
+        '''Forget all pending work and release any data that has already been read.'''
+        self.pending.clear()
+        for _, future in self.inflight.values():
+            self._release(future)
+        self.inflight.clear()
+
+    def shutdown(self):
+        '''Cancel all work and stop the worker threads.'''
+        self.cancel()
+        self.executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(hits=self.hits, wasted=self.wasted, inflight=len(self.inflight))
+
+    def _top_up(self):
+        while self.pending and len(self.inflight) < self.window:
+            name = self.pending.popleft()
+            try:
+                name = self.loader.clean_asset_name(name)
+            except Exception:  # pylint: disable=broad-except
+                continue
+
+            if name in self.inflight or self.loader.cache.contains(name):
+                continue
+
+            found = self._find_file(name)
+            if not found:
+                continue
+
+            self.sequence += 1
+            future = self.executor.submit(_read_asset, found[0], found[1], self.loader.use_mmap)
+            self.inflight[name] = (self.sequence, future)
+
+    def _find_file(self, name: str) -> Optional[Tuple[str, str]]:
+        path = self.loader.convert_asset_name_to_path(name, partial=True)
+        for ext in ('.uasset', '.umap'):
+            filename = path + ext
+            if self.loader.asset_index.get(filename):
+                return (filename, ext)
+        return None
+
+    def _release_stale(self, sequence: int):
+        # Anything requested a whole window before the asset being taken is unlikely to be used
+        stale = [name for name, (seq, _) in self.inflight.items() if seq < sequence - self.window]
+        for name in stale:
+            _, future = self.inflight.pop(name)
+            self._release(future)
+            self.wasted += 1
+
+    def _release(self, future: Future):
+        if future.cancel():
+            return
+        future.add_done_callback(_release_result)
+
+
+def _read_asset(filename: str, ext: str, use_mmap: bool) -> Tuple[memoryview, str]:
+    # Lazy import to avoid a cyclic dependency
+    from .loader import load_file_into_memory  # pylint: disable=import-outside-toplevel
+
+    return (load_file_into_memory(filename, use_mmap=use_mmap), ext)
+
+
+def _release_result(future: Future):
+    # Lazy import to avoid a cyclic dependency
+    from .loader import release_memory  # pylint: disable=import-outside-toplevel
+
+    if not future.cancelled() and future.exception() is None:
+        release_memory(future.result()[0])
@@ -1,3 +1,4 @@
+import array
 import math
 import operator
 import struct
@@ -7,15 +8,15 @@ import warnings
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from numbers import Real
-from typing import Any, ByteString, Dict, List, Optional, Set, Tuple, Type, Union
+from typing import Any, ByteString, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple, Type, Union
 
 from utils.log import get_logger
 
-from .base import UEBase
-from .context import INCLUDE_METADATA
-from .coretypes import NameIndex, ObjectIndex
+from .base import CompactUEBase, UEBase
+from .context import INCLUDE_METADATA, get_ctx
+from .coretypes import UINT32_PAIR, UINT32_QUAD, NameIndex, ObjectIndex
 from .number import make_binary_operator, make_binary_operators, make_operator
-from .stream import MemoryStream
+from .stream import DOUBLE, FLOAT, MemoryStream
 from .utils import clean_double, clean_float
 
 if INCLUDE_METADATA:
@@ -37,14 +38,30 @@ PropDict = Dict[str, Dict[int, UEBase]]
 
 NO_FALLBACK = object()
 
+GUID_WORDS = struct.Struct('<4I')
+GUID_WORDS_BE = struct.Struct('>4I')
+INT32_PAIR = struct.Struct('<ii')
+ENGINE_VERSION = struct.Struct('<HHHI')
+
+# Bytes stored outside of the size recorded in a property's header, by property type
+PROPERTY_EXTRA_BYTES = {
+    'BoolProperty': 1,  # the value itself
+    'ByteProperty': 8,  # enum name
+    'StructProperty': 8,  # struct type name
+    'ArrayProperty': 8,  # element type name
+}
+
 
 class PropertyTable(UEBase):
     string_format = '{count} entries'
     display_fields = ['values']
     skip_level_field = 'values'
+    transient_fields = ('_as_dict', )
     _as_dict: Optional[PropDict] = None
+    property_filter: Optional[FrozenSet[str]] = None
 
     values: List["Property"]
+    skipped: List[Tuple[str, int]]
 
     def as_dict(self) -> PropDict:
         return self._as_dict or self._convert_to_dict()
@@ -73,14 +90,26 @@ class PropertyTable(UEBase):
         self._as_dict = result
         return result
 
+    def covers(self, property_filter: FrozenSet[str]) -> bool:
+        '''Check if this table was parsed with all of the properties required by the given filter.'''
+        if self.property_filter is None:
+            return True
+        return bool(property_filter) and property_filter <= self.property_filter
+
     def _deserialise(self):
         values = []
         self._newField('values', values)
+        skipped: List[Tuple[str, int]] = []
+        self._newField('skipped', skipped)
+        self.property_filter = get_ctx().property_filter or None
 
         while self.stream.offset < (self.stream.end - 8):
             value = self._parseField()
             if value is None:
                 break
+            if isinstance(value, tuple):
+                skipped.append(value)
+                continue
             values.append(value)
 
         self._newField('count', len(values))
@@ -97,10 +126,15 @@ class PropertyTable(UEBase):
         saved_offset = self.stream.offset
 
         # Check for a None name here - that's the terminator
-        name = NameIndex(self).deserialise()
-        if name.index == self.asset.none_index:
+        name_index, name_instance = self.stream.readStruct(UINT32_PAIR)
+        if name_index == self.asset.none_index:
             return None
 
+        if self.property_filter is not None:
+            name = get_clean_property_name(self.asset, name_index, name_instance)
+            if name not in self.property_filter:
+                return self._skipField(name)
+
         # Reset back to the saved offset and read the whole property
         self.stream.offset = saved_offset
         value = Property(self).deserialise()
@@ -108,6 +142,13 @@ class PropertyTable(UEBase):
 
         return value
 
+    def _skipField(self, name: str) -> Tuple[str, int]:
+        '''Skip the rest of a property using the size in its header, returning its name and index.'''
+        type_index, _, size, index = self.stream.readStruct(UINT32_QUAD)
+        type_name = str(self.asset.getName(type_index))
+        self.stream.offset += size + PROPERTY_EXTRA_BYTES.get(type_name, 0)
+        return (name, index)
+
     def __getitem__(self, index: int):
         '''Provide access using the index via the table[index] syntax.'''
         if self.values is None:
@@ -145,7 +186,8 @@ class PropertyTable(UEBase):
                     p.pretty(value)
 
 
-class PropertyHeader(UEBase):
+class PropertyHeader(CompactUEBase):
+    __slots__ = ('name_id', 'type', 'size', 'index', 'name')
     display_fields = ['name', 'index']
 
     name: str
@@ -157,14 +199,13 @@ class PropertyHeader(UEBase):
     def _deserialise(self):
         self._newField('name_id', NameIndex(self))
         self._newField('type', NameIndex(self))
-        self._newField('size', self.stream.readUInt32())
-        self._newField('index', self.stream.readUInt32())
+        size, index = self.stream.readStruct(UINT32_PAIR)
+        self._newField('size', size)
+        self._newField('index', index)
 
     def _link(self):
         super()._link()
-        clean_name = str(self.name_id).strip()
-        clean_name = clean_name.replace(' ', '_')
-        self._newField('name', clean_name)
+        self._newField('name', get_clean_property_name(self.asset, self.name_id.index, self.name_id.instance))
 
 
 class Property(UEBase):
@@ -234,7 +275,8 @@ class DummyAsset(UEBase):
         raise ValueError("Attempt to lookup a name in a dummy asset")
 
 
-class ValueProperty(UEBase, Real, ABC):
+class ValueProperty(CompactUEBase, Real, ABC):
+    __slots__ = ('value', )
     value: Real
 
     @abstractmethod
@@ -313,6 +355,7 @@ class ValueProperty(UEBase, Real, ABC):
 
 
 class FloatProperty(ValueProperty):
+    __slots__ = ('raw_data', 'rounded', 'rounded_value', 'textual')
     main_field = 'textual'
     display_fields = ['textual']
 
@@ -367,14 +410,13 @@ class FloatProperty(ValueProperty):
         obj.deserialise()
         return obj
 
-    def _deserialise(self, size=None):
-        # Read once as a float
-        saved_offset = self.stream.offset
-        self._newField('value', self.stream.readFloat())
+    def _deserialise(self, size=None, raw_data: bytes = None):
+        # Read as plain bytes for exact exporting, unless the caller has already read them in bulk
+        if raw_data is None:
+            raw_data = self.stream.readBytes(4)
 
-        # Read again as plain bytes for exact exporting
-        self.stream.offset = saved_offset
-        self._newField('raw_data', self.stream.readBytes(4))
+        self._newField('value', FLOAT.unpack(raw_data)[0])
+        self._newField('raw_data', raw_data)
 
         # Make a rounded textual version with (inexact) if required
         value = self.value
@@ -400,6 +442,7 @@ class FloatProperty(ValueProperty):
 
 
 class DoubleProperty(ValueProperty):
+    __slots__ = ('bytes', 'rounded', 'rounded_value', 'textual')
     main_field = 'textual'
     display_fields = ['textual']
 
@@ -410,13 +453,10 @@ class DoubleProperty(ValueProperty):
     rounded_value: float
 
     def _deserialise(self, size=None):
-        # Read once as a float
-        saved_offset = self.stream.offset
-        self._newField('value', self.stream.readDouble())
-
-        # Read again as plain bytes for exact exporting
-        self.stream.offset = saved_offset
-        self._newField('bytes', self.stream.readBytes(8))
+        # Read as plain bytes for exact exporting
+        raw_data = self.stream.readBytes(8)
+        self._newField('value', DOUBLE.unpack(raw_data)[0])
+        self._newField('bytes', raw_data)
 
         # Make a rounded textual version with (inexact) if required
         value = self.value
@@ -434,6 +474,7 @@ class DoubleProperty(ValueProperty):
 
 
 class IntProperty(ValueProperty):
+    __slots__ = ()
     string_format = '(int) {value}'
     main_field = 'value'
 
@@ -461,6 +502,7 @@ class IntProperty(ValueProperty):
 
 
 class UInt32Property(IntProperty):
+    __slots__ = ()
     string_format = '(uint) {value}'
 
     def _deserialise(self, size=None):
@@ -468,6 +510,7 @@ class UInt32Property(IntProperty):
 
 
 class BoolProperty(ValueProperty):
+    __slots__ = ()
     main_field = 'value'
 
     value: bool  # type: ignore
@@ -494,6 +537,7 @@ class BoolProperty(ValueProperty):
 
 
 class ByteProperty(ValueProperty):  # With optional enum type
+    __slots__ = ('enum', )
     enum: NameIndex
     value: Union[NameIndex, int]  # type: ignore  # (we *want* to override the base type)
 
@@ -634,13 +678,16 @@ class StringProperty(StringLikeProperty):
         obj.deserialise()
         return obj
 
-    def _deserialise(self, *args):
+    def _deserialise(self, *args, intern_value=False):
         self._newField('size', self.stream.readInt32())
         if self.size >= 0:
-            self._newField('value', self.stream.readTerminatedString(self.size))
+            value = self.stream.readTerminatedString(self.size)
         else:
             self.size = -self.size
-            self._newField('value', self.stream.readTerminatedWideString(self.size))
+            value = self.stream.readTerminatedWideString(self.size)
+
+        # Names repeat across many assets, so share a single copy of each
+        self._newField('value', sys.intern(value) if intern_value else value)
 
         if INCLUDE_METADATA:
             # References to this item
@@ -705,7 +752,7 @@ class Guid(UEBase):
         # Here we need to reverse the endian of each 4-byte word
         # to match C# UUID decoder. Python's bytes_le only corrects
         # some of the fields as the rest are single bytes.
-        value = uuid.UUID(bytes=struct.pack('>4I', *struct.unpack('<4I', raw_bytes)))
+        value = uuid.UUID(bytes=GUID_WORDS_BE.pack(*GUID_WORDS.unpack(raw_bytes)))
         self._newField('value', value)
 
     def format_for_json(self):
@@ -739,9 +786,7 @@ class StructEntry(UEBase):
         self._newField('length', self.stream.readInt64())
 
         self.name_id.link()
-        clean_name = str(self.name_id).strip()
-        clean_name = clean_name.replace(' ', '_')
-        self._newField('name', clean_name)
+        self._newField('name', get_clean_property_name(self.asset, self.name_id.index, self.name_id.instance))
 
         name, propertyType, skipLength = decode_type_or_name(entryType, skip_deserialise=True)
         self.field_values['type'] = entryType
@@ -821,36 +866,40 @@ def decode_type_or_name(type_or_name: NameIndex, skip_deserialise=False):
     if dbg_structs > 1:
         print(f'  Entry "{type_or_name}"')
 
-    name = str(type_or_name)
-
-    # Is it a supported type?
-    propertyType = getPropertyType(name, throw=False)
-    if propertyType:
-        if dbg_structs > 2:
-            print('  ...is a supported type')
-        return name, propertyType, None
-
-    # Is it skippable?
-    known_length = SKIPPABLE_STRUCTS.get(name, None)
-    if known_length is not None:
-        if dbg_structs > 2:
-            print('  ...is skippable')
-        return name, None, known_length
-
-    # Is it known as a fixed length struct but without a length?
-    if name in STRUCT_TYPES_TO_ABORT_ON:
-        if dbg_structs > 2:
-            print('  ...is an unsupported unskippable struct type')
-        return name, None, float('NaN')
-
-    # Then treat it as just a name
+    # Names are resolved once per asset
+    key = (type_or_name.index, type_or_name.instance)
+    cache = type_or_name.asset.struct_type_cache
+    result = cache.get(key, None)
+    if result is None:
+        name = str(type_or_name)
+        propertyType, skipLength = STRUCT_DISPATCH.get(name, (None, None))
+        result = (name, propertyType, skipLength)
+        cache[key] = result
+
     if dbg_structs > 2:
-        print('  ...is not a name we recognise')
-    return name, None, None
+        print(f'  ...resolved to type={result[1]}, skip={result[2]}')
+
+    return result
+
+
+def get_clean_property_name(asset, index: int, instance: int) -> str:
+    '''Get the cleaned form of a property or struct entry name, caching the result for the asset.'''
+    key = (index, instance)
+    cache = asset.clean_name_cache
+    name = cache.get(key, None)
+    if name is None:
+        name = str(asset.getName(index))
+        if instance:
+            name = f'{name}_{instance - 1}'
+        name = sys.intern(name.strip().replace(' ', '_'))
+        cache[key] = name
+
+    return name
 
 
 class StructProperty(UEBase):
     skip_level_field = 'values'
+    transient_fields = ('_as_dict', )
 
     count: int
     values: List[UEBase]
@@ -978,10 +1027,65 @@ class StructProperty(UEBase):
                     p.pretty(value)
 
 
+class TypedArrayValues(Sequence[UEBase]):
+    '''
+    Compact storage for the contents of an array of fixed-width numeric elements, decoded in a single operation.
+    The elements are only wrapped in their property type when accessed.
+    '''
+    def __init__(self, owner: UEBase, element_type: Type[UEBase], raw: bytes):
+        typecode, fields = TYPED_ARRAY_FORMATS[element_type]
+        self.owner = owner
+        self.element_type = element_type
+        self.fields = fields
+        self.width = len(fields) if fields else 1
+        self.data = array.array(typecode, raw)
+        if sys.byteorder != 'little':
+            self.data.byteswap()
+        self._elements: List[Optional[UEBase]] = [None] * (len(self.data) // self.width)
+
+    def __len__(self):
+        return len(self._elements)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        element = self._elements[index]
+        if element is None:
+            element = self._wrap(index % len(self))
+            self._elements[index] = element
+        return element
+
+    def format_for_json(self):
+        data = self.data
+        if data.typecode != 'f':
+            return list(data)
+
+        if not self.fields:
+            return [clean_float(value) for value in data]
+
+        result = []
+        for i in range(0, len(data), self.width):
+            result.append({name: clean_float(data[i + offset]) for offset, name in enumerate(self.fields)})
+        return result
+
+    def _wrap(self, index: int) -> UEBase:
+        chunk = self.data[index * self.width:(index+1) * self.width]
+        if sys.byteorder != 'little':
+            chunk.byteswap()
+        raw = chunk.tobytes()
+
+        element = self.element_type(self.owner, MemoryStream(raw))
+        element.is_inside_array = True
+        element.deserialise(len(raw))
+        element.link()
+        return element
+
+
 class ArrayProperty(UEBase):
     field_type: NameIndex
     count: int
-    values: List[UEBase]
+    values: Sequence[UEBase]
 
     def _deserialise(self, size, with_type: Type = None):  # type: ignore
         assert size >= 4, "Array size is required"
@@ -1008,6 +1112,12 @@ class ArrayProperty(UEBase):
             self._newField('value', f'<unsupported field type {self.field_type}>')
             return
 
+        # Decode fixed-width numeric contents in bulk
+        typed_format = TYPED_ARRAY_FORMATS.get(propertyType, None)
+        if typed_format and size - 4 == self.count * 4 * len(typed_format[1] or (None, )):
+            self._newField('values', TypedArrayValues(self, propertyType, self.stream.readBytes(size - 4)))
+            return
+
         values: List[Union[UEBase, str]] = []
         self._newField('values', values)
 
@@ -1066,9 +1176,10 @@ class Vector(UEBase):
     z: FloatProperty
 
     def _deserialise(self, size=None):
-        self._newField('x', FloatProperty(self))
-        self._newField('y', FloatProperty(self))
-        self._newField('z', FloatProperty(self))
+        raw = self.stream.readBytes(12)
+        self._newField('x', FloatProperty(self), None, raw[0:4])
+        self._newField('y', FloatProperty(self), None, raw[4:8])
+        self._newField('z', FloatProperty(self), None, raw[8:12])
 
     def format_for_json(self):
         return {'x': self.x.format_for_json(), 'y': self.y.format_for_json(), 'z': self.z.format_for_json()}
@@ -1090,8 +1201,9 @@ class Vector2D(UEBase):
     y: FloatProperty
 
     def _deserialise(self, size=None):
-        self._newField('x', FloatProperty(self))
-        self._newField('y', FloatProperty(self))
+        raw = self.stream.readBytes(8)
+        self._newField('x', FloatProperty(self), None, raw[0:4])
+        self._newField('y', FloatProperty(self), None, raw[4:8])
 
 
 class Rotator(UEBase):
@@ -1100,9 +1212,10 @@ class Rotator(UEBase):
     c: FloatProperty
 
     def _deserialise(self, size=None):
-        self._newField('a', FloatProperty(self))
-        self._newField('b', FloatProperty(self))
-        self._newField('c', FloatProperty(self))
+        raw = self.stream.readBytes(12)
+        self._newField('a', FloatProperty(self), None, raw[0:4])
+        self._newField('b', FloatProperty(self), None, raw[4:8])
+        self._newField('c', FloatProperty(self), None, raw[8:12])
 
 
 class Quat(UEBase):
@@ -1112,10 +1225,11 @@ class Quat(UEBase):
     z: FloatProperty
 
     def _deserialise(self, size=None):
-        self._newField('w', FloatProperty(self))
-        self._newField('x', FloatProperty(self))
-        self._newField('y', FloatProperty(self))
-        self._newField('z', FloatProperty(self))
+        raw = self.stream.readBytes(16)
+        self._newField('w', FloatProperty(self), None, raw[0:4])
+        self._newField('x', FloatProperty(self), None, raw[4:8])
+        self._newField('y', FloatProperty(self), None, raw[8:12])
+        self._newField('z', FloatProperty(self), None, raw[12:16])
 
 
 class Transform(UEBase):
@@ -1145,10 +1259,11 @@ class LinearColor(UEBase):
     a: FloatProperty
 
     def _deserialise(self, size=None):
-        self._newField('r', FloatProperty(self))
-        self._newField('g', FloatProperty(self))
-        self._newField('b', FloatProperty(self))
-        self._newField('a', FloatProperty(self))
+        raw = self.stream.readBytes(16)
+        self._newField('r', FloatProperty(self), None, raw[0:4])
+        self._newField('g', FloatProperty(self), None, raw[4:8])
+        self._newField('b', FloatProperty(self), None, raw[8:12])
+        self._newField('a', FloatProperty(self), None, raw[12:16])
 
     def as_tuple(self):
         return tuple(v for v in self.field_values.values())
@@ -1162,8 +1277,9 @@ class IntPoint(UEBase):
     y: int
 
     def _deserialise(self, size=None):
-        self._newField('x', self.stream.readInt32())
-        self._newField('y', self.stream.readInt32())
+        x, y = self.stream.readStruct(INT32_PAIR)
+        self._newField('x', x)
+        self._newField('y', y)
 
 
 class EngineVersion(UEBase):
@@ -1174,10 +1290,11 @@ class EngineVersion(UEBase):
     branch: str
 
     def _deserialise(self):
-        self._newField('major', self.stream.readUInt16())
-        self._newField('minor', self.stream.readUInt16())
-        self._newField('patch', self.stream.readUInt16())
-        self._newField('changelist', self.stream.readUInt32())
+        major, minor, patch, changelist = self.stream.readStruct(ENGINE_VERSION)
+        self._newField('major', major)
+        self._newField('minor', minor)
+        self._newField('patch', patch)
+        self._newField('changelist', changelist)
         self._newField('branch', StringProperty(self))
 
 
@@ -1209,6 +1326,23 @@ TYPE_MAP = {
     # 'Transform': Transform, # no worky
 }
 
+# Element types that arrays can decode in bulk: type -> (array typecode, struct field names or None)
+TYPED_ARRAY_FORMATS: Dict[Type[UEBase], Tuple[str, Optional[Tuple[str, ...]]]] = {
+    FloatProperty: ('f', None),
+    IntProperty: ('i', None),
+    UInt32Property: ('I', None),
+    Vector: ('f', ('x', 'y', 'z')),
+    Vector2D: ('f', ('x', 'y')),
+    Rotator: ('f', ('a', 'b', 'c')),
+    Quat: ('f', ('w', 'x', 'y', 'z')),
+}
+
+# Struct entry type/name -> (property type, skip length), merged from the tables above in priority order
+STRUCT_DISPATCH: Dict[str, Tuple[Optional[Type[UEBase]], Optional[float]]] = dict()
+STRUCT_DISPATCH.update((name, (None, float('NaN'))) for name in STRUCT_TYPES_TO_ABORT_ON)
+STRUCT_DISPATCH.update((name, (None, length)) for name, length in SKIPPABLE_STRUCTS.items())
+STRUCT_DISPATCH.update((name, (propertyType, None)) for name, propertyType in TYPE_MAP.items())
+
 
 def getPropertyType(typeName: str, throw=True):
     result = TYPE_MAP.get(typeName, None)
@@ -1220,6 +1354,7 @@ def getPropertyType(typeName: str, throw=True):
 # Types to export from this module
 __all_extras__ = (
     'getPropertyType',
+    'TypedArrayValues',
     'PropertyTable',
     'CustomVersion',
     'EngineVersion',
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Type, TypeVar, Union
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Set, Tuple, Type, TypeVar, Union
 
 from utils.generics import get_generic_args
 
 from .base import UEBase
+from .context import ue_parsing_context
 from .hierarchy import find_parent_classes
 from .loader import AssetLoader
 from .properties import BoolProperty, ByteProperty, DummyAsset, FloatProperty, IntProperty, ObjectProperty, StringProperty
@@ -20,6 +21,7 @@ __all__ = [
     'uestrings',
     'get_proxy_for_type',
     'get_proxy_for_exact_type',
+    'get_proxy_field_names',
     'ProxyComponent',
     'LazyReference',
 ]
@@ -212,8 +214,10 @@ class ProxyComponentWrapper(Mapping[int, Tproxy]):
         if not isinstance(value, ObjectProperty):
             raise TypeError("Expected ObjectProperty")
 
+        # Property filters are meant for the export being gathered, so components are always parsed in full
         export = value.value.value
-        props = export.properties.as_dict()
+        with ue_parsing_context(property_filter=()):
+            props = export.properties.as_dict()
         self._proxy.update(props)
 
 
@@ -331,6 +335,21 @@ class LazyReference(Mapping[int, Tproxy]):
         return 1
 
 
+def get_proxy_field_names(proxy_type: Type[UEProxyStructure]) -> FrozenSet[str]:
+    '''
+    Collect the names of all properties a proxy type can be filled with, including those of its proxy components.
+    Suitable for use as a `property_filter` parsing context option.
+    '''
+    names: Set[str] = set()
+    for name, default in proxy_type.get_defaults().items():
+        names.add(name)
+        if isinstance(default, ProxyComponent):
+            default._init_proxy_field()  # pylint: disable=protected-access
+            names.update(get_proxy_field_names(default._cmp_type))  # pylint: disable=protected-access
+
+    return frozenset(names)
+
+
 def uemap(uetype: Type[Tele], args: Iterable[Union[Tval, Tele]], **kwargs) -> Mapping[int, Tele]:
     output: Dict[int, Tele] = dict()
 
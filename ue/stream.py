@@ -1,6 +1,38 @@
 import struct
-
-__all__ = ('MemoryStream', )
+from functools import lru_cache
+from typing import Tuple
+
+__all__ = (
+    'MemoryStream',
+    'INT8',
+    'UINT8',
+    'INT16',
+    'UINT16',
+    'INT32',
+    'UINT32',
+    'INT64',
+    'UINT64',
+    'FLOAT',
+    'DOUBLE',
+)
+
+# Precompiled little-endian readers for each primitive type
+INT8 = struct.Struct('<b')
+UINT8 = struct.Struct('<B')
+INT16 = struct.Struct('<h')
+UINT16 = struct.Struct('<H')
+INT32 = struct.Struct('<i')
+UINT32 = struct.Struct('<I')
+INT64 = struct.Struct('<q')
+UINT64 = struct.Struct('<Q')
+FLOAT = struct.Struct('<f')
+DOUBLE = struct.Struct('<d')
+
+
+@lru_cache(maxsize=256)
+def _get_struct(fmt: str) -> struct.Struct:
+    '''Fetch a compiled little-endian struct for the given format, compiling it only once.'''
+    return struct.Struct('<' + fmt)
 
 
 class MemoryStream:
@@ -27,40 +59,59 @@ class MemoryStream:
         return self.size
 
     def readInt8(self) -> int:
-        return self._read('b')
+        return self._readCompiled(INT8)
 
     def readUInt8(self) -> int:
-        return self._read('B')
+        return self._readCompiled(UINT8)
 
     def readBool8(self) -> bool:
-        return bool(self._read('B'))
+        return bool(self._readCompiled(UINT8))
 
     def readBool32(self) -> bool:
-        return bool(self._read('I'))
+        return bool(self._readCompiled(UINT32))
 
     def readUInt16(self) -> int:
-        return self._read('H')
+        return self._readCompiled(UINT16)
 
     def readInt16(self) -> int:
-        return self._read('h')
+        return self._readCompiled(INT16)
 
     def readUInt32(self) -> int:
-        return self._read('I')
+        return self._readCompiled(UINT32)
 
     def readInt32(self) -> int:
-        return self._read('i')
+        return self._readCompiled(INT32)
 
     def readUInt64(self) -> int:
-        return self._read('Q')
+        return self._readCompiled(UINT64)
 
     def readInt64(self) -> int:
-        return self._read('q')
+        return self._readCompiled(INT64)
 
     def readFloat(self) -> float:
-        return self._read('f')
+        return self._readCompiled(FLOAT)
 
     def readDouble(self) -> float:
-        return self._read('d')
+        return self._readCompiled(DOUBLE)
+
+    def readStruct(self, compiled: struct.Struct) -> Tuple:
+        '''Read a run of values described by a precompiled (little-endian) struct in a single operation.'''
+        offset = self.offset
+        if offset + compiled.size > self.end:
+            raise EOFError("End of stream at offset " + str(offset))
+
+        values = compiled.unpack_from(self.mem, offset)
+        self.offset = offset + compiled.size
+        return values
+
+    def readInt32Array(self, count: int) -> Tuple[int, ...]:
+        return self._readArray('i', count)
+
+    def readUInt32Array(self, count: int) -> Tuple[int, ...]:
+        return self._readArray('I', count)
+
+    def readFloatArray(self, count: int) -> Tuple[float, ...]:
+        return self._readArray('f', count)
 
     def readBytes(self, count: int) -> bytes:
         if self.offset + count > self.end:
@@ -79,16 +130,23 @@ class MemoryStream:
         value = bytes(raw_bytes[:-2]).decode('utf-16-le')
         return value
 
-    def _read(self, fmt, count: int = None):
-        size = struct.calcsize(fmt)
-        if self.offset + size > self.end:
-            raise EOFError("End of stream at offset " + str(self.offset))
+    def _readCompiled(self, compiled: struct.Struct):
+        offset = self.offset
+        if offset + compiled.size > self.end:
+            raise EOFError("End of stream at offset " + str(offset))
+
+        value, = compiled.unpack_from(self.mem, offset)
+        self.offset = offset + compiled.size
+        return value
+
+    def _readArray(self, fmt: str, count: int) -> Tuple:
+        if count <= 0:
+            return ()
 
+        return self.readStruct(_get_struct(str(count) + fmt))
+
+    def _read(self, fmt, count: int = None):
         if count is None or count == 1:
-            value, = struct.unpack_from('<' + fmt, self.mem, self.offset)
-            self.offset += size
-            return value
+            return self._readCompiled(_get_struct(fmt))
 
-        values = struct.unpack_from('<' + str(count) + fmt, self.mem, self.offset)
-        self.offset += size
-        return values
+        return self.readStruct(_get_struct(str(count) + fmt))
@@ -0,0 +1,185 @@
+import math
+import struct
+
+from .asset import UAsset
+from .context import ue_parsing_context
+from .properties import STRUCT_DISPATCH, FloatProperty, TypedArrayValues, Vector
+from .stream import MemoryStream
+from .testutils import build_asset_data
+
+NAMES = ['None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'DataAsset', 'Test_Data']
+IMPORTS = [(1, 2, 0, 4), (1, 3, -1, 5)]
+EXPORTS = [(-2, 0, 0, 6), (-2, 0, 0, (6, 1))]
+
+
+def _parse(data: bytes) -> UAsset:
+    asset = UAsset(MemoryStream(data))
+    asset.assetname = '/Game/Test/Test_Data'
+    asset.deserialise()
+    asset.link()
+    return asset
+
+
+def test_names_are_shared_between_assets():
+    # Build from separate buffers so nothing is shared by accident
+    asset1 = _parse(build_asset_data(NAMES, IMPORTS, EXPORTS))
+    asset2 = _parse(build_asset_data(NAMES, IMPORTS, EXPORTS))
+
+    for name1, name2 in zip(asset1.names, asset2.names):
+        assert name1.value is name2.value
+
+    assert asset1.imports[1].fullname == '/Script/Engine.DataAsset'
+    assert asset1.imports[1].fullname is asset2.imports[1].fullname
+    assert asset1.exports[0].fullname is asset2.exports[0].fullname
+
+
+def test_instance_names_are_shared_between_assets():
+    asset1 = _parse(build_asset_data(NAMES, IMPORTS, EXPORTS))
+    asset2 = _parse(build_asset_data(NAMES, IMPORTS, EXPORTS))
+
+    assert asset1.exports[1].name.value == 'Test_Data_0'
+    assert asset1.exports[1].name.value is asset2.exports[1].name.value
+
+
+def test_export_lookup_tables():
+    names = [
+        'None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'BlueprintGeneratedClass', 'SceneComponent',
+        'Test_C', 'Default__Test_C', 'Root', 'Default__SceneComponent'
+    ]
+    imports = [(1, 2, 0, 4), (1, 3, -1, 5), (1, 3, -1, 6)]
+    exports = [(-2, -3, 0, 7), (1, 0, 0, 8), (-3, 0, 2, 9), (-3, 0, 0, 9), (-3, 0, 0, 10)]
+    asset = _parse(build_asset_data(names, imports, exports))
+    cls, default, root, _, scene_default = asset.exports.values
+
+    assert asset.exports_by_name['Test_C'] is cls
+    assert asset.exports_by_name['Root'] is root  # first match wins
+    assert asset.default_exports == [default, scene_default]
+    assert asset.class_defaults[cls] is default
+    assert asset.class_defaults[asset.imports[2]] is scene_default
+    assert asset.exports_by_namespace[default] == [root]
+    assert asset.exports_by_metaclass['Class'] == [cls, root, asset.exports[3], scene_default]
+
+
+def _build_property_asset() -> bytes:
+    names = [
+        'None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'DataAsset', 'Test_Data', 'FloatProperty',
+        'BoolProperty', 'ArrayProperty', 'IntProperty', 'Speed', 'Flag', 'Values', 'Health'
+    ]
+    properties = b''.join((
+        struct.pack('<IIIIiif', 11, 0, 7, 0, 4, 0, 2.5),
+        struct.pack('<IIIIiiB', 12, 0, 8, 0, 0, 0, 1),
+        struct.pack('<IIIIiiIIi2i', 13, 0, 9, 0, 12, 0, 10, 0, 2, 5, 6),
+        struct.pack('<IIIIiif', 14, 0, 7, 0, 4, 0, 100.0),
+        struct.pack('<II', 0, 0),
+    ))
+    return build_asset_data(names, [(1, 2, 0, 4), (1, 3, -1, 5)], [(-2, 0, 0, 6)], [properties])
+
+
+def test_property_filter():
+    asset = _parse(_build_property_asset())
+    export = asset.exports[0]
+
+    with ue_parsing_context(property_filter=['Speed', 'Health']):
+        properties = export.properties
+        assert [str(prop.header.name) for prop in properties.values] == ['Speed', 'Health']
+        assert properties.skipped == [('Flag', 0), ('Values', 0)]
+        assert properties.get_property('Health') == 100.0
+
+        # A narrower filter is satisfied by the existing table
+        with ue_parsing_context(property_filter=['Speed']):
+            assert export.properties is properties
+
+    # Filtered tables may need re-parsing, so the asset's data is kept
+    assert len(asset.stream.mem) == asset.stream.size
+
+    # Unfiltered access re-parses everything, after which the data is no longer needed
+    properties = export.properties
+    assert len(asset.stream.mem) == 0
+    assert [str(prop.header.name) for prop in properties.values] == ['Speed', 'Flag', 'Values', 'Health']
+    assert properties.skipped == []
+    assert properties.get_property('Values').values[1] == 6
+
+    # ...and is then used for any filter
+    with ue_parsing_context(property_filter=['Speed']):
+        assert export.properties is properties
+
+
+def _build_array_asset() -> bytes:
+    names = [
+        'None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'DataAsset', 'Test_Data', 'ArrayProperty',
+        'FloatProperty', 'IntProperty', 'Floats', 'Ints'
+    ]
+    properties = b''.join((
+        struct.pack('<IIIIiiIIi3f', 10, 0, 7, 0, 16, 0, 8, 0, 3, 1.5, -2.25, 0.1),
+        struct.pack('<IIIIiiIIi2i', 11, 0, 7, 0, 12, 0, 9, 0, 2, -7, 9),
+        struct.pack('<II', 0, 0),
+    ))
+    return build_asset_data(names, [(1, 2, 0, 4), (1, 3, -1, 5)], [(-2, 0, 0, 6)], [properties])
+
+
+def test_typed_arrays():
+    asset = _parse(_build_array_asset())
+    properties = asset.exports[0].properties
+
+    floats = properties.get_property('Floats')
+    assert isinstance(floats.values, TypedArrayValues)
+    assert len(floats.values) == 3
+    assert floats.values._elements == [None, None, None]  # nothing is wrapped until accessed
+
+    element = floats.values[1]
+    assert isinstance(element, FloatProperty)
+    assert element == -2.25
+    assert element.is_inside_array
+    assert floats.values[1] is element
+    assert floats.values[-1].rounded_value == 0.1
+    assert [float(v) for v in floats.values[:2]] == [1.5, -2.25]
+    assert floats.values.format_for_json() == [1.5, -2.25, 0.1]
+
+    ints = properties.get_property('Ints')
+    assert list(ints.values) == [-7, 9]
+    assert ints.values.format_for_json() == [-7, 9]
+
+
+def test_typed_struct_arrays():
+    asset = _parse(_build_array_asset())
+    owner = asset.exports[0].properties.get_property('Floats')
+
+    values = TypedArrayValues(owner, Vector, struct.pack('<6f', 1, 2, 3, 0.5, 0.1, -4))
+    assert len(values) == 2
+    assert values.format_for_json() == [{'x': 1, 'y': 2, 'z': 3}, {'x': 0.5, 'y': 0.1, 'z': -4}]
+    assert values.format_for_json() == [element.format_for_json() for element in values]
+    assert values[1].y.rounded_value == 0.1
+
+
+def test_struct_entry_names_are_cached():
+    names = [
+        'None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'DataAsset', 'Test_Data', 'StructProperty',
+        'FloatProperty', 'IntProperty', 'Entries', 'EntryStruct', 'Item Weight', 'Count'
+    ]
+    entries = b''.join((
+        struct.pack('<IIIIqf', 12, 0, 8, 0, 4, 1.5),
+        struct.pack('<IIIIqi', 13, 0, 9, 0, 4, 3),
+        struct.pack('<II', 0, 0),
+    ))
+    struct_data = struct.pack('<II', 11, 0) + entries
+    properties = b''.join((
+        struct.pack('<IIIIii', 10, 0, 7, 0, len(entries), 0) + struct_data,
+        struct.pack('<IIIIii', 10, 0, 7, 0, len(entries), 1) + struct_data,
+        struct.pack('<II', 0, 0),
+    ))
+    asset = _parse(build_asset_data(names, [(1, 2, 0, 4), (1, 3, -1, 5)], [(-2, 0, 0, 6)], [properties]))
+
+    first = asset.exports[0].properties.get_property('Entries', 0)
+    second = asset.exports[0].properties.get_property('Entries', 1)
+    assert first.get_property('Item_Weight') == 1.5
+    assert second.get_property('Count') == 3
+    assert first.values[0].name is second.values[0].name
+    assert asset.clean_name_cache[(12, 0)] == 'Item_Weight'
+    assert asset.struct_type_cache[(8, 0)] == ('FloatProperty', FloatProperty, None)
+    assert asset.struct_type_cache[(11, 0)] == ('EntryStruct', None, None)
+
+
+def test_struct_dispatch_priority():
+    assert STRUCT_DISPATCH['Vector'] == (Vector, None)
+    assert STRUCT_DISPATCH['Vector4'] == (None, 16)
+    assert math.isnan(STRUCT_DISPATCH['Transform'][1])
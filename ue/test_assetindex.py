@@ -0,0 +1,81 @@
+import os
+
+from pytest import fixture  # type: ignore
+
+from .assetindex import AssetFileInfo, AssetIndex
+from .loader import AssetLoader, ModResolver, release_memory
+
+
+class FixedModResolver(ModResolver):
+    def get_name_from_id(self, modid: str) -> str:
+        return {'123': 'TestMod'}.get(modid, None)
+
+    def get_id_from_name(self, name: str) -> str:
+        return {'testmod': '123'}.get(name.lower(), None)
+
+
+@fixture
+def asset_path(tmp_path):
+    for filename in ('Content/Core/A.uasset', 'Content/Core/B.umap', 'Content/Core/C.txt', 'Content/Mods/123/D.uasset',
+                     'Saved/F.uasset'):
+        path = tmp_path / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'1234')
+    return tmp_path
+
+
+def test_index_segments(asset_path):
+    index = AssetIndex(asset_path)
+    content = os.path.join(str(asset_path), 'Content')
+
+    mod_file = os.path.join(content, 'Mods', '123', 'D.uasset')
+    assert index.get(mod_file) == AssetFileInfo(mod_file, '.uasset', 4)
+    assert list(index.segments) == ['123']
+
+    core_file = os.path.join(content, 'Core', 'A.uasset')
+    assert index.get(core_file) == AssetFileInfo(core_file, '.uasset', 4)
+    assert index.get(os.path.join(content, 'Core', 'C.txt')) is None
+    assert index.get(mod_file) in index.segments['123'].values()
+    assert not any('Mods' in filename for filename in index.segments[None])
+
+    # Only the Content directory is indexed
+    assert index.get(os.path.join(str(asset_path), 'Saved', 'F.uasset')) is None
+
+
+def test_index_ignores_case(asset_path, monkeypatch):
+    # Emulate a case-insensitive filesystem, as on Windows
+    monkeypatch.setattr(os.path, 'normcase', str.lower)
+    index = AssetIndex(asset_path)
+    content = os.path.join(str(asset_path), 'Content')
+
+    core_file = os.path.join(content, 'Core', 'A.uasset')
+    assert index.get(core_file.upper()) == AssetFileInfo(core_file, '.uasset', 4)
+    mod_file = os.path.join(content, 'Mods', '123', 'D.uasset')
+    assert index.get(os.path.join(content, 'mods', '123', 'd.UASSET')) == AssetFileInfo(mod_file, '.uasset', 4)
+
+    # Iteration still gives the filenames as they are on disk
+    found = sorted(filename for filename, _ in index.iterate(os.path.join(content, 'CORE')))
+    assert found == [core_file, os.path.join(content, 'Core', 'B.umap')]
+
+
+def test_find_assetnames(asset_path):
+    loader = AssetLoader(FixedModResolver(), assetpath=asset_path)
+
+    assert sorted(loader.find_assetnames('.*', '/Game', extension=('.uasset', '.umap'))) == \
+        ['/Game/Core/A', '/Game/Core/B', '/Game/Mods/TestMod/D']
+    assert list(loader.find_assetnames('.*', '/Game/Mods/TestMod')) == ['/Game/Mods/TestMod/D']
+    assert list(loader.find_assetnames('.*', '/Game/Core', extension='.txt')) == ['/Game/Core/C']
+
+
+def test_invalidation(asset_path):
+    loader = AssetLoader(FixedModResolver(), assetpath=asset_path)
+    assert list(loader.find_assetnames('.*', '/Game/Mods/TestMod')) == ['/Game/Mods/TestMod/D']
+
+    (asset_path / 'Content' / 'Mods' / '123' / 'E.uasset').write_bytes(b'')
+    assert list(loader.find_assetnames('.*', '/Game/Mods/TestMod')) == ['/Game/Mods/TestMod/D']
+
+    loader.invalidate_asset_index('123')
+    assert sorted(loader.find_assetnames('.*', '/Game/Mods/TestMod')) == ['/Game/Mods/TestMod/D', '/Game/Mods/TestMod/E']
+    mem, ext = loader.load_raw_asset('/Game/Mods/TestMod/E')
+    release_memory(mem)
+    assert ext == '.uasset'
@@ -0,0 +1,51 @@
+import struct
+
+import pytest
+
+from .base import CompactUEBase
+from .coretypes import NameIndex, ObjectIndex
+from .properties import DummyAsset, FloatProperty, IntProperty
+from .stream import MemoryStream
+
+
+def test_compact_types_have_no_dict():
+    assert not hasattr(FloatProperty.create(1.0), '__dict__')
+    assert not hasattr(IntProperty.create(1), '__dict__')
+
+
+def test_compact_field_access():
+    prop = IntProperty.create(5)
+    assert prop.value == 5
+    assert prop.field_values == dict(value=5)
+    assert str(prop) == '(int) 5'
+
+    with pytest.raises(AttributeError):
+        _ = prop.missing
+
+
+def test_compact_field_definition():
+    prop = IntProperty.create(5)
+    with pytest.raises(NameError):
+        prop._newField('value', 6)  # pylint: disable=protected-access
+    with pytest.raises(NameError):
+        prop._newField('undeclared', 6)  # pylint: disable=protected-access
+
+
+def test_compact_requires_slots():
+    with pytest.raises(TypeError):
+
+        class Unslotted(CompactUEBase):  # pylint: disable=unused-variable
+            pass
+
+
+def test_name_and_object_index():
+    asset = DummyAsset(asset=None)
+    index = asset.addFakeName('Test')
+
+    name = NameIndex(asset, MemoryStream(struct.pack('<II', index, 3))).deserialise()
+    name.link()
+    assert str(name) == 'Test_2'
+
+    obj = ObjectIndex(asset, MemoryStream(struct.pack('<i', -3))).deserialise()
+    assert obj.used_index == 2
+    assert obj.kind == 'import'
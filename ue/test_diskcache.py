@@ -0,0 +1,99 @@
+import os
+import struct
+
+from pytest import fixture  # type: ignore
+
+from .context import ue_parsing_context
+from .diskcache import DiskAssetCache
+from .loader import AssetLoader
+from .testutils import DummyLoader, build_asset_data, write_asset
+
+ASSETNAME = '/Game/Test/Cached'
+
+
+@fixture
+def asset_path(tmp_path):
+    names = [
+        'None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'DataAsset', 'Cached', 'Speed', 'FloatProperty',
+        'Values', 'ArrayProperty', 'IntProperty'
+    ]
+    imports = [(1, 2, 0, 4), (1, 3, -1, 5)]
+    exports = [(-2, 0, 0, 6)]
+    properties = b''.join((
+        struct.pack('<IIIIiif', 7, 0, 8, 0, 4, 0, 1.5),
+        struct.pack('<IIIIiiIIi2i', 9, 0, 10, 0, 12, 0, 11, 0, 2, 5, 6),
+        struct.pack('<II', 0, 0),
+    ))
+    write_asset(tmp_path / 'game', ASSETNAME, build_asset_data(names, imports, exports, [properties]))
+    return tmp_path
+
+
+def _make_loader(asset_path) -> AssetLoader:
+    return AssetLoader(DummyLoader(), assetpath=asset_path / 'game', disk_cache=DiskAssetCache(asset_path / 'cache'))
+
+
+def test_assets_are_restored(asset_path):
+    loader = _make_loader(asset_path)
+    original = loader[ASSETNAME]
+    assert loader.disk_cache.writes == 1
+    assert (asset_path / 'cache' / 'Game' / 'Test' / 'Cached.pickle').is_file()
+
+    # Storing the asset does not parse its properties
+    assert 'properties' not in original.default_export.field_values
+
+    # A new loader restores the asset without parsing it
+    loader = _make_loader(asset_path)
+    asset = loader[ASSETNAME]
+    assert loader.disk_cache.hits == 1 and loader.disk_cache.writes == 0
+    assert asset is not original
+    assert asset.loader is loader
+    assert loader[ASSETNAME] is asset
+
+    export = asset.default_export
+    assert 'properties' not in export.field_values
+    assert export.fullname == '/Game/Test/Cached.Cached'
+    assert export.klass.value.fullname == '/Script/Engine.DataAsset'
+    assert export.properties.get_property('Speed') == 1.5
+    assert list(export.properties.get_property('Values').values) == [5, 6]
+    assert asset.stream.size == original.stream.size
+
+
+def test_released_data_is_read_again(asset_path):
+    loader = _make_loader(asset_path)
+    original = loader[ASSETNAME]
+    with ue_parsing_context(property_filter=['Speed']):
+        assert original.default_export.properties.get_property('Speed') == 1.5
+
+    # Data that has been dropped is not stored, so the restored asset reads it from the file when needed
+    original.release_data()
+    assert loader.disk_cache.save(ASSETNAME, loader.convert_asset_name_to_path(ASSETNAME, ext='.uasset'), original)
+
+    loader = _make_loader(asset_path)
+    asset = loader[ASSETNAME]
+    assert loader.disk_cache.hits == 1
+    assert asset.data_released and len(asset.stream.mem) == 0
+    with ue_parsing_context(property_filter=['Speed']):
+        assert asset.default_export.properties.get_property('Speed') == 1.5
+    assert list(asset.default_export.properties.get_property('Values').values) == [5, 6]
+
+
+def test_changed_files_are_reparsed(asset_path):
+    loader = _make_loader(asset_path)
+    _ = loader[ASSETNAME]
+
+    filename = asset_path / 'game' / 'Content' / 'Test' / 'Cached.uasset'
+    stat = filename.stat()
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    loader = _make_loader(asset_path)
+    _ = loader[ASSETNAME]
+    assert loader.disk_cache.misses == 1 and loader.disk_cache.writes == 1
+
+
+def test_assets_without_properties_are_not_stored(asset_path):
+    loader = _make_loader(asset_path)
+    with ue_parsing_context(properties=False):
+        _ = loader[ASSETNAME]
+
+    assert loader.disk_cache.writes == 0
+    assert not (asset_path / 'cache').exists()
@@ -0,0 +1,85 @@
+import pytest
+
+from .asset import UAsset
+from .context import ue_parsing_context
+from .headerscan import find_exports_to_store, get_header_parent, scan_asset_exports, scan_asset_imports
+from .stream import MemoryStream
+from .testutils import build_asset_data
+
+ASSETNAME = '/Game/Test/Test_Dino'
+
+NAMES = [
+    'None',
+    '/Script/CoreUObject',
+    'Package',
+    'Class',
+    '/Script/Engine',
+    'BlueprintGeneratedClass',
+    '/Script/ShooterGame',
+    'PrimalDinoCharacter',
+    'Test_Dino_C',
+    'Default__Test_Dino_C',
+    'SceneComponent',
+]
+
+IMPORTS = [
+    (1, 2, 0, 4),  # -1: /Script/Engine
+    (1, 3, -1, 5),  # -2: /Script/Engine.BlueprintGeneratedClass
+    (1, 2, 0, 6),  # -3: /Script/ShooterGame
+    (1, 3, -3, 7),  # -4: /Script/ShooterGame.PrimalDinoCharacter
+    (1, 3, -1, 10),  # -5: /Script/Engine.SceneComponent
+]
+
+EXPORTS = [
+    (-2, -4, 0, 8),  # 1: Test_Dino_C
+    (1, 0, 0, 9),  # 2: Default__Test_Dino_C
+    (-5, 0, 2, 10),  # 3: SceneComponent
+]
+
+
+@pytest.fixture(name='data', scope='module')
+def fixture_data() -> bytes:
+    return build_asset_data(NAMES, IMPORTS, EXPORTS)
+
+
+def test_scan_matches_full_parse(data: bytes):
+    with ue_parsing_context(properties=False):
+        asset = UAsset(MemoryStream(data))
+        asset.assetname = ASSETNAME
+        asset.deserialise()
+        asset.link()
+
+    headers = scan_asset_exports(memoryview(data), ASSETNAME)
+
+    assert len(headers) == len(asset.exports)
+    for header, export in zip(headers, asset.exports):
+        assert header.name == str(export.name)
+        assert header.fullname == export.fullname
+        assert header.klass == export.klass.value.fullname
+        assert header.super == (export.super.value.fullname if export.super.value else None)
+
+
+def test_scan_parents(data: bytes):
+    headers = scan_asset_exports(data, ASSETNAME)
+    assert get_header_parent(headers[0]) == '/Script/ShooterGame.PrimalDinoCharacter'
+    assert get_header_parent(headers[2]) == '/Script/Engine.SceneComponent'
+
+
+def test_scan_imports(data: bytes):
+    assert scan_asset_imports(memoryview(data)) == ['/Script/Engine', '/Script/ShooterGame']
+
+
+def test_exports_to_store(data: bytes):
+    headers = scan_asset_exports(data, ASSETNAME)
+    stored = list(find_exports_to_store(headers, ASSETNAME, '.uasset'))
+    assert [export.fullname for export in stored] == [ASSETNAME + '.Test_Dino_C']
+
+
+def test_exports_to_store_without_default():
+    names = ['None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'DataAsset', 'Test_Data']
+    imports = [(1, 2, 0, 4), (1, 3, -1, 5)]
+    exports = [(-2, 0, 0, 6)]
+    headers = scan_asset_exports(build_asset_data(names, imports, exports), '/Game/Test/Test_Data')
+    stored = list(find_exports_to_store(headers, '/Game/Test/Test_Data', '.uasset'))
+    assert [export.fullname for export in stored] == ['/Game/Test/Test_Data.Test_Data']
+    assert stored[0].klass == '/Script/Engine.DataAsset'
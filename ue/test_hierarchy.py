@@ -0,0 +1,139 @@
+import pytest  # type: ignore
+from pytest import fixture  # type: ignore
+
+from utils.compacttree import CompactTree
+
+from . import hierarchy
+from .loader import AssetLoader
+from .testutils import DummyLoader, build_asset_data, write_asset
+
+BASE_NAMES = ['None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'BlueprintGeneratedClass', 'Actor']
+BASE_IMPORTS = [
+    (1, 2, 0, 4),  # -1: /Script/Engine
+    (1, 3, -1, 5),  # -2: /Script/Engine.BlueprintGeneratedClass
+    (1, 3, -1, 6),  # -3: /Script/Engine.Actor
+]
+
+
+@fixture
+def asset_path(tmp_path):
+    # Parent_C inherits from Actor
+    names = BASE_NAMES + ['Parent_C', 'Default__Parent_C']
+    exports = [(-2, -3, 0, 7), (1, 0, 0, 8)]
+    write_asset(tmp_path, '/Game/Test/Parent', build_asset_data(names, BASE_IMPORTS, exports))
+
+    # Child_C inherits from Parent_C and sorts before it, so its parent has not been seen when it is ingested
+    names = BASE_NAMES + ['/Game/Test/Parent', 'Parent_C', 'Child_C', 'Default__Child_C']
+    imports = BASE_IMPORTS + [(1, 2, 0, 7), (1, 5, -4, 8)]
+    exports = [(-2, -5, 0, 9), (1, 0, 0, 10)]
+    write_asset(tmp_path, '/Game/Test/A_Child', build_asset_data(names, imports, exports))
+
+    write_asset(tmp_path, '/Game/Test/Broken', b'\0' * 16)
+
+    return tmp_path
+
+
+def _explore(asset_path, monkeypatch, use_mmap=False, **kwargs):
+    monkeypatch.setattr(hierarchy, 'tree', CompactTree(hierarchy.ROOT_NAME))
+    loader = AssetLoader(DummyLoader(), assetpath=asset_path, use_mmap=use_mmap)
+    hierarchy.explore_path('/Game/Test', loader, set(), **kwargs)
+    return {name: hierarchy.tree[name].parent_data for name in hierarchy.tree.keys()}
+
+
+@pytest.mark.parametrize('kwargs', (dict(fast=False), dict(fast=True), dict(workers=2), dict(workers=2, use_mmap=True)))
+def test_explore_path(asset_path, monkeypatch, kwargs):
+    found = _explore(asset_path, monkeypatch, **kwargs)
+    assert found == {
+        hierarchy.ROOT_NAME: None,
+        '/Script/Engine.Actor': hierarchy.ROOT_NAME,
+        '/Game/Test/Parent.Parent_C': '/Script/Engine.Actor',
+        '/Game/Test/A_Child.Child_C': '/Game/Test/Parent.Parent_C',
+    }
+
+
+def test_parallel_matches_serial_order(asset_path, monkeypatch):
+    serial = list(_explore(asset_path, monkeypatch, fast=True))
+    parallel = list(_explore(asset_path, monkeypatch, workers=2))
+    assert parallel == serial
+
+
+def test_edges_round_trip(asset_path, monkeypatch):
+    monkeypatch.setattr(hierarchy, 'tree', CompactTree(hierarchy.ROOT_NAME))
+    hierarchy.tree.add(hierarchy.ROOT_NAME, '/Script/Engine.Actor')
+    start = len(hierarchy.tree)
+    hierarchy.explore_path('/Game/Test', AssetLoader(DummyLoader(), assetpath=asset_path), set(), fast=True)
+    edges = hierarchy.get_edges(start)
+    assert edges == [
+        ('/Game/Test/Parent.Parent_C', '/Script/Engine.Actor'),
+        ('/Game/Test/A_Child.Child_C', '/Game/Test/Parent.Parent_C'),
+    ]
+
+    # Replaying the edges rebuilds the same hierarchy without any scanning
+    expected = hierarchy.get_edges()
+    monkeypatch.setattr(hierarchy, 'tree', CompactTree(hierarchy.ROOT_NAME))
+    hierarchy.tree.add(hierarchy.ROOT_NAME, '/Script/Engine.Actor')
+    assert hierarchy.add_edges(edges)
+    assert hierarchy.get_edges() == expected
+
+    # Edges cannot be replayed without their parents
+    monkeypatch.setattr(hierarchy, 'tree', CompactTree(hierarchy.ROOT_NAME))
+    assert not hierarchy.add_edges(edges)
+
+
+def test_inherits_from(asset_path, monkeypatch):
+    _explore(asset_path, monkeypatch, fast=True)
+    child = '/Game/Test/A_Child.Child_C'
+    parent = '/Game/Test/Parent.Parent_C'
+
+    assert hierarchy.inherits_from(child, parent)
+    assert hierarchy.inherits_from(child, hierarchy.ROOT_NAME)
+    assert not hierarchy.inherits_from(parent, child)
+    assert not hierarchy.inherits_from(child, child)
+    assert hierarchy.inherits_from(child, child, include_self=True)
+    assert not hierarchy.inherits_from(child, '/Script/Engine.Pawn')
+
+    # Classes outside the tree still go through the slower checks
+    assert not hierarchy.inherits_from('/Game/Test/Missing.Missing_C', parent, safe=True)
+    with pytest.raises(ValueError):
+        hierarchy.inherits_from('/Game/Test/Missing.Missing_C', parent)
+
+    # Fast results match walking the parents
+    for name in hierarchy.tree.keys():
+        for target in hierarchy.tree.keys():
+            assert hierarchy.inherits_from(name, target) == (target in hierarchy.find_parent_classes(name))
+
+
+@pytest.mark.parametrize('fullname,root', (
+    ('/Script/Engine.Actor', '/Script'),
+    ('/Game/PrimalEarth/Dinos/Dodo/Dodo_Character_BP.Dodo_Character_BP_C', '/Game'),
+    ('/Game/Mods/Ragnarok/Dinos/Griffin/Griffin_Character_BP.Griffin_Character_BP_C', '/Game/Mods/Ragnarok'),
+    ('/Game/Mods/Stray.Stray_C', '/Game/Mods'),
+))
+def test_get_package_root(fullname, root):
+    assert hierarchy.get_package_root(fullname) == root
+
+
+def test_find_sub_classes_by_package(monkeypatch):
+    monkeypatch.setattr(hierarchy, 'tree', CompactTree(hierarchy.ROOT_NAME))
+    actor = '/Script/Engine.Actor'
+    hierarchy.tree.add(hierarchy.ROOT_NAME, actor)
+    hierarchy.tree.add(actor, '/Game/Test/Parent.Parent_C')
+    hierarchy.tree.add('/Game/Test/Parent.Parent_C', '/Game/Mods/ModA/Child.Child_C')
+    hierarchy.tree.add(actor, '/Script/Engine.Pawn')
+
+    found = hierarchy.find_sub_classes_by_package(actor)
+    assert found == {
+        '/Game': ('/Game/Test/Parent.Parent_C', ),
+        '/Game/Mods/ModA': ('/Game/Mods/ModA/Child.Child_C', ),
+        '/Script': ('/Script/Engine.Pawn', ),
+    }
+    assert hierarchy.find_sub_classes_by_package(actor) is found
+
+    # Changes to the tree are picked up
+    hierarchy.tree.add(actor, '/Game/Mods/ModB/Other.Other_C')
+    assert hierarchy.find_sub_classes_by_package(actor)['/Game/Mods/ModB'] == ('/Game/Mods/ModB/Other.Other_C', )
+
+    # As is a replacement tree
+    monkeypatch.setattr(hierarchy, 'tree', CompactTree(hierarchy.ROOT_NAME))
+    hierarchy.tree.add(hierarchy.ROOT_NAME, actor)
+    assert hierarchy.find_sub_classes_by_package(actor) == {}
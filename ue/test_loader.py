@@ -1,16 +1,16 @@
+import gc
 import os.path
+import struct
 
+import pytest  # type: ignore
 from pytest import fixture  # type: ignore
 
-from .loader import AssetLoader, ModResolver
-
-
-class DummyLoader(ModResolver):
-    def get_name_from_id(self, modid: str) -> str:
-        raise NotImplementedError
-
-    def get_id_from_name(self, name: str) -> str:
-        raise NotImplementedError
+from .asset import UAsset
+from .context import get_ctx, ue_parsing_context
+from .loader import (AssetLoader, DictCacheManager, ModResolver, UsageBasedCacheManager, estimate_asset_size,
+                     load_file_into_memory, release_memory)
+from .stream import MemoryStream
+from .testutils import DummyLoader, build_asset_data, write_asset
 
 
 @fixture
@@ -53,3 +53,267 @@ def test_convert_asset_name_to_path(loader):
     assert loader.convert_asset_name_to_path('Game/One/Two') == f'{base}{s}Content{s}One{s}Two.uasset'
     assert loader.convert_asset_name_to_path('Game/One/Two/') == f'{base}{s}Content{s}One{s}Two.uasset'
     assert loader.convert_asset_name_to_path('/Game/One/Two/') == f'{base}{s}Content{s}One{s}Two.uasset'
+
+
+@pytest.mark.parametrize('use_mmap', (False, True))
+def test_load_file_into_memory(tmp_path, use_mmap):
+    filename = tmp_path / 'Test.uasset'
+    filename.write_bytes(bytes(range(16)))
+
+    mem = load_file_into_memory(str(filename), use_mmap=use_mmap)
+    stream = MemoryStream(mem)
+    assert stream.readUInt8() == 0
+    assert stream.readBytes(3) == bytes((1, 2, 3))
+    assert stream.readUInt32() == 0x07060504
+
+    release_memory(mem)
+    with pytest.raises(ValueError):
+        mem.tobytes()
+
+
+@pytest.mark.parametrize('use_mmap', (False, True))
+def test_load_empty_file_into_memory(tmp_path, use_mmap):
+    filename = tmp_path / 'Empty.uasset'
+    filename.write_bytes(b'')
+
+    mem = load_file_into_memory(str(filename), use_mmap=use_mmap)
+    assert len(mem) == 0
+    release_memory(mem)
+
+
+@fixture
+def lazy_asset_path(tmp_path):
+    names = ['None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'DataAsset', 'Lazy', 'Speed', 'FloatProperty']
+    imports = [(1, 2, 0, 4), (1, 3, -1, 5)]
+    exports = [(-2, 0, 0, 6)]
+    properties = struct.pack('<IIIIiif', 7, 0, 8, 0, 4, 0, 1.5) + struct.pack('<II', 0, 0)
+    write_asset(tmp_path, '/Game/Test/Lazy', build_asset_data(names, imports, exports, [properties]))
+    return tmp_path
+
+
+@pytest.mark.parametrize('use_mmap', (False, True))
+def test_lazy_properties(lazy_asset_path, use_mmap):
+    loader = AssetLoader(DummyLoader(), assetpath=lazy_asset_path, use_mmap=use_mmap)
+    asset = loader['/Game/Test/Lazy']
+    export = asset.default_export
+    assert asset.has_properties
+    assert 'properties' not in export.field_values
+
+    # The data is kept for parsing, without holding a mapped file open
+    assert isinstance(asset.stream.mem, bytes)
+    assert len(asset.stream.mem) == asset.stream.size
+
+    assert export.properties.get_property('Speed') == 1.5
+    assert export.properties is export.properties
+
+    # Once every export has been parsed the data is dropped
+    assert asset.unparsed_exports == 0
+    assert len(asset.stream.mem) == 0
+
+    # The cached asset satisfies a request for properties without being re-parsed
+    with ue_parsing_context(properties=True):
+        assert loader['/Game/Test/Lazy'] is asset
+
+    assert loader.stats.counts == dict(cache=1, disk=0, parse=1)
+
+
+def test_no_properties_outside_context(lazy_asset_path):
+    loader = AssetLoader(DummyLoader(), assetpath=lazy_asset_path)
+    with ue_parsing_context(properties=False):
+        asset = loader['/Game/Test/Lazy']
+        assert not asset.has_properties
+        with pytest.raises(AttributeError):
+            _ = asset.default_export.properties
+
+    # Requesting properties upgrades the cached asset in place rather than re-parsing it
+    assert loader['/Game/Test/Lazy'] is asset
+    assert asset.has_properties
+    assert asset.default_export.properties.get_property('Speed') == 1.5
+    assert loader.stats.counts == dict(cache=1, disk=0, parse=1)
+
+
+def test_upgrade_falls_back_to_reparse(lazy_asset_path):
+    loader = AssetLoader(DummyLoader(), assetpath=lazy_asset_path)
+    with ue_parsing_context(properties=False):
+        asset = loader['/Game/Test/Lazy']
+
+    # A file that has changed since it was parsed cannot be used to upgrade the asset
+    filename = lazy_asset_path / 'Content' / 'Test' / 'Lazy.uasset'
+    filename.write_bytes(filename.read_bytes() + bytes(4))
+    assert not asset.upgrade(get_ctx())
+    assert loader['/Game/Test/Lazy'] is not asset
+
+
+def _sized_asset(size: int) -> UAsset:
+    return UAsset(MemoryStream(bytes(size)))
+
+
+def test_cache_size_budget():
+    cache = UsageBasedCacheManager(max_bytes=1000)
+    cache.add('/Game/A', _sized_asset(400))
+    cache.add('/Game/B', _sized_asset(400))
+    assert cache.total_size == 800
+
+    # Using A makes B the least recently used
+    assert cache.lookup('/Game/A')
+    cache.add('/Game/C', _sized_asset(300))
+    assert list(cache.cache) == ['/Game/A', '/Game/C']
+    assert cache.total_size == 700
+
+    # Replacing an entry updates its size
+    cache.add('/Game/C', _sized_asset(100))
+    assert cache.total_size == 500
+
+    # An entry bigger than the budget is kept until something else is added
+    cache.add('/Game/Big', _sized_asset(2000))
+    assert list(cache.cache) == ['/Game/Big']
+
+    # Assets are self-referential, so evicted ones are only gone once collected
+    gc.collect()
+    assert cache.lookup('/Game/B') is None
+    assert cache.get_stats() == dict(count=1, size=2000, hits=1, weak_hits=0, misses=1, evictions=3, weak_count=0)
+
+
+def test_cache_size_follows_parsing(lazy_asset_path):
+    cache = UsageBasedCacheManager()
+    loader = AssetLoader(DummyLoader(), assetpath=lazy_asset_path, cache_manager=cache)
+    asset = loader['/Game/Test/Lazy']
+    initial_size = cache.sizes['/Game/Test/Lazy']
+    assert initial_size == estimate_asset_size(asset) > asset.stream.size
+
+    # Parsing the properties releases the data but adds the parsed properties
+    export = asset.default_export
+    _ = export.properties
+    assert asset.parsed_property_size == export.serial_size
+    assert cache.sizes['/Game/Test/Lazy'] == estimate_asset_size(asset)
+    assert cache.total_size == initial_size - asset.stream.size + export.serial_size * cache.property_factor
+
+
+def _count_open_files() -> int:
+    return len(os.listdir('/proc/self/fd'))
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self/fd'), reason='requires /proc/self/fd to count open files')
+@pytest.mark.parametrize('use_mmap', (False, True))
+def test_cache_bounds_retained_data(tmp_path, use_mmap):
+    names = ['None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'DataAsset', 'Lazy', 'Speed', 'FloatProperty']
+    properties = struct.pack('<IIIIiif', 7, 0, 8, 0, 4, 0, 1.5) + struct.pack('<II', 0, 0)
+    data = build_asset_data(names, [(1, 2, 0, 4), (1, 3, -1, 5)], [(-2, 0, 0, 6)], [properties])
+    for i in range(20):
+        write_asset(tmp_path, f'/Game/Test/Lazy{i}', data)
+
+    cache = UsageBasedCacheManager(max_count=5, keep_count=2)
+    loader = AssetLoader(DummyLoader(), assetpath=tmp_path, use_mmap=use_mmap, cache_manager=cache)
+    open_files = _count_open_files()
+
+    # Every asset is kept alive, with its properties unparsed, so all of them stay in the weak tier
+    assets = [loader[f'/Game/Test/Lazy{i}'] for i in range(20)]
+    assert _count_open_files() == open_files
+    assert sum(len(asset.stream.mem) for asset in assets) <= cache.max_count * len(data)
+
+    # Evicted assets read their data again when more of their properties are needed
+    evicted = assets[0]
+    assert evicted.data_released and not cache.cache.get('/Game/Test/Lazy0')
+    assert evicted.exports[0].properties.get_property('Speed') == 1.5
+    assert _count_open_files() == open_files
+
+
+def test_cache_weak_tier():
+    cache = UsageBasedCacheManager(max_count=2, keep_count=1)
+    asset_a = _sized_asset(10)
+    cache.add('/Game/A', asset_a)
+    cache.add('/Game/B', _sized_asset(10))
+    assert list(cache.cache) == ['/Game/B']
+    gc.collect()
+
+    # A is still referenced, so it comes back from the weak tier and is cached normally again
+    assert cache.contains('/Game/A')
+    assert cache.lookup('/Game/A') is asset_a
+    assert list(cache.cache) == ['/Game/A']
+    assert cache.lookup('/Game/A') is asset_a
+    assert cache.get_stats()['hits'] == 1 and cache.get_stats()['weak_hits'] == 1
+
+    # Wipes clear evicted entries too
+    cache.add('/Game/B', _sized_asset(10))
+    assert '/Game/A' in cache.evicted
+    cache.wipe('/Game/A')
+    assert cache.lookup('/Game/A') is None
+
+
+def test_cache_weak_tier_index():
+    cache = UsageBasedCacheManager(max_count=2, keep_count=1)
+    kept = {name: _sized_asset(10) for name in ('/Game/Mods/A/1', '/Game/Mods/A/2', '/Game/Other/3')}
+    for name, asset in kept.items():
+        cache.add(name, asset)
+    cache.add('/Game/Last', _sized_asset(10))
+    assert sorted(cache.evicted.keys()) == sorted(kept)
+
+    # Prefix wipes find evicted entries through the index
+    cache.wipe('/Game/Mods/A')
+    assert list(cache.evicted.keys()) == ['/Game/Other/3']
+    assert cache.evicted_index.find('/Game/Mods') == []
+
+    # Names of collected assets do not build up in the index
+    for i in range(30):
+        cache.add(f'/Game/Temp/{i}', _sized_asset(10))
+        gc.collect()
+    assert sum(len(names) for names in cache.evicted_index.segments.values()) <= 2 * len(cache.evicted) + 2 * cache.keep_count
+    assert cache.evicted_index.find('/Game/Other') == ['/Game/Other/3']
+
+
+def test_cache_size_tracks_removal():
+    cache = UsageBasedCacheManager(max_bytes=1000)
+    cache.add('/Game/Mods/Test/A', _sized_asset(100))
+    cache.add('/Game/Mods/Test/B', _sized_asset(100))
+    cache.add('/Game/Other', _sized_asset(100))
+
+    cache.remove('/Game/Other')
+    assert cache.total_size == 200
+    cache.wipe('/Game/Mods/Test')
+    assert cache.total_size == 0 and cache.get_count() == 0
+
+
+@pytest.mark.parametrize('cache_type', (DictCacheManager, UsageBasedCacheManager))
+def test_cache_prefix_wipe(cache_type):
+    cache = cache_type()
+    names = ('/Game/Mods/Test/A', '/Game/Mods/Test/Sub/B', '/Game/Mods/Tester/C', '/Game/PrimalEarth/D', '/Game/Other')
+    for name in names:
+        cache.add(name, _sized_asset(1000))
+
+    # Prefixes that stop partway through a segment name must still match exactly as startswith would
+    assert cache.wipe('/Game/Mods/Test/') == 2000
+    assert sorted(cache.cache) == ['/Game/Mods/Tester/C', '/Game/Other', '/Game/PrimalEarth/D']
+    assert cache.wipe('/Game/Mods/Test') == 1000
+    assert cache.wipe('/Game/Mods/Test') == 0
+    assert cache.wipe('/Game/Prim') == 1000
+    assert list(cache.cache) == ['/Game/Other']
+    assert not any('Mods' in segment for segment in cache.index.segments)
+
+    assert cache.wipe() == 1000
+    assert cache.get_count() == 0 and not cache.index.segments
+
+
+class ChangingModResolver(ModResolver):
+    def __init__(self):
+        self.mods = {'123': 'First'}
+
+    def get_name_from_id(self, modid: str) -> str:
+        return self.mods.get(modid, None)
+
+    def get_id_from_name(self, name: str) -> str:
+        return {v.lower(): k for k, v in self.mods.items()}.get(name.lower(), None)
+
+
+def test_name_memoisation():
+    resolver = ChangingModResolver()
+    loader = AssetLoader(resolver, assetpath='./output')
+    assert loader.clean_asset_name('/Game/Mods/123/Asset') == '/Game/Mods/First/Asset'
+
+    # Results are remembered until the resolver is re-initialised
+    resolver.mods['123'] = 'Second'
+    assert loader.clean_asset_name('/Game/Mods/123/Asset') == '/Game/Mods/First/Asset'
+    assert loader.clean_asset_name.cache_info().hits == 1
+
+    loader.initialise_mod_resolver()
+    assert loader.clean_asset_name('/Game/Mods/123/Asset') == '/Game/Mods/Second/Asset'
+    assert loader.convert_asset_name_to_path('/Game/Mods/Second/Asset').endswith('123' + os.path.sep + 'Asset.uasset')
@@ -0,0 +1,56 @@
+import time
+from types import SimpleNamespace
+
+from .loadstats import LoadStats
+
+
+class DummyCache:
+    def __init__(self):
+        self.count = 0
+        self.calls = 0
+
+    def get_count(self):
+        self.calls += 1
+        return self.count
+
+
+def test_load_times():
+    stats = LoadStats()
+    loader = SimpleNamespace(cache=DummyCache())
+
+    stats.record_load(loader, 'parse', 0.0015)
+    stats.record_load(loader, 'parse', 0.0019)
+    stats.record_load(loader, 'cache', 0.000001)
+
+    assert stats.counts == dict(cache=1, disk=0, parse=2)
+    assert stats.histograms['parse'][11] == 2  # 1024-2047us
+    assert stats.histograms['cache'][1] == 1
+    assert stats.describe_times() == 'cache 1 in 0.00s [<0.002:1], parse 2 in 0.00s [<2.048:2]'
+
+
+def test_sampling_is_periodic():
+    stats = LoadStats(sample_every=3)
+    cache = DummyCache()
+    loader = SimpleNamespace(cache=cache)
+
+    cache.count = 5
+    for _ in range(7):
+        stats.record_load(loader, 'cache', 0)
+    assert cache.calls == 3  # the 1st, 4th and 7th loads
+    assert stats.max_cache == 5
+    assert stats.max_memory > 0
+
+
+def test_sampling_thread():
+    stats = LoadStats(sample_every=1000)
+    cache = DummyCache()
+    stats.start_sampling(SimpleNamespace(cache=cache), interval=0.001)
+    try:
+        deadline = time.monotonic() + 5
+        while not cache.calls and time.monotonic() < deadline:
+            time.sleep(0.001)
+    finally:
+        stats.stop_sampling()
+
+    assert cache.calls
+    assert stats._ticker is None
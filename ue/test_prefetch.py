@@ -0,0 +1,74 @@
+import pytest  # type: ignore
+from pytest import fixture  # type: ignore
+
+from .loader import AssetLoader
+from .prefetch import AssetDependencyGraph
+from .testutils import DummyLoader, build_asset_data, write_asset
+
+
+@fixture
+def asset_path(tmp_path):
+    names = ['None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'DataAsset', 'Parent']
+    write_asset(tmp_path, '/Game/Test/Parent', build_asset_data(names, [(1, 2, 0, 4), (1, 3, -1, 5)], [(-2, 0, 0, 6)]))
+
+    names = [
+        'None', '/Script/CoreUObject', 'Package', 'Class', '/Script/Engine', 'DataAsset', 'Child', '/Game/Test/Parent', 'Parent'
+    ]
+    imports = [(1, 2, 0, 4), (1, 3, -1, 5), (1, 2, 0, 7), (1, 3, -3, 8)]
+    write_asset(tmp_path, '/Game/Test/Child', build_asset_data(names, imports, [(-4, 0, 0, 6)]))
+
+    return tmp_path
+
+
+def test_graph_walk():
+    graph = AssetDependencyGraph()
+    graph.record('/Game/A', ['/Script/Engine', '/Game/B', '/Game/C'])
+    graph.record('/Game/B', ['/Game/C', '/Game/D'])
+    assert graph.get('/Game/A') == ('/Game/B', '/Game/C')
+    assert graph.get('/Game/Unknown') is None
+    assert list(graph.walk(['/Game/A', '/Game/E', '/Game/D'])) == ['/Game/A', '/Game/B', '/Game/C', '/Game/D', '/Game/E']
+
+
+@pytest.mark.parametrize('use_mmap', (False, True))
+def test_prefetch_follows_dependencies(asset_path, use_mmap):
+    loader = AssetLoader(DummyLoader(), assetpath=asset_path, use_mmap=use_mmap, prefetch_workers=2)
+    loader.prefetch(['/Game/Test/Child.Child'])
+    assert list(loader.prefetcher.inflight) == ['/Game/Test/Child']
+    assert loader.prefetcher.graph.get('/Game/Test/Child') is None
+
+    # Taking the child's data queues its parent, found from the child's imports
+    child = loader['/Game/Test/Child']
+    assert list(loader.prefetcher.inflight) == ['/Game/Test/Parent']
+    assert loader.prefetcher.graph.get('/Game/Test/Child') == ('/Game/Test/Parent', )
+
+    parent = loader['/Game/Test/Parent']
+    assert str(child.default_export.klass.value.namespace.value.name) == parent.assetname
+    assert loader.prefetcher.get_stats() == dict(hits=2, wasted=0, inflight=0)
+
+    # Cached assets are not read again
+    loader.prefetch(['/Game/Test/Child', '/Game/Test/Parent'])
+    assert not loader.prefetcher.inflight
+    loader.close()
+    assert loader.prefetcher is None
+
+
+def test_prefetch_unused_data_is_released(asset_path):
+    loader = AssetLoader(DummyLoader(), assetpath=asset_path, prefetch_workers=1)
+    loader.prefetch(['/Game/Test/Parent', '/Game/Test/Missing'])
+    assert list(loader.prefetcher.inflight) == ['/Game/Test/Parent']
+    loader.cancel_prefetch()
+    assert not loader.prefetcher.inflight
+
+    # Loading without a prefetch still records dependencies for later runs
+    loader['/Game/Test/Child']
+    assert loader.prefetcher.graph.get('/Game/Test/Child') == ('/Game/Test/Parent', )
+    assert loader.prefetcher.get_stats()['hits'] == 0
+    loader.close()
+    assert loader.prefetcher is None
+
+
+def test_prefetch_disabled(asset_path):
+    loader = AssetLoader(DummyLoader(), assetpath=asset_path)
+    loader.prefetch(['/Game/Test/Child'])
+    assert loader.prefetcher is None
+    assert loader['/Game/Test/Child']
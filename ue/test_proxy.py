@@ -2,7 +2,7 @@ from typing import Mapping
 
 import pytest
 
-from .proxy import UEProxyStructure, get_proxy_for_exact_type, ueints
+from .proxy import ProxyComponent, UEProxyStructure, get_proxy_field_names, get_proxy_for_exact_type, uefloats, ueints
 
 # pylint: disable=singleton-comparison  # to ignore `var == False`
 # pylint: disable=redefined-outer-name  # to allow fixture use
@@ -95,3 +95,17 @@ def test_unspecified_fields(simple_proxy):
 
     assert simple_proxy.has_override('OtherField', 0) is True
     assert simple_proxy.has_override('IntField', 1) is False
+
+
+def test_proxy_field_names():
+    class ComponentProxy(UEProxyStructure, uetype="DummyComponentType"):
+        Speed = uefloats(1.0)
+
+    class BaseProxy(UEProxyStructure, uetype="DummyBaseType"):
+        IntField = ueints(1)
+
+    class SubProxy(BaseProxy, uetype="DummySubType"):
+        Movement = ProxyComponent[ComponentProxy]()
+
+    assert get_proxy_field_names(BaseProxy) == {'IntField'}
+    assert get_proxy_field_names(SubProxy) == {'IntField', 'Movement', 'Speed'}
@@ -0,0 +1,52 @@
+import struct
+
+import pytest
+
+from .properties import DummyAsset, Vector
+from .stream import UINT32, MemoryStream
+
+
+@pytest.fixture(name='stream')
+def fixture_stream() -> MemoryStream:
+    data = struct.pack('<iIf3i2f', -1, 2, 1.5, 10, 20, 30, 0.25, -0.5)
+    return MemoryStream(data)
+
+
+def test_primitive_reads(stream: MemoryStream):
+    assert stream.readInt32() == -1
+    assert stream.readUInt32() == 2
+    assert stream.readFloat() == 1.5
+    assert stream.offset == 12
+
+
+def test_read_struct(stream: MemoryStream):
+    assert stream.readStruct(struct.Struct('<iI')) == (-1, 2)
+    assert stream.readStruct(UINT32) == (0x3FC00000, )
+    assert stream.offset == 12
+
+
+def test_array_reads(stream: MemoryStream):
+    stream.offset = 12
+    assert stream.readInt32Array(3) == (10, 20, 30)
+    assert stream.readFloatArray(2) == (0.25, -0.5)
+    assert stream.readInt32Array(0) == ()
+    assert stream.offset == stream.end
+
+
+def test_reads_past_end(stream: MemoryStream):
+    stream.offset = stream.end - 4
+    with pytest.raises(EOFError):
+        stream.readUInt64()
+    with pytest.raises(EOFError):
+        stream.readFloatArray(2)
+    assert stream.offset == stream.end - 4
+
+
+def test_bulk_vector():
+    raw = struct.pack('<3f', 1.0, -2.5, 0.1)
+    vector = Vector(DummyAsset(asset=None), MemoryStream(raw)).deserialise()
+    assert vector.x.value == 1.0
+    assert vector.y.value == -2.5
+    assert float(vector.z) == 0.1
+    assert bytes(vector.z) == raw[8:12]
+    assert vector.stream.offset == 12
@@ -1,13 +1,23 @@
 import os.path
+import struct
+from typing import Any, Iterable, List, Sequence, Tuple, Union
 
 import ark.asset
 import ark.mod
 
 from .asset import UAsset
-from .loader import load_file_into_memory
+from .loader import ModResolver, load_file_into_memory
 from .stream import MemoryStream
 
 
+class DummyLoader(ModResolver):
+    def get_name_from_id(self, modid: str) -> str:
+        raise NotImplementedError
+
+    def get_id_from_name(self, name: str) -> str:
+        raise NotImplementedError
+
+
 def load_asset(assetfile: str):
     assetfile = assetfile.replace('/', '_')
     if not assetfile.lower().endswith('.uasset'):
@@ -24,6 +34,77 @@ def load_asset(assetfile: str):
     return asset
 
 
+def write_asset(base, assetname: str, data: bytes):
+    '''Write asset data to where a loader with an asset path of `base` expects to find the given /Game asset.'''
+    filename = base / ('Content' + assetname[len('/Game'):] + '.uasset')
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    filename.write_bytes(data)
+
+
+def _pack_string(value: str) -> bytes:
+    encoded = value.encode('utf8') + b'\0'
+    return struct.pack('<i', len(encoded)) + encoded
+
+
+def _pack_name_ref(name: Union[int, Tuple[int, int]]) -> bytes:
+    index, instance = name if isinstance(name, tuple) else (name, 0)
+    return struct.pack('<II', index, instance)
+
+
+def build_asset_data(
+    names: Sequence[str],
+    imports: Iterable[Tuple[int, int, int, Any]] = (),
+    exports: Iterable[Tuple[int, int, int, Any]] = (),
+    export_data: Sequence[bytes] = ()
+) -> bytes:
+    '''
+    Build a minimal but valid asset file in memory.
+    `names` must start with 'None'. Imports are (package, klass, namespace, name) and exports are
+    (klass, super, namespace, name), with names as name table indexes (or (index, instance) tuples) and
+    namespace/klass/super as object indexes.
+    `export_data` optionally supplies the serialised property data for each export.
+    '''
+    imports = list(imports)
+    exports = list(exports)
+
+    def pack_header(name_offset: int, export_offset: int, import_offset: int) -> bytes:
+        return b''.join((
+            struct.pack('<IiiIII', 0x9E2A83C1, -6, 0, 0, 0, 0),  # tag, versions, no custom versions
+            struct.pack('<I', 0),  # header_size
+            _pack_string(names[0]),  # package_group
+            struct.pack('<I', 0),  # package_flags
+            struct.pack('<IIIIII', len(names), name_offset, len(exports), export_offset, len(imports), import_offset),
+            struct.pack('<IIII', 0, 0, 0, 0),  # depends_offset, string_assets, thumbnail_offset
+            bytes(16),  # guid
+            struct.pack('<I', 0),  # generations
+            struct.pack('<HHHI', 4, 5, 1, 0) + _pack_string(''),  # engine_version_saved
+            struct.pack('<III', 0, 0, 0),  # compression_flags, compressed_chunks, package_source
+            struct.pack('<I', 0),  # packages_to_cook
+            struct.pack('<i', 0),  # texture_allocations
+            struct.pack('<IQQ', 0, 0, 0),  # asset_registry/bulk_data/world_tile_info offsets
+        ))
+
+    name_offset = len(pack_header(0, 0, 0))
+    name_data = b''.join(_pack_string(name) for name in names)
+    import_offset = name_offset + len(name_data)
+    import_data = b''.join(
+        struct.pack('<IIIIi', package, 0, klass, 0, namespace) + _pack_name_ref(name)
+        for (package, klass, namespace, name) in imports)
+    export_offset = import_offset + len(import_data)
+    data_offset = export_offset + 68 * len(exports)
+
+    export_items: List[bytes] = []
+    for i, (klass, super_, namespace, name) in enumerate(exports):
+        data = export_data[i] if i < len(export_data) else b''
+        export_items.append(struct.pack('<iii', klass, super_, namespace) + _pack_name_ref(name))
+        export_items.append(struct.pack('<IIIIII', 0, len(data), data_offset, 0, 0, 0))  # flags, serial info
+        export_items.append(bytes(16) + struct.pack('<II', 0, 0))  # guid, package flags
+        data_offset += len(data)
+
+    header = pack_header(name_offset, export_offset, import_offset)
+    return b''.join((header, name_data, import_data, *export_items, *export_data))
+
+
 def parse_colors(props):
     colours = dict()
     for prop in props:
@@ -0,0 +1,57 @@
+'''
+Micro-benchmark of asset name normalisation, as performed many times during an export run.
+
+Usage: python -m utils.bench_names
+'''
+import timeit
+from typing import Dict, List, Optional
+
+from ue.loader import AssetLoader, ModResolver
+
+MODS = {str(839162288 + i): f'Mod{i}' for i in range(50)}
+
+# A mix of core and mod names, in the forms exports and gatherers typically use
+NAMES: List[str] = [
+    *(f'/Game/PrimalEarth/Dinos/Dino{i}/Dino{i}_Character_BP.Dino{i}_Character_BP_C' for i in range(200)),
+    *(f'/Game/Mods/{modid}/Dinos/Dino{i}/Dino{i}_Character_BP' for i, modid in enumerate(MODS)),
+    *(f'/Game/Mods/{name}/Items/Item{i}/PrimalItem_{i}' for i, name in enumerate(MODS.values())),
+]
+
+# Each name is used many times over during a run
+REPEATS = 20
+
+
+class BenchModResolver(ModResolver):
+    def __init__(self):
+        self.names_to_ids: Dict[str, str] = {name.lower(): modid for modid, name in MODS.items()}
+
+    def get_name_from_id(self, modid: str) -> Optional[str]:
+        return MODS.get(modid, None)
+
+    def get_id_from_name(self, name: str) -> Optional[str]:
+        return self.names_to_ids.get(name.lower(), None)
+
+
+def run(loader: AssetLoader):
+    for _ in range(REPEATS):
+        for name in NAMES:
+            loader.convert_asset_name_to_path(loader.clean_asset_name(name))
+
+
+def main():
+    count = REPEATS * len(NAMES)
+
+    # Bypass memoisation on one loader to compare against
+    # pylint: disable=protected-access
+    uncached = AssetLoader(BenchModResolver())
+    uncached.clean_asset_name = uncached._clean_asset_name  # type: ignore
+    uncached.convert_asset_name_to_path = uncached._convert_asset_name_to_path  # type: ignore
+    memoised = AssetLoader(BenchModResolver())
+
+    for title, loader in (('uncached', uncached), ('memoised', memoised)):
+        best = min(timeit.repeat(lambda: run(loader), number=1, repeat=5))  # pylint: disable=cell-var-from-loop
+        print(f'{title}: {best * 1000:.1f} ms for {count} conversions ({best / count * 1e6:.2f} us each)')
+
+
+if __name__ == '__main__':
+    main()
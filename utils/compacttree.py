@@ -0,0 +1,302 @@
+'''
+Compact, array-backed tree of unique strings, with a fast binary format.
+
+This provides the parts of the `IndexedTree` interface used by the class hierarchy, but stores each entry as an
+integer ID into a set of flat arrays rather than as a separate `Node` object with its own child list.
+Pre/post-order numbering is maintained so ancestry checks and sub-tree iteration need no walking.
+'''
+import struct
+import sys
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Union
+
+from .tree import Node
+
+__all__ = [
+    'CompactNode',
+    'CompactTree',
+]
+
+MAGIC = b'CTREE\x00\x01\x00'
+HEADER = struct.Struct('<8sII')  # magic, entry count, names length
+NONE = -1
+ARRAY_TYPE = 'i'
+
+MISSING = object()
+
+
+class CompactNode:
+    '''A lightweight view of a single entry in a `CompactTree`, mirroring the read-only parts of `Node`.'''
+    __slots__ = ('tree', 'id')
+
+    def __init__(self, tree: 'CompactTree', node_id: int):
+        self.tree = tree
+        self.id = node_id
+
+    @property
+    def data(self) -> str:
+        return self.tree.names[self.id]
+
+    @property
+    def parent(self) -> Optional['CompactNode']:
+        parent_id = self.tree.parents[self.id]
+        return self.tree.node(parent_id) if parent_id != NONE else None
+
+    @property
+    def parent_data(self) -> Optional[str]:
+        parent_id = self.tree.parents[self.id]
+        return self.tree.names[parent_id] if parent_id != NONE else None
+
+    @property
+    def nodes(self) -> List['CompactNode']:
+        return [self.tree.node(child_id) for child_id in self.tree.iter_children(self.id)]
+
+    def walk_iterator(self, skip_self=True, breadth_first=False) -> Iterator['CompactNode']:
+        if not breadth_first:
+            # Pre-order numbering makes a depth-first walk a simple slice
+            for node_id in self.tree.iter_subtree(self.id, skip_self=skip_self):
+                yield self.tree.node(node_id)
+            return
+
+        q: Deque[int] = deque([self.id])
+        while q:
+            node_id = q.popleft()
+            if skip_self:
+                skip_self = False
+            else:
+                yield self.tree.node(node_id)
+            q.extend(self.tree.iter_children(node_id))
+
+    def __repr__(self):
+        return f"CompactNode('{self.data}')"
+
+
+class CompactTree:
+    '''
+    Tree of unique strings stored as parent/first-child/next-sibling arrays of integer IDs.
+
+    Children keep their insertion order, as with `IndexedTree`. Pre/post-order numbers are computed on demand
+    after the tree changes, giving constant-time ancestry checks via `is_descendant`.
+    `generation` is incremented on every change, so derived data can be cached against it.
+    '''
+    def __init__(self, root: str):
+        self._root_data = root
+        self.clear()
+
+    def clear(self):
+        self.generation = getattr(self, 'generation', 0) + 1
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = dict()
+        self.parents = array(ARRAY_TYPE)
+        self.first_children = array(ARRAY_TYPE)
+        self.last_children = array(ARRAY_TYPE)
+        self.next_siblings = array(ARRAY_TYPE)
+        self._views: Dict[int, CompactNode] = dict()
+        self._invalidate_order()
+        self._register(self._root_data, NONE)
+
+    @property
+    def root(self) -> CompactNode:
+        return self.node(0)
+
+    def node(self, node_id: int) -> CompactNode:
+        '''Get the (cached) view of the entry with the given ID.'''
+        view = self._views.get(node_id, None)
+        if view is None:
+            view = CompactNode(self, node_id)
+            self._views[node_id] = view
+        return view
+
+    def add(self, parent: Union[str, CompactNode], data: Union[str, Node[str]]) -> CompactNode:
+        '''Add an entry (or a whole `Node` tree) beneath the given parent.'''
+        parent_id = self._handle_parent_arg(parent)
+        if isinstance(data, Node):
+            return self.node(self._add_node_tree(parent_id, data))
+        return self.node(self._register(data, parent_id))
+
+    def insert_segment(self, parent: Union[str, CompactNode], partial_tree: Node[str]):
+        self._add_node_tree(self._handle_parent_arg(parent), partial_tree)
+
+    def keys(self) -> Iterator[str]:
+        yield from self.names
+
+    def __getitem__(self, key: str) -> CompactNode:
+        return self.node(self.ids[key])
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.ids
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, key: str, fallback=MISSING) -> CompactNode:
+        node_id = self.ids.get(key, None)
+        if node_id is None:
+            if fallback is MISSING:
+                raise KeyError(key)
+            return fallback
+        return self.node(node_id)
+
+    def iter_children(self, node_id: int) -> Iterator[int]:
+        child_id = self.first_children[node_id]
+        while child_id != NONE:
+            yield child_id
+            child_id = self.next_siblings[child_id]
+
+    def iter_subtree(self, node_id: int, skip_self=True) -> Iterator[int]:
+        '''Iterate the IDs of an entry's descendants in depth-first order.'''
+        self._ensure_order()
+        start = self._pre[node_id]
+        end = start + self._sizes[node_id]
+        if skip_self:
+            start += 1
+        yield from self._order[start:end]
+
+    def is_descendant(self, name: str, ancestor: str) -> bool:
+        '''Check if `name` is beneath `ancestor` in the tree. Both must be present.'''
+        self._ensure_order()
+        node_id = self.ids[name]
+        ancestor_id = self.ids[ancestor]
+        return self._pre[ancestor_id] < self._pre[node_id] and self._post[node_id] < self._post[ancestor_id]
+
+    def to_bytes(self) -> bytes:
+        names = '\0'.join(self.names).encode('utf8')
+        arrays = (self.parents, self.first_children, self.last_children, self.next_siblings)
+        return HEADER.pack(MAGIC, len(self.names), len(names)) + names + b''.join(_array_to_bytes(a) for a in arrays)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'CompactTree':
+        magic, count, names_size = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('Not a compact tree')
+
+        offset = HEADER.size
+        names = [sys.intern(name) for name in data[offset:offset + names_size].decode('utf8').split('\0')]
+        offset += names_size
+
+        tree = cls.__new__(cls)
+        tree._root_data = names[0]
+        tree.names = names
+        tree.ids = {name: node_id for node_id, name in enumerate(names)}
+        tree._views = dict()
+        tree.generation = 0
+        tree._invalidate_order()
+
+        arrays = []
+        array_size = count * array(ARRAY_TYPE).itemsize
+        for _ in range(4):
+            arrays.append(_array_from_bytes(data[offset:offset + array_size]))
+            offset += array_size
+        tree.parents, tree.first_children, tree.last_children, tree.next_siblings = arrays
+        return tree
+
+    def save(self, filename: Union[str, Path]):
+        with open(filename, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, filename: Union[str, Path]) -> 'CompactTree':
+        with open(filename, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def __getstate__(self):
+        return self.to_bytes()
+
+    def __setstate__(self, state):
+        self.__dict__.update(CompactTree.from_bytes(state).__dict__)
+
+    def _register(self, name: str, parent_id: int) -> int:
+        if name in self.ids:
+            raise KeyError(f'Key already present: {name}')
+
+        node_id = len(self.names)
+        self.names.append(sys.intern(name))
+        self.ids[name] = node_id
+        self.parents.append(parent_id)
+        self.first_children.append(NONE)
+        self.last_children.append(NONE)
+        self.next_siblings.append(NONE)
+
+        if parent_id != NONE:
+            last_id = self.last_children[parent_id]
+            if last_id == NONE:
+                self.first_children[parent_id] = node_id
+            else:
+                self.next_siblings[last_id] = node_id
+            self.last_children[parent_id] = node_id
+
+        self.generation += 1
+        self._invalidate_order()
+        return node_id
+
+    def _add_node_tree(self, parent_id: int, node: Node[str]) -> int:
+        node_id = self._register(node.data, parent_id)
+        for child in node.nodes:
+            self._add_node_tree(node_id, child)
+        return node_id
+
+    def _handle_parent_arg(self, parent: Union[str, CompactNode]) -> int:
+        if isinstance(parent, str):
+            return self.ids[parent]
+        if isinstance(parent, CompactNode):
+            return parent.id
+        raise TypeError("Parent must be a key or a node")
+
+    def _invalidate_order(self):
+        self._order: Optional[array] = None
+        self._pre = array(ARRAY_TYPE)
+        self._post = array(ARRAY_TYPE)
+        self._sizes = array(ARRAY_TYPE)
+
+    def _ensure_order(self):
+        '''Number entries in pre-order and post-order, and record the size of each sub-tree.'''
+        if self._order is not None:
+            return
+
+        count = len(self.names)
+        order = array(ARRAY_TYPE, [NONE]) * count
+        pre = array(ARRAY_TYPE, [0]) * count
+        post = array(ARRAY_TYPE, [0]) * count
+        sizes = array(ARRAY_TYPE, [1]) * count
+
+        pre_index = 0
+        post_index = 0
+        stack = [0]
+        next_child = array(ARRAY_TYPE, self.first_children)
+        order[0] = 0
+        while stack:
+            node_id = stack[-1]
+            child_id = next_child[node_id]
+            if child_id == NONE:
+                # All children done
+                stack.pop()
+                post[node_id] = post_index
+                post_index += 1
+                if stack:
+                    sizes[stack[-1]] += sizes[node_id]
+                continue
+
+            next_child[node_id] = self.next_siblings[child_id]
+            pre_index += 1
+            pre[child_id] = pre_index
+            order[pre_index] = child_id
+            stack.append(child_id)
+
+        self._order, self._pre, self._post, self._sizes = order, pre, post, sizes
+
+
+def _array_to_bytes(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(ARRAY_TYPE, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _array_from_bytes(data: bytes) -> array:
+    values = array(ARRAY_TYPE)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
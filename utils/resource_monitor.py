@@ -1,11 +1,12 @@
 import time
 from contextlib import contextmanager
 from datetime import datetime
-from threading import Event, Thread
 
 import psutil
 from guppy import hpy  # noqa: F401  #
 
+from .ticker import Ticker
+
 __all__ = [
     'resource_monitor',
 ]
@@ -47,30 +48,6 @@ __all__ = [
 #     return ('%s%s%s') % (sign, x3, exp3_text)
 
 
-class Ticker(Thread):
-    def __init__(self, target_fn, interval=0.5):
-        super().__init__()
-        self.target_fn = target_fn
-        self.interval = interval
-        self.started = Event()
-        self.stop = Event()
-        self.finished = Event()
-
-    def start(self):
-        super().start()
-        self.started.wait()
-
-    def run(self):
-        self.started.set()
-        while not self.stop.wait(self.interval):
-            self.target_fn()
-        self.finished.set()
-
-    def end(self):
-        self.stop.set()
-        self.finished.wait()
-
-
 @contextmanager
 def resource_monitor(process=None, interval=2):
     print('time, rss, vms, pct, heap')
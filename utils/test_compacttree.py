@@ -0,0 +1,93 @@
+import pickle
+
+import pytest
+
+from .compacttree import CompactTree
+from .tree import IndexedTree, Node
+
+
+def _build(tree):
+    tree.add('root', 'a')
+    tree.add('root', 'b')
+    tree.add('a', 'a1')
+    tree.add('b', 'b1')
+    tree.add('b', 'b2')
+    segment = Node[str]('b1x')
+    segment.add('b1y')
+    tree.insert_segment('b1', segment)
+    tree.add('a', 'a2')
+    return tree
+
+
+@pytest.fixture(name='tree')
+def fixture_tree() -> CompactTree:
+    return _build(CompactTree('root'))
+
+
+def test_matches_indexed_tree(tree: CompactTree):
+    expected = _build(IndexedTree[str]('root'))
+    assert list(tree.keys()) == list(expected.keys())
+    assert len(tree) == len(list(expected.keys()))
+    for name in expected.keys():
+        assert tree[name].parent_data == expected[name].parent_data
+        assert [node.data for node in tree[name].nodes] == [node.data for node in expected[name].nodes]
+        for breadth_first in (False, True):
+            assert [node.data for node in tree[name].walk_iterator(breadth_first=breadth_first)] == \
+                [node.data for node in expected[name].walk_iterator(breadth_first=breadth_first)]
+
+
+def test_lookup(tree: CompactTree):
+    assert 'b1y' in tree and 'missing' not in tree
+    assert tree.get('missing', None) is None
+    with pytest.raises(KeyError):
+        tree.get('missing')
+    with pytest.raises(KeyError):
+        tree.add('root', 'a')
+
+    # Views are cached, so nodes can be compared by identity
+    assert tree['b1'].parent is tree['b']
+    assert tree['root'].parent is None
+
+
+def test_is_descendant(tree: CompactTree):
+    assert tree.is_descendant('b1y', 'b')
+    assert tree.is_descendant('b1y', 'root')
+    assert not tree.is_descendant('b1y', 'a')
+    assert not tree.is_descendant('b', 'b')
+    assert not tree.is_descendant('b', 'b1')
+
+    # Numbering is updated as the tree changes
+    tree.add('a2', 'a2x')
+    assert tree.is_descendant('a2x', 'a')
+    assert [node.data for node in tree['a'].walk_iterator()] == ['a1', 'a2', 'a2x']
+
+
+def test_generation(tree: CompactTree):
+    generation = tree.generation
+    tree.is_descendant('b1y', 'b')
+    assert tree.generation == generation
+
+    tree.add('a2', 'a2x')
+    assert tree.generation > generation
+
+    generation = tree.generation
+    tree.clear()
+    assert tree.generation > generation
+
+
+def test_binary_round_trip(tree: CompactTree, tmp_path):
+    tree.save(tmp_path / 'tree.bin')
+    loaded = CompactTree.load(tmp_path / 'tree.bin')
+    assert list(loaded.keys()) == list(tree.keys())
+    assert [node.data for node in loaded.root.walk_iterator()] == [node.data for node in tree.root.walk_iterator()]
+
+    # Loaded trees can still be extended
+    loaded.add('b2', 'b2x')
+    assert loaded['b2x'].parent_data == 'b2'
+    assert loaded.is_descendant('b2x', 'b')
+
+    unpickled = pickle.loads(pickle.dumps(tree))
+    assert [node.data for node in unpickled['b'].walk_iterator()] == ['b1', 'b1x', 'b1y', 'b2']
+
+    with pytest.raises(ValueError):
+        CompactTree.from_bytes(b'\0' * 16)
@@ -0,0 +1,30 @@
+from threading import Event, Thread
+
+__all__ = [
+    'Ticker',
+]
+
+
+class Ticker(Thread):
+    '''A background thread that calls `target_fn` every `interval` seconds until ended.'''
+    def __init__(self, target_fn, interval=0.5):
+        super().__init__(daemon=True)
+        self.target_fn = target_fn
+        self.interval = interval
+        self.started = Event()
+        self.stop = Event()
+        self.finished = Event()
+
+    def start(self):
+        super().start()
+        self.started.wait()
+
+    def run(self):
+        self.started.set()
+        while not self.stop.wait(self.interval):
+            self.target_fn()
+        self.finished.set()
+
+    def end(self):
+        self.stop.set()
+        self.finished.wait()